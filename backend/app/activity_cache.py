@@ -0,0 +1,180 @@
+"""
+Bounded, persistent cache for GitHub activity payloads.
+
+An LRU of at most `max_entries` keys, each with its own expiry. The entries
+are mirrored to a small JSON file, so a cold instance can answer from the
+last payloads it had before the restart. Expired entries are not served
+as fresh, but stay available as stale data until they are evicted. On the
+event loop, writes go to a worker thread, and one write covers every set()
+made before it starts.
+"""
+
+import os
+import json
+import time
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+ACTIVITY_CACHE_PATH = os.getenv(
+    "GITHUB_ACTIVITY_CACHE_PATH",
+    os.path.join(os.path.dirname(__file__), "../data/github_activity_cache.json"),
+)
+ACTIVITY_CACHE_MAX_ENTRIES = int(os.getenv("GITHUB_ACTIVITY_CACHE_SIZE", "32"))
+
+
+class ActivityCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, path: Optional[str] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Least recently used keys are evicted beyond this size
+            ttl_seconds: Default time an entry is served as fresh
+            path: JSON file the entries are persisted to; None keeps them in memory only
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.loaded = False
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._dirty = False
+        self._save_task: Optional[asyncio.Future] = None
+
+    def load(self) -> None:
+        """Read persisted entries; a missing or unreadable file starts empty"""
+        self.loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+            for key, entry in sorted(entries.items(), key=lambda item: item[1]["stored_at"]):
+                self._entries[key] = entry
+            self._evict()
+            print(f"Loaded {len(self._entries)} cached GitHub activity payload(s) from {self.path}")
+        except Exception as e:
+            print(f"Failed to load GitHub activity cache: {e}")
+            self._entries.clear()
+
+    def _write(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        if not self.path:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(entries, f)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"Failed to save GitHub activity cache: {e}")
+
+    def save(self) -> None:
+        """Write the entries now, on the calling thread"""
+        self._dirty = False
+        self._write(dict(self._entries))
+
+    def _schedule_save(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save()
+            return
+        if self._save_task is not None and not self._save_task.done():
+            # The write in flight took its snapshot already; its callback starts another
+            return
+        # Snapshot on the loop, so the worker never iterates entries being changed
+        self._dirty = False
+        self._save_task = loop.create_task(asyncio.to_thread(self._write, dict(self._entries)))
+        self._save_task.add_done_callback(self._save_done)
+
+    def _save_done(self, task: asyncio.Future) -> None:
+        if self._dirty:
+            self._schedule_save()
+
+    async def flush(self) -> None:
+        """Wait for the write in flight and write any changes made since"""
+        if self._save_task is not None:
+            await asyncio.gather(self._save_task, return_exceptions=True)
+            self._save_task = None
+        if self._dirty:
+            self._dirty = False
+            await asyncio.to_thread(self._write, dict(self._entries))
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str, allow_stale: bool = False, count: bool = True) -> Optional[Any]:
+        """Fresh value for key; with allow_stale an expired value is returned too"""
+        return self.lookup(key, allow_stale, count)[0]
+
+    def lookup(self, key: str, allow_stale: bool = False, count: bool = True) -> Tuple[Optional[Any], bool]:
+        """
+        (value, is_fresh) for key, counting a single hit, stale hit or miss.
+        count=False is for a second look within the same request (a stale
+        fallback after a counted miss), so each request is counted once.
+        """
+        if not self.loaded:
+            self.load()
+
+        entry = self._entries.get(key)
+        if entry is None:
+            if count:
+                self.misses += 1
+            return None, False
+
+        is_fresh = time.time() < entry["expires_at"]
+        if not is_fresh and not allow_stale:
+            if count:
+                self.misses += 1
+            return None, False
+        if count:
+            if is_fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+
+        self._entries.move_to_end(key)
+        return entry["value"], is_fresh
+
+    def time_to_expiry(self, key: str) -> Optional[float]:
+        """Seconds until key stops being fresh (negative once expired), None if absent"""
+        if not self.loaded:
+            self.load()
+        entry = self._entries.get(key)
+        return entry["expires_at"] - time.time() if entry else None
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        if not self.loaded:
+            self.load()
+
+        now = time.time()
+        self._entries[key] = {
+            "value": value,
+            "stored_at": now,
+            "expires_at": now + (self.ttl_seconds if ttl_seconds is None else ttl_seconds),
+        }
+        self._entries.move_to_end(key)
+        self._evict()
+        self._dirty = True
+        self._schedule_save()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+        }
@@ -0,0 +1,177 @@
+"""
+Job queue for Telegram bot commands.
+
+The message poller only submits jobs; each job runs as a task on the
+application loop (blocking work such as the Selenium scrape goes on to its
+own worker pool from there), so polling continues while a command runs and
+commands share the app's clients. Every command has a concurrency limit,
+and jobs can be listed and cancelled with /status and /cancel.
+"""
+
+import time
+import asyncio
+import itertools
+import threading
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# Jobs that have finished, kept for /status
+JOB_HISTORY_SIZE = 10
+ACTIVE_STATES = ("queued", "running")
+
+
+class CommandJob:
+    def __init__(self, job_id: int, command: str, args: List[str]):
+        self.id = job_id
+        self.command = command
+        self.args = args
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ACTIVE_STATES
+
+    def describe(self) -> str:
+        if self.active:
+            since = self.started_at or self.created_at
+            return f"#{self.id} /{self.command} {self.status} for {time.time() - since:.0f}s"
+        took = (self.finished_at or 0) - (self.started_at or self.created_at)
+        return f"#{self.id} /{self.command} {self.status} after {took:.0f}s"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "command": self.command,
+            "args": self.args,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+        }
+
+
+class CommandJobQueue:
+    def __init__(self, on_finish: Optional[Callable[[CommandJob], None]] = None):
+        """
+        Initialize the queue
+
+        Args:
+            on_finish: Called on the app loop with each job once it has finished
+        """
+        self.on_finish = on_finish
+        self._ids = itertools.count(1)
+        self._active: Dict[int, CommandJob] = {}
+        self._history: Deque[CommandJob] = deque(maxlen=JOB_HISTORY_SIZE)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None and not self._loop.is_closed()
+
+    def start(self) -> None:
+        """Bind the queue to the running application loop"""
+        self._loop = asyncio.get_running_loop()
+
+    def submit(self, command: str, handler: Callable, args: List[str], max_concurrent: int = 1) -> Tuple[Optional[CommandJob], str]:
+        """
+        Queue a command from any thread. Returns the job (None if it was
+        rejected) and a message for the user.
+        """
+        if not self.running:
+            return None, f"Cannot run /{command}: the command queue is not running"
+
+        with self._lock:
+            running = [job for job in self._active.values() if job.command == command]
+            if len(running) >= max_concurrent:
+                busy = ", ".join(f"#{job.id}" for job in running)
+                return None, f"/{command} is already running ({busy}); use /status or /cancel"
+            job = CommandJob(next(self._ids), command, args)
+            self._active[job.id] = job
+
+        self._loop.call_soon_threadsafe(self._launch, job, handler)
+        return job, f"Queued /{command} as job #{job.id}"
+
+    def _launch(self, job: CommandJob, handler: Callable) -> None:
+        job.task = self._loop.create_task(self._execute(job, handler))
+        # A done callback also covers jobs cancelled before they started
+        job.task.add_done_callback(lambda task: self._finish(job, task))
+
+    async def _execute(self, job: CommandJob, handler: Callable) -> Optional[str]:
+        job.status = "running"
+        job.started_at = time.time()
+        if asyncio.iscoroutinefunction(handler):
+            result = await handler(*job.args)
+        else:
+            result = await asyncio.to_thread(handler, *job.args)
+        return None if result is None else str(result)
+
+    def _finish(self, job: CommandJob, task: asyncio.Task) -> None:
+        if task.cancelled():
+            job.status = "cancelled"
+        elif task.exception() is not None:
+            job.status = "failed"
+            job.result = f"{type(task.exception()).__name__}: {task.exception()}"
+        else:
+            job.status = "done"
+            job.result = task.result()
+        job.finished_at = time.time()
+        with self._lock:
+            self._active.pop(job.id, None)
+            self._history.append(job)
+        if self.on_finish is not None:
+            try:
+                self.on_finish(job)
+            except Exception as e:
+                print(f"Error reporting finished command job #{job.id}: {e}")
+
+    def cancel(self, target: Optional[str] = None) -> List[CommandJob]:
+        """
+        Cancel active jobs from any thread: a job id, a command name, or
+        every active job when target is None
+        """
+        if not self.running:
+            return []
+        with self._lock:
+            jobs = [
+                job for job in self._active.values()
+                if target is None or str(job.id) == target.lstrip("#") or job.command == target.lstrip("/")
+            ]
+        for job in jobs:
+            # Runs after the job's _launch, which was scheduled first
+            self._loop.call_soon_threadsafe(lambda job=job: job.task.cancel())
+        return jobs
+
+    def jobs(self) -> List[CommandJob]:
+        with self._lock:
+            return list(self._active.values()) + list(reversed(self._history))
+
+    def summary(self) -> Dict[str, Any]:
+        """Job counts by state, without arguments or results"""
+        with self._lock:
+            recent = Counter(job.status for job in self._history)
+            return {"active": len(self._active), "recent": dict(recent)}
+
+    def status_text(self) -> str:
+        with self._lock:
+            active = list(self._active.values())
+            recent = list(reversed(self._history))[:5]
+        lines = ["Running:"] + ([f"  {job.describe()}" for job in active] or ["  nothing"])
+        if recent:
+            lines += ["Recent:"] + [f"  {job.describe()}" for job in recent]
+        return "\n".join(lines)
+
+    async def stop(self) -> None:
+        """Cancel active jobs and wait for them to wind down"""
+        with self._lock:
+            tasks = [job.task for job in self._active.values() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop = None
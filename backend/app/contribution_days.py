@@ -0,0 +1,115 @@
+"""
+Compact contribution calendar storage.
+
+A run of consecutive days is kept as parallel typed arrays indexed by the
+offset from its first day, instead of one dict per day: counts as uint32,
+levels as uint8 and (only when GitHub supplied them) colors as a list.
+Dates are never stored; they follow from `start` and the index.
+"""
+
+from array import array
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# GitHub's default palette for contribution levels 0-4
+LEVEL_COLORS = ["#ebedf0", "#9be9a8", "#40c463", "#30a14e", "#216e39"]
+
+
+class ContributionDays:
+    __slots__ = ("start", "counts", "levels", "colors")
+
+    def __init__(
+        self,
+        start: date,
+        counts: Optional[List[int]] = None,
+        levels: Optional[List[int]] = None,
+        colors: Optional[List[Optional[str]]] = None,
+    ):
+        """
+        Initialize a run of days
+
+        Args:
+            start: Date of index 0
+            counts: Contribution count per day
+            levels: Contribution level (0-4) per day
+            colors: Color per day, or None to derive it from the level
+        """
+        self.start = start
+        self.counts = array("I", counts or [])
+        self.levels = array("B", levels or [])
+        self.colors = list(colors) if colors is not None else None
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    @property
+    def end(self) -> date:
+        return self.start + timedelta(days=len(self.counts) - 1)
+
+    def index_of(self, day: date) -> int:
+        return (day - self.start).days
+
+    def set(self, index: int, count: int, level: int, color: Optional[str] = None) -> None:
+        """Set the day at `index`, padding any gap before it with empty days"""
+        if index < 0:
+            raise ValueError("Day is before the start of this run")
+
+        missing = index + 1 - len(self.counts)
+        if missing > 0:
+            self.counts.extend([0] * missing)
+            self.levels.extend(b"\0" * missing)
+            if self.colors is not None:
+                self.colors.extend([None] * missing)
+
+        self.counts[index] = count
+        self.levels[index] = level
+        if color is not None and self.colors is None:
+            self.colors = [None] * len(self.counts)
+        if self.colors is not None:
+            self.colors[index] = color
+
+    def color(self, index: int) -> str:
+        if self.colors is not None and self.colors[index]:
+            return self.colors[index]
+        return LEVEL_COLORS[min(self.levels[index], 4)]
+
+    def total(self) -> int:
+        return sum(self.counts)
+
+    def days(self) -> Iterator[Tuple[date, int, int]]:
+        day = self.start
+        for count, level in zip(self.counts, self.levels):
+            yield day, count, level
+            day += timedelta(days=1)
+
+    def update(self, other: "ContributionDays") -> None:
+        """Overwrite (or extend with) the days of another run"""
+        offset = self.index_of(other.start)
+        if offset < 0:
+            raise ValueError("Cannot merge a run that starts before this one")
+        for index in range(len(other)):
+            self.set(offset + index, other.counts[index], other.levels[index],
+                     other.colors[index] if other.colors is not None else None)
+
+    def slice(self, start: date, end: date) -> "ContributionDays":
+        """Copy of the days between start and end (inclusive) that this run covers"""
+        first = max(0, self.index_of(start))
+        last = min(len(self.counts), self.index_of(end) + 1)
+        return ContributionDays(
+            self.start + timedelta(days=first),
+            self.counts[first:last],
+            self.levels[first:last],
+            self.colors[first:last] if self.colors is not None else None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "start": self.start.isoformat(),
+            "counts": self.counts.tolist(),
+            "levels": self.levels.tolist(),
+            "colors": self.colors,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ContributionDays":
+        return cls(date.fromisoformat(data["start"]), data["counts"], data["levels"], data.get("colors"))
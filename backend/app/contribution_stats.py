@@ -0,0 +1,105 @@
+"""
+Contribution statistics computed once per activity refresh.
+
+The days of every year in the payload are flattened into one count array,
+so streaks that cross New Year are found too, and every statistic is a
+vectorized numpy operation over that array.
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+ROLLING_WINDOWS = (7, 30)
+WEEKDAY_NAMES = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
+
+
+def _streak(start: date, first_index: int, length: int) -> Dict[str, Any]:
+    if length <= 0:
+        return {"days": 0, "start": None, "end": None}
+    return {
+        "days": int(length),
+        "start": (start + timedelta(days=int(first_index))).isoformat(),
+        "end": (start + timedelta(days=int(first_index + length - 1))).isoformat(),
+    }
+
+
+def compute_contribution_stats(years: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Streaks, per-weekday totals and rolling averages over the week grids of a payload"""
+    import numpy as np
+
+    days = [
+        day
+        for grid in sorted(years, key=lambda grid: grid["year"])
+        for week in grid["weeks"]
+        for day in week["days"]
+        if not day["is_placeholder"]
+    ]
+    if not days:
+        return None
+
+    start = date.fromisoformat(days[0]["date"])
+    counts = np.fromiter((day["count"] for day in days), dtype=np.int64, count=len(days))
+    size = counts.size
+
+    # Runs of active days: +1 where a run starts, -1 one past where it ends
+    edges = np.diff(np.concatenate(([0], (counts > 0).astype(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1)
+    run_lengths = np.flatnonzero(edges == -1) - run_starts
+
+    longest = _streak(start, 0, 0)
+    if run_lengths.size:
+        best = int(np.argmax(run_lengths))
+        longest = _streak(start, run_starts[best], run_lengths[best])
+
+    # Like GitHub, a streak is still current if today has no contributions yet
+    current = _streak(start, 0, 0)
+    if run_lengths.size:
+        last_end = run_starts[-1] + run_lengths[-1]
+        if last_end >= size - 1:
+            current = _streak(start, run_starts[-1], run_lengths[-1])
+
+    # The grid's weekday index starts on Sunday
+    weekdays = (np.arange(size) + (start.weekday() + 1) % 7) % 7
+    weekday_totals = np.bincount(weekdays, weights=counts, minlength=7).astype(np.int64)
+    weekday_days = np.bincount(weekdays, minlength=7)
+
+    # Rolling means over the last `window` days; the first days average what exists
+    cumulative = np.concatenate(([0], np.cumsum(counts)))
+    indexes = np.arange(1, size + 1)
+    current_year_start = max(0, (date(date.fromisoformat(days[-1]["date"]).year, 1, 1) - start).days)
+    rolling_averages = {}
+    for window in ROLLING_WINDOWS:
+        window_start = np.maximum(indexes - window, 0)
+        means = (cumulative[indexes] - cumulative[window_start]) / (indexes - window_start)
+        rolling_averages[str(window)] = {
+            "latest": round(float(means[-1]), 2),
+            "series_start": (start + timedelta(days=current_year_start)).isoformat(),
+            "series": np.round(means[current_year_start:], 2).tolist(),
+        }
+
+    return {
+        "range_start": start.isoformat(),
+        "range_end": days[-1]["date"],
+        "total_contributions": int(counts.sum()),
+        "active_days": int(np.count_nonzero(counts)),
+        "current_streak": current,
+        "longest_streak": longest,
+        "weekday_totals": {
+            name: int(total) for name, total in zip(WEEKDAY_NAMES, weekday_totals)
+        },
+        "weekday_averages": {
+            name: round(float(total) / int(count), 2) if count else 0.0
+            for name, total, count in zip(WEEKDAY_NAMES, weekday_totals, weekday_days)
+        },
+        "rolling_averages": rolling_averages,
+    }
+
+
+def stats_view(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """The payload without the week grids, keeping each year's summary figures"""
+    projected = {key: value for key, value in payload.items() if key != "years"}
+    projected["years"] = [
+        {key: value for key, value in grid.items() if key not in ("weeks", "month_labels")}
+        for grid in payload.get("years") or []
+    ]
+    return projected
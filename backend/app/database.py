@@ -7,8 +7,12 @@ from .firebase_config import firebase
 # Load environment variables
 load_dotenv()
 
-# Use Firebase Firestore as the primary database
-db = firebase["db"]
+# Use Firebase Firestore as the primary database. Resolved on first access,
+# so importing this module does not initialize Firebase
+def __getattr__(name):
+    if name == "db":
+        return firebase["db"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # For backward compatibility with SQLAlchemy models, 
 # we'll keep the Base and session parts, but without MySQL connection
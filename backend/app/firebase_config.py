@@ -1,64 +1,189 @@
+"""
+The one Firebase bootstrap shared by the API, run_app.py and startup.sh.
+
+Credentials are resolved and parsed once (a credentials file, or the
+FIREBASE_CREDENTIALS_JSON value read in memory, raw or base64 encoded),
+the Admin SDK app is initialized once, and the connection is checked with
+a single Firestore read whose result is cached and reused by startup and
+/health until it goes stale.
+"""
+
 import os
-import firebase_admin
-from firebase_admin import credentials, firestore, storage
+import json
+import time
+import base64
+import threading
+from typing import Any, Dict, Optional
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Initialize Firebase Admin SDK
-def initialize_firebase():
-    """Initialize Firebase Admin SDK with service account credentials"""
-    try:
-        # Check if Firebase app is already initialized
-        if not firebase_admin._apps:
-            # Check for service account credentials
-            cred_path = os.getenv('FIREBASE_SERVICE_ACCOUNT', '/app/credentials/firebase-credentials.json')
-            
-            # If credentials file exists, use it
-            if os.path.exists(cred_path):
-                cred = credentials.Certificate(cred_path)
-            else:
-                # Try to use environment variable with JSON content
-                cred_json = os.getenv('FIREBASE_CREDENTIALS_JSON')
-                if cred_json:
-                    from tempfile import NamedTemporaryFile
-                    
-                    # Create temporary file with credentials
-                    temp_cred_file = NamedTemporaryFile(delete=False)
-                    with open(temp_cred_file.name, 'w') as f:
-                        f.write(cred_json)
-                    
-                    cred = credentials.Certificate(temp_cred_file.name)
-                    # Clean up after ourselves
-                    os.unlink(temp_cred_file.name)
-                else:
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+# A successful probe is trusted for this long; failures are retried sooner
+PROBE_TTL_SECONDS = 15 * 60
+PROBE_FAILURE_TTL_SECONDS = 60
+
+
+def _credential_paths():
+    configured = os.getenv('FIREBASE_SERVICE_ACCOUNT')
+    if configured:
+        yield configured if os.path.isabs(configured) else os.path.join(BACKEND_DIR, configured)
+    yield os.path.join(BACKEND_DIR, "credentials/firebase-credentials.json")
+    yield '/app/credentials/firebase-credentials.json'
+
+
+def load_credentials_info() -> Optional[Dict[str, Any]]:
+    """Service account info from FIREBASE_CREDENTIALS_JSON or the first credentials file found"""
+    cred_json = os.getenv('FIREBASE_CREDENTIALS_JSON')
+    if cred_json:
+        text = cred_json.strip()
+        if not text.startswith('{'):
+            # Cloud Run secrets are sometimes stored base64 encoded
+            text = base64.b64decode(text).decode('utf-8')
+        return json.loads(text)
+
+    for path in _credential_paths():
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                return json.load(f)
+    return None
+
+
+class FirebaseBootstrap:
+    """Firebase resources ({"db", "bucket"}), initialized once on first access"""
+
+    def __init__(self):
+        self._resources: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        self.configured = True
+        self.error: Optional[str] = None
+        self.project_id: Optional[str] = None
+        self.probe_result: Optional[Dict[str, Any]] = None
+
+    @property
+    def initialized(self) -> bool:
+        return self._resources is not None
+
+    def initialize(self) -> Dict[str, Any]:
+        """Initialize the Admin SDK (idempotent); resources are None if that fails"""
+        if self._resources is not None:
+            return self._resources
+
+        with self._lock:
+            if self._resources is None:
+                self._resources = self._initialize()
+        return self._resources
+
+    def _initialize(self) -> Dict[str, Any]:
+        try:
+            # firebase_admin pulls in the Firestore and Storage clients, which are
+            # slow to import, so it only loads once Firebase is actually used
+            import firebase_admin
+            from firebase_admin import credentials, firestore, storage
+
+            # Check if Firebase app is already initialized
+            if not firebase_admin._apps:
+                info = load_credentials_info()
+                if info is None:
+                    self.configured = False
                     raise ValueError("Firebase credentials not found")
-            
-            # Initialize app with credentials and storage bucket
-            firebase_admin.initialize_app(cred, {
-                'storageBucket': os.getenv('FIREBASE_STORAGE_BUCKET')
-            })
-            
-            print("Firebase Admin SDK initialized successfully")
-        
-        # Get Firestore client
-        db = firestore.client()
-        # Get Storage bucket
-        bucket = storage.bucket()
-        
-        return {
-            "db": db,
-            "bucket": bucket
-        }
-    
-    except Exception as e:
-        print(f"Failed to initialize Firebase: {str(e)}")
-        # Provide empty implementations for testing/development
-        return {
-            "db": None,
-            "bucket": None
-        }
+                self.project_id = info.get("project_id")
+
+                # Parsed in memory; no temporary credentials file
+                firebase_admin.initialize_app(credentials.Certificate(info), {
+                    'storageBucket': os.getenv('FIREBASE_STORAGE_BUCKET')
+                })
+                print("Firebase Admin SDK initialized successfully")
+
+            db = firestore.client()
+            bucket = storage.bucket() if os.getenv('FIREBASE_STORAGE_BUCKET') else None
+            return {"db": db, "bucket": bucket}
+
+        except Exception as e:
+            self.error = str(e)
+            print(f"Failed to initialize Firebase: {self.error}")
+            # Provide empty implementations for testing/development
+            return {"db": None, "bucket": None}
+
+    def __getitem__(self, key):
+        return self.initialize()[key]
+
+    def get(self, key, default=None):
+        return self.initialize().get(key, default)
+
+    def probe(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Check Firestore with one read. The result is cached, so startup,
+        /health and other callers share a single network probe.
+        """
+        with self._probe_lock:
+            cached = self.probe_result
+            if cached and not force:
+                ttl = PROBE_TTL_SECONDS if cached["ok"] else PROBE_FAILURE_TTL_SECONDS
+                if time.time() - cached["checked_at"] < ttl:
+                    return cached
+
+            db = self.get("db")
+            start = time.perf_counter()
+            if db is None:
+                result = {"ok": False, "error": self.error or "Firebase not configured"}
+            else:
+                try:
+                    db.collection('test').limit(1).get()
+                    result = {"ok": True, "error": None}
+                except Exception as e:
+                    result = {"ok": False, "error": str(e)}
+            result["checked_at"] = time.time()
+            result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            self.probe_result = result
+            return result
+
+    def ensure_ready(self, run_setup: bool = True) -> Dict[str, Any]:
+        """
+        Initialize and probe once. If the probe fails on a working client,
+        create the expected collections (setup_firebase.setup_collections)
+        with the same client and probe again.
+        """
+        if self.get("db") is None:
+            if not self.configured:
+                return {"success": True, "message": "skipped, no Firebase credentials configured"}
+            return {"success": False, "message": self.error}
+
+        result = self.probe()
+        if result["ok"]:
+            return {"success": True, "message": f"connected ({result['latency_ms']:.0f} ms)"}
+        if not run_setup:
+            return {"success": False, "message": result["error"]}
+
+        print(f"❌ Firebase connection failed: {result['error']}")
+        print("Attempting to set up Firebase database...")
+        try:
+            from setup_firebase import setup_collections
+        except ImportError:
+            return {"success": False, "message": f"{result['error']} (setup_firebase.py not available)"}
+        if not setup_collections(self["db"]):
+            return {"success": False, "message": f"setup failed after: {result['error']}"}
+
+        result = self.probe(force=True)
+        if result["ok"]:
+            return {"success": True, "message": "connected after setup"}
+        return {"success": False, "message": f"still failing after setup: {result['error']}"}
+
+    def status(self) -> Dict[str, Any]:
+        """Cached state for health checks; never triggers initialization or a probe"""
+        if not self.initialized:
+            return {"state": "initializing"}
+        if self._resources.get("db") is None:
+            return {"state": "unavailable", "error": self.error}
+        return {"state": "available", "project_id": self.project_id, "probe": self.probe_result}
+
 
 # Export Firebase resources
-firebase = initialize_firebase() 
\ No newline at end of file
+firebase = FirebaseBootstrap()
+
+# Kept for callers of the previous module-level function
+def initialize_firebase():
+    """Initialize Firebase (once) and return {"db", "bucket"}"""
+    return firebase.initialize()
@@ -1,48 +1,74 @@
 import asyncio
 import os
 import re
+from collections import OrderedDict
 from datetime import date, datetime, time, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+
+from .github_history import contribution_history
+from .http_clients import http_clients
+from .github_client import github_client
+from .contribution_days import ContributionDays
+from .contribution_stats import compute_contribution_stats
+from .activity_cache import ActivityCache, ACTIVITY_CACHE_MAX_ENTRIES, ACTIVITY_CACHE_PATH
+from .metrics import metrics
 
 GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
-GITHUB_REST_API_URL = "https://api.github.com"
 GITHUB_PUBLIC_CONTRIBUTIONS_URL = "https://github.com/users/{username}/contributions"
 GITHUB_USERNAME = os.getenv("GITHUB_USERNAME", "BishalBudhathoki")
 CACHE_TTL_SECONDS = 3600
-GITHUB_CONTRIBUTION_COLORS = {
-    0: "#ebedf0",
-    1: "#9be9a8",
-    2: "#40c463",
-    3: "#30a14e",
-    4: "#216e39",
-}
-
-GRAPHQL_CONTRIBUTIONS_QUERY = """
-query GitHubActivity($username: String!, $from: DateTime!, $to: DateTime!) {
-  user(login: $username) {
-    contributionsCollection(from: $from, to: $to) {
-      contributionCalendar {
-        totalContributions
-        weeks {
-          firstDay
-          contributionDays {
-            color
-            contributionCount
-            contributionLevel
-            date
-            weekday
-          }
+# Failed lookups are retried sooner than successful ones
+FAILURE_CACHE_TTL_SECONDS = 300
+# Upper bound for each fetch (the GraphQL document or one public calendar page)
+FETCH_TIMEOUT_SECONDS = 15.0
+
+# Fields fetched for every date segment alias of the activity document. A
+# contributionsCollection may span at most one year, so each segment gets its
+# own alias and the whole payload is still a single request.
+GRAPHQL_SEGMENT_FIELDS = """
+    contributionCalendar {
+      totalContributions
+      weeks {
+        firstDay
+        contributionDays {
+          color
+          contributionCount
+          contributionLevel
+          date
+          weekday
+        }
+      }
+    }
+    commitContributionsByRepository(maxRepositories: 25) {
+      repository {
+        name
+        nameWithOwner
+        url
+      }
+      contributions(first: 1, orderBy: {field: OCCURRED_AT, direction: DESC}) {
+        totalCount
+        nodes {
+          occurredAt
         }
       }
     }
-  }
-}
 """
+RECENT_REPOSITORIES_LIMIT = 2
+# Day cells and their tooltips of the public contributions page, in document order
+PUBLIC_CALENDAR_XPATH = etree.XPath("//td[@data-date and @data-level] | //tool-tip[@for]")
 
-_activity_cache: Dict[str, Dict[str, Any]] = {}
+activity_cache = ActivityCache(ACTIVITY_CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS, ACTIVITY_CACHE_PATH)
+# The cache keeps its own counters; /metrics reads them when scraped
+metrics.cache_lookups.add_collector(lambda: [
+    (("github_activity", "hit"), activity_cache.hits),
+    (("github_activity", "stale"), activity_cache.stale_hits),
+    (("github_activity", "miss"), activity_cache.misses),
+])
+# Week grids of finalized years, bounded like the payload cache
+_finalized_grids: "OrderedDict[Tuple[str, int, Optional[str]], Tuple[Dict[str, Any], Dict[str, Any]]]" = OrderedDict()
 
 
 def _utc_isoformat(value: datetime) -> str:
@@ -77,13 +103,24 @@ def _build_week_grid(
     year: int,
     start: date,
     end: date,
-    day_entries: List[Dict[str, Any]],
+    days: ContributionDays,
     total_contributions: Optional[int] = None,
 ) -> Dict[str, Any]:
-    day_map = {entry["date"]: entry for entry in day_entries}
-    active_entries = [entry for entry in day_entries if entry["count"] > 0]
-    max_count = max((entry["count"] for entry in day_entries), default=0)
-    total = total_contributions if total_contributions is not None else sum(entry["count"] for entry in day_entries)
+    counts = days.counts
+    levels = days.levels
+    max_count = max(counts, default=0)
+    active_days = sum(1 for count in counts if count > 0)
+    total = total_contributions if total_contributions is not None else sum(counts)
+
+    busiest_day = None
+    if max_count > 0:
+        busiest_index = counts.index(max_count)
+        busiest_day = {
+            "date": (days.start + timedelta(days=busiest_index)).isoformat(),
+            "count": max_count,
+            "level": levels[busiest_index],
+            "color": days.color(busiest_index),
+        }
 
     start_offset = (start.weekday() + 1) % 7
     grid_start = start - timedelta(days=start_offset)
@@ -102,9 +139,9 @@ def _build_week_grid(
 
         for day_offset in range(7):
             current_day = current + timedelta(days=day_offset)
-            current_day_key = current_day.isoformat()
             is_in_range = start <= current_day <= end
-            entry = day_map.get(current_day_key)
+            index = (current_day - days.start).days
+            has_entry = is_in_range and 0 <= index < len(counts)
 
             if is_in_range and current_day.day == 1 and current_day.month not in seen_months:
                 first_in_month = current_day
@@ -112,10 +149,10 @@ def _build_week_grid(
 
             week_days.append(
                 {
-                    "date": current_day_key,
-                    "count": entry["count"] if entry and is_in_range else 0,
-                    "level": entry["level"] if entry and is_in_range else 0,
-                    "color": entry.get("color") if entry and is_in_range else None,
+                    "date": current_day.isoformat(),
+                    "count": counts[index] if has_entry else 0,
+                    "level": levels[index] if has_entry else 0,
+                    "color": days.color(index) if has_entry else None,
                     "is_placeholder": not is_in_range,
                     "weekday": day_offset,
                 }
@@ -131,14 +168,12 @@ def _build_week_grid(
     if start.strftime("%b") not in {label["label"] for label in month_labels}:
         month_labels.insert(0, {"week_index": 0, "label": start.strftime("%b")})
 
-    busiest_day = max(active_entries, key=lambda entry: entry["count"], default=None)
-
     return {
         "year": year,
         "range_start": start.isoformat(),
         "range_end": end.isoformat(),
         "total_contributions": total,
-        "active_days": len(active_entries),
+        "active_days": active_days,
         "max_contribution_count": max_count,
         "busiest_day": busiest_day,
         "month_labels": month_labels,
@@ -146,159 +181,136 @@ def _build_week_grid(
     }
 
 
-async def _fetch_graphql_year(
-    client: httpx.AsyncClient,
-    username: str,
-    token: str,
-    year_range: Dict[str, Any],
-) -> Dict[str, Any]:
-    start = datetime.combine(year_range["start"], time.min, tzinfo=timezone.utc)
-    end = datetime.combine(year_range["end"], time.max, tzinfo=timezone.utc)
+def _build_graphql_activity_query(segments: List[Dict[str, Any]]) -> str:
+    variables = ["$username: String!"]
+    selections = []
+    for index, _ in enumerate(segments):
+        variables.append(f"$from{index}: DateTime!, $to{index}: DateTime!")
+        selections.append(
+            f"    segment{index}: contributionsCollection(from: $from{index}, to: $to{index}) {{"
+            f"{GRAPHQL_SEGMENT_FIELDS}    }}"
+        )
 
-    response = await client.post(
-        GITHUB_GRAPHQL_URL,
-        headers={
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/vnd.github+json",
-        },
-        json={
-            "query": GRAPHQL_CONTRIBUTIONS_QUERY,
-            "variables": {
-                "username": username,
-                "from": _utc_isoformat(start),
-                "to": _utc_isoformat(end),
-            },
-        },
+    return (
+        f"query GitHubActivity({', '.join(variables)}) {{\n"
+        "  user(login: $username) {\n"
+        + "\n".join(selections)
+        + "\n  }\n}\n"
     )
-    response.raise_for_status()
-    payload = response.json()
 
-    if payload.get("errors"):
-        raise ValueError(payload["errors"][0].get("message", "GitHub GraphQL request failed"))
 
-    calendar = (
-        payload.get("data", {})
-        .get("user", {})
-        .get("contributionsCollection", {})
-        .get("contributionCalendar")
-    )
+def _parse_repository_contributions(collection: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    repositories: Dict[str, Dict[str, Any]] = {}
+    for entry in (collection or {}).get("commitContributionsByRepository") or []:
+        repository = entry.get("repository") or {}
+        name_with_owner = repository.get("nameWithOwner")
+        contributions = entry.get("contributions") or {}
+        nodes = contributions.get("nodes") or []
+        if not name_with_owner or not nodes:
+            continue
+
+        repositories[name_with_owner] = {
+            "name": repository.get("name"),
+            "name_with_owner": name_with_owner,
+            "url": repository.get("url"),
+            "last_commit_at": nodes[0].get("occurredAt"),
+            "commit_count": int(contributions.get("totalCount", 0)),
+        }
+    return repositories
+
+
+def _parse_graphql_segment(segment: Dict[str, Any], collection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    calendar = (collection or {}).get("contributionCalendar")
     if not calendar:
         raise ValueError("GitHub contribution calendar was empty")
 
-    day_entries: List[Dict[str, Any]] = []
+    days = ContributionDays(segment["start"])
+    span = (segment["end"] - segment["start"]).days
     for week in calendar.get("weeks", []):
         for contribution_day in week.get("contributionDays", []):
-            day_entries.append(
-                {
-                    "date": contribution_day["date"],
-                    "count": int(contribution_day.get("contributionCount", 0)),
-                    "level": _level_from_graphql(contribution_day.get("contributionLevel")),
-                    "color": contribution_day.get("color"),
-                }
-            )
+            try:
+                index = days.index_of(date.fromisoformat(contribution_day.get("date") or ""))
+            except ValueError:
+                continue
+            if 0 <= index <= span:
+                days.set(
+                    index,
+                    int(contribution_day.get("contributionCount", 0)),
+                    _level_from_graphql(contribution_day.get("contributionLevel")),
+                    contribution_day.get("color"),
+                )
 
-    return _build_week_grid(
-        year=year_range["year"],
-        start=year_range["start"],
-        end=year_range["end"],
-        day_entries=day_entries,
-        total_contributions=int(calendar.get("totalContributions", 0)),
-    )
+    return {
+        "source": "graphql",
+        "days": days,
+        "total": int(calendar.get("totalContributions", 0)),
+        "repositories": _parse_repository_contributions(collection),
+    }
 
 
-async def _fetch_recent_repositories_graphql(
-    client: httpx.AsyncClient,
-    username: str,
-    token: str,
-    year_ranges: List[Dict[str, Any]],
-) -> List[Dict[str, Any]]:
-    start = datetime.combine(year_ranges[0]["start"], time.min, tzinfo=timezone.utc)
-    end = datetime.combine(year_ranges[-1]["end"], time.max, tzinfo=timezone.utc)
-
-    repositories_response = await client.get(
-        f"{GITHUB_REST_API_URL}/user/repos",
-        headers={
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/vnd.github+json",
-        },
-        params={
-            "affiliation": "owner,collaborator,organization_member",
-            "sort": "pushed",
-            "direction": "desc",
-            "per_page": 30,
-        },
-    )
-    repositories_response.raise_for_status()
-    repositories_payload = repositories_response.json()
-
-    if not isinstance(repositories_payload, list):
-        raise ValueError("GitHub repository listing returned an unexpected payload")
-
-    recent_repositories: List[Dict[str, Any]] = []
-    for repository in repositories_payload:
-        recent_repositories.append(
-            {
-                "name": repository.get("name"),
-                "name_with_owner": repository.get("full_name"),
-                "url": repository.get("html_url"),
-                "pushed_at": repository.get("pushed_at"),
-            }
-        )
+def _merge_repositories(*repository_maps: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    merged: Dict[str, Dict[str, Any]] = {}
+    for repository_map in repository_maps:
+        for name_with_owner, repository in repository_map.items():
+            existing = merged.get(name_with_owner)
+            if existing is None:
+                merged[name_with_owner] = dict(repository)
+                continue
 
-    async def load_last_commit(repository: Dict[str, Any]) -> Dict[str, Any]:
-        name_with_owner = repository.get("name_with_owner")
-        if not name_with_owner:
-            return repository
+            existing["commit_count"] += repository.get("commit_count", 0)
+            if (repository.get("last_commit_at") or "") > (existing.get("last_commit_at") or ""):
+                existing["last_commit_at"] = repository["last_commit_at"]
+    return merged
 
-        try:
-            commits_response = await client.get(
-                f"{GITHUB_REST_API_URL}/repos/{name_with_owner}/commits",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Accept": "application/vnd.github+json",
-                },
-                params={
-                    "author": username,
-                    "since": _utc_isoformat(start),
-                    "until": _utc_isoformat(end),
-                    "per_page": 1,
-                },
-            )
-            commits_response.raise_for_status()
-            commits = commits_response.json()
-            if isinstance(commits, list) and commits:
-                latest_commit = commits[0]
-                repository["last_commit_at"] = (
-                    latest_commit.get("commit", {}).get("author", {}) or {}
-                ).get("date") or latest_commit.get("commit", {}).get("committer", {}).get("date")
-                repository["commit_count"] = 1
-        except Exception:
-            repository["last_commit_at"] = repository.get("pushed_at")
-
-        return repository
-
-    hydrated_repositories = await asyncio.gather(
-        *(load_last_commit(repository) for repository in recent_repositories[:20])
-    )
 
-    hydrated_repositories = [
-        repository for repository in hydrated_repositories if repository.get("last_commit_at")
-    ]
-    hydrated_repositories.sort(
+def _top_repositories(repositories: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(
+        repositories.values(),
         key=lambda repository: repository.get("last_commit_at") or "",
         reverse=True,
+    )[:RECENT_REPOSITORIES_LIMIT]
+
+
+async def _fetch_graphql_activity(
+    client: httpx.AsyncClient,
+    username: str,
+    token: str,
+    segments: List[Dict[str, Any]],
+) -> List[Any]:
+    """
+    Fetch the calendar and commit activity of every date segment in one request.
+
+    Returns one result per segment; a segment GitHub could not deliver is an
+    exception instance in place of its result.
+    """
+    variables: Dict[str, Any] = {"username": username}
+    for index, segment in enumerate(segments):
+        start = datetime.combine(segment["start"], time.min, tzinfo=timezone.utc)
+        end = datetime.combine(segment["end"], time.max, tzinfo=timezone.utc)
+        variables[f"from{index}"] = _utc_isoformat(start)
+        variables[f"to{index}"] = _utc_isoformat(end)
+
+    payload = await github_client.graphql(
+        client,
+        GITHUB_GRAPHQL_URL,
+        token,
+        _build_graphql_activity_query(segments),
+        variables,
     )
 
-    return [
-        {
-            "name": repository.get("name"),
-            "name_with_owner": repository.get("name_with_owner"),
-            "url": repository.get("url"),
-            "last_commit_at": repository.get("last_commit_at"),
-            "commit_count": repository.get("commit_count", 0),
-        }
-        for repository in hydrated_repositories[:2]
-    ]
+    # GraphQL reports field-level failures next to whatever data it could resolve
+    user = (payload.get("data") or {}).get("user")
+    if not user:
+        errors = payload.get("errors") or [{}]
+        raise ValueError(errors[0].get("message", "GitHub GraphQL request failed"))
+
+    results: List[Any] = []
+    for index, segment in enumerate(segments):
+        try:
+            results.append(_parse_graphql_segment(segment, user.get(f"segment{index}")))
+        except Exception as exc:
+            results.append(exc)
+    return results
 
 
 def _parse_public_total(text: str) -> Optional[int]:
@@ -309,6 +321,11 @@ def _parse_public_total(text: str) -> Optional[int]:
 
 
 def _parse_contribution_count(text: str) -> int:
+    # Tooltips read "3 contributions on ..." or "No contributions on ..."
+    head = text.lstrip().split(" ", 1)[0].replace(",", "")
+    if head.isdigit():
+        return int(head)
+
     normalized = " ".join(text.split())
     if normalized.lower().startswith("no contributions"):
         return 0
@@ -320,141 +337,371 @@ def _parse_contribution_count(text: str) -> int:
     return int(match.group(1).replace(",", ""))
 
 
-async def _fetch_public_year(
+async def _fetch_public_segment(
     client: httpx.AsyncClient,
     username: str,
-    year_range: Dict[str, Any],
+    segment: Dict[str, Any],
 ) -> Dict[str, Any]:
-    response = await client.get(
+    # The public page is revalidated with its ETag, so an unchanged calendar costs a 304.
+    # The range moves with the days; one validator slot per user and year keeps
+    # a superseded range from lingering in the store.
+    response = await github_client.get(
+        client,
         GITHUB_PUBLIC_CONTRIBUTIONS_URL.format(username=username),
         params={
-            "from": year_range["start"].isoformat(),
-            "to": year_range["end"].isoformat(),
+            "from": segment["start"].isoformat(),
+            "to": segment["end"].isoformat(),
         },
         headers={"Accept": "text/html"},
+        resource="public_profile",
+        cache_key=f"contributions:{username.lower()}:{segment['year']}",
     )
-    response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    day_entries: List[Dict[str, Any]] = []
+    days, total = _parse_public_calendar(response.text, segment)
+    return {
+        "source": "public_profile",
+        "days": days,
+        "total": total,
+        "repositories": {},
+    }
 
-    for node in soup.select(".ContributionCalendar-day[data-date][data-level]"):
-        raw_date = node.get("data-date")
-        if not raw_date:
-            continue
 
+def _parse_public_calendar(page: str, segment: Dict[str, Any]) -> Tuple[ContributionDays, Optional[int]]:
+    """Extract date, level and count of every day in the segment with one XPath pass"""
+    document = lxml_html.fromstring(page)
+    days = ContributionDays(segment["start"])
+    span = (segment["end"] - segment["start"]).days
+
+    cells = []
+    tooltips: Dict[str, str] = {}
+    for node in PUBLIC_CALENDAR_XPATH(document):
+        if node.tag == "td":
+            cells.append(node)
+        else:
+            tooltips[node.get("for")] = node.text_content()
+
+    for cell in cells:
         try:
-            parsed_day = date.fromisoformat(raw_date)
+            index = days.index_of(date.fromisoformat(cell.get("data-date")))
         except ValueError:
             continue
+        if index < 0 or index > span:
+            continue
+
+        raw_level = cell.get("data-level", "0").strip()
+        text = tooltips.get(cell.get("id"))
+        if text is None:
+            # Older markup puts the tooltip right after its cell without a `for` link
+            sibling = cell.getnext()
+            text = sibling.text_content() if sibling is not None and sibling.tag == "tool-tip" else ""
+        days.set(index, _parse_contribution_count(text), int(raw_level) if raw_level.isdigit() else 0)
+
+    total = _parse_public_total(document.xpath("string(//*[@id='js-contribution-activity-description'])"))
+    if total is None:
+        total = _parse_public_total(document.text_content())
+    return days, total
+
+
+async def _gather_with_timeouts(*coroutines, timeout: float = FETCH_TIMEOUT_SECONDS) -> List[Any]:
+    """Run fetches concurrently; failed or timed-out ones come back as exceptions"""
+    return await asyncio.gather(
+        *(asyncio.wait_for(coroutine, timeout) for coroutine in coroutines),
+        return_exceptions=True,
+    )
+
+
+def _describe_error(error: BaseException) -> str:
+    if isinstance(error, asyncio.TimeoutError):
+        return f"timed out after {FETCH_TIMEOUT_SECONDS:.0f}s"
+    return str(error) or error.__class__.__name__
 
-        if parsed_day < year_range["start"] or parsed_day > year_range["end"]:
+
+def _plan_segments(
+    username: str,
+    year_ranges: List[Dict[str, Any]],
+    today: date,
+    source: str,
+) -> List[Dict[str, Any]]:
+    """
+    Date ranges that still have to be fetched.
+
+    A finalized year already in the history store is skipped, and the current
+    year only needs the days after the last stored one. GraphQL gets today as
+    a separate segment so the completed days (and their commit counts) can be
+    stored without double counting today's partial activity later.
+    """
+    yesterday = today - timedelta(days=1)
+    segments: List[Dict[str, Any]] = []
+
+    for year_range in year_ranges:
+        year = year_range["year"]
+        if year_range["end"] < today:
+            if _is_finalized(year_range, today) and contribution_history.get_finalized(username, year, source):
+                continue
+            segments.append({"year": year, "start": year_range["start"], "end": year_range["end"]})
             continue
 
-        raw_level = str(node.get("data-level", "0")).strip()
-        level = int(raw_level) if raw_level.isdigit() else 0
-        tooltip = node.find_next_sibling("tool-tip")
-        count = _parse_contribution_count(tooltip.get_text(" ", strip=True) if tooltip else "")
-
-        day_entries.append(
-            {
-                "date": raw_date,
-                "count": count,
-                "level": level,
-                "color": GITHUB_CONTRIBUTION_COLORS.get(level),
-            }
+        stored = contribution_history.get_current(username, year, source)
+        start = year_range["start"]
+        if stored and stored.get("through"):
+            start = max(start, date.fromisoformat(stored["through"]) + timedelta(days=1))
+        start = min(start, today)
+
+        if source == "graphql":
+            if start <= yesterday:
+                segments.append({"year": year, "start": start, "end": yesterday})
+            segments.append({"year": year, "start": today, "end": today})
+        else:
+            segments.append({"year": year, "start": start, "end": today})
+
+    return segments
+
+
+def _is_finalized(year_range: Dict[str, Any], today: date) -> bool:
+    # Give the last day of the year a day to settle before treating it as immutable
+    return year_range["end"] < today - timedelta(days=1)
+
+
+def _finalized_grid(username: str, year_range: Dict[str, Any], record: Dict[str, Any]) -> Dict[str, Any]:
+    """Week grid of a stored finalized year, built once per process"""
+    key = (username.lower(), year_range["year"], record.get("source"))
+    memo = _finalized_grids.get(key)
+    if memo is None or memo[0] is not record:
+        grid = _build_week_grid(
+            year=year_range["year"],
+            start=year_range["start"],
+            end=year_range["end"],
+            days=record["days"],
+            total_contributions=record.get("total"),
         )
+        memo = (record, grid)
+        _finalized_grids[key] = memo
+        while len(_finalized_grids) > ACTIVITY_CACHE_MAX_ENTRIES * 2:
+            _finalized_grids.popitem(last=False)
+    _finalized_grids.move_to_end(key)
+    return memo[1]
+
+
+def _get_cached_activity(username: str, allow_stale: bool = False, count: bool = True) -> Optional[Dict[str, Any]]:
+    return activity_cache.get(username.lower(), allow_stale=allow_stale, count=count)
+
+
+def _set_cached_activity(username: str, payload: Dict[str, Any]) -> None:
+    ttl_seconds = CACHE_TTL_SECONDS if payload.get("available") else FAILURE_CACHE_TTL_SECONDS
+    activity_cache.set(username.lower(), payload, ttl_seconds)
+
+
+def resolve_username(username: Optional[str] = None) -> str:
+    return (username or GITHUB_USERNAME or "BishalBudhathoki").strip() or "BishalBudhathoki"
+
+
+def get_activity_cache_stats() -> Dict[str, Any]:
+    return activity_cache.stats()
+
+
+def _assemble_past_year(
+    username: str,
+    year_range: Dict[str, Any],
+    today: date,
+    source: str,
+    year_results: List[Tuple[Dict[str, Any], Any]],
+    repository_maps: List[Dict[str, Dict[str, Any]]],
+) -> Optional[Dict[str, Any]]:
+    year = year_range["year"]
+    if not year_results:
+        record = contribution_history.get_finalized(username, year, source)
+        repository_maps.append(record["repositories"])
+        return _finalized_grid(username, year_range, record)
+
+    _, result = year_results[0]
+    if isinstance(result, BaseException):
+        return None
+
+    repository_maps.append(result["repositories"])
+    if _is_finalized(year_range, today) and result["source"] == source:
+        record = contribution_history.put_finalized(
+            username, year, source, result["days"], result["total"], result["repositories"]
+        )
+        return _finalized_grid(username, year_range, record)
 
-    total_contributions = _parse_public_total(soup.get_text(" ", strip=True))
     return _build_week_grid(
-        year=year_range["year"],
+        year=year,
         start=year_range["start"],
         end=year_range["end"],
-        day_entries=day_entries,
-        total_contributions=total_contributions,
+        days=result["days"],
+        total_contributions=result["total"],
     )
 
 
-def _get_cached_activity(username: str) -> Optional[Dict[str, Any]]:
-    cached = _activity_cache.get(username)
-    if not cached:
-        return None
-
-    expires_at = cached["fetched_at"] + timedelta(seconds=CACHE_TTL_SECONDS)
-    if datetime.now(timezone.utc) >= expires_at:
-        _activity_cache.pop(username, None)
-        return None
-
-    return cached["payload"]
+def _assemble_current_year(
+    username: str,
+    year_range: Dict[str, Any],
+    today: date,
+    yesterday: date,
+    source: str,
+    year_results: List[Tuple[Dict[str, Any], Any]],
+    repository_maps: List[Dict[str, Dict[str, Any]]],
+) -> Optional[Dict[str, Any]]:
+    """Merge the stored completed days with the freshly fetched ones and store the new completed days"""
+    year = year_range["year"]
+    stored = contribution_history.get_current(username, year, source)
+    year_days = ContributionDays(year_range["start"])
+    if stored:
+        year_days.update(stored["days"])
+    stored_repositories = stored["repositories"] if stored else {}
+    year_repository_maps = [stored_repositories]
+
+    settled_days = ContributionDays(year_range["start"])
+    settled_repositories: Dict[str, Dict[str, Any]] = {}
+    has_settled = False
+    settled_ok = True
+
+    for segment, result in year_results:
+        is_settled = segment["start"] < today
+        has_settled = has_settled or is_settled
+        if isinstance(result, BaseException):
+            settled_ok = settled_ok and not is_settled
+            continue
 
+        year_days.update(result["days"])
+        year_repository_maps.append(result["repositories"])
+
+        if is_settled:
+            settled_days.update(result["days"].slice(segment["start"], yesterday))
+            if result["source"] != source:
+                # Fallback data is served but never mixed into the stored record
+                settled_ok = False
+            elif segment["end"] < today:
+                settled_repositories = result["repositories"]
+
+    if has_settled and settled_ok:
+        contribution_history.extend_current(
+            username,
+            year,
+            source,
+            yesterday,
+            settled_days,
+            _merge_repositories(stored_repositories, settled_repositories),
+        )
 
-def _set_cached_activity(username: str, payload: Dict[str, Any]) -> None:
-    _activity_cache[username] = {
-        "fetched_at": datetime.now(timezone.utc),
-        "payload": payload,
-    }
+    if not len(year_days):
+        return None
 
+    repository_maps.extend(year_repository_maps)
+    return _build_week_grid(
+        year=year,
+        start=year_range["start"],
+        end=year_range["end"],
+        days=year_days,
+    )
 
-async def get_github_activity(username: Optional[str] = None) -> Dict[str, Any]:
-    resolved_username = (username or GITHUB_USERNAME or "BishalBudhathoki").strip() or "BishalBudhathoki"
-    cached = _get_cached_activity(resolved_username)
-    if cached:
-        return cached
 
-    year_ranges = _get_year_ranges()
+async def get_github_activity(
+    username: Optional[str] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """
+    Activity payload for a user, from the cache while it is fresh.
+
+    force skips the fresh-cache check; the background refresher uses it to
+    refresh ahead of expiry.
+    """
+    resolved_username = resolve_username(username)
+    if not force:
+        cached = _get_cached_activity(resolved_username)
+        if cached:
+            return cached
+
+    # Normally loaded by the startup warmup; never read the file on the loop
+    if not contribution_history.loaded:
+        await asyncio.to_thread(contribution_history.load)
+
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+    year_ranges = _get_year_ranges(today)
     token = (os.getenv("GITHUB_TOKEN") or "").strip()
-    source = "public_profile"
-    recent_repositories: List[Dict[str, Any]] = []
-
-    async with httpx.AsyncClient(
-        timeout=20.0,
-        headers={
-            "User-Agent": f"{resolved_username}-portfolio",
-            "X-GitHub-Api-Version": "2022-11-28",
-        },
-        follow_redirects=True,
-    ) as client:
-        try:
+    wanted_source = "graphql" if token else "public_profile"
+    source = wanted_source
+    repository_maps: List[Dict[str, Dict[str, Any]]] = []
+    errors: List[str] = []
+
+    if token and github_client.should_back_off("graphql"):
+        stale = _get_cached_activity(resolved_username, allow_stale=True, count=False)
+        if stale and stale.get("available"):
+            return {**stale, "stale": True, "rate_limit": github_client.rate_limit_snapshot()}
+        errors.append("graphql: rate-limit budget is low, using the public contributions page")
+
+    client = client or http_clients.get("github")
+    try:
+        segments = _plan_segments(resolved_username, year_ranges, today, wanted_source)
+        results: List[Any] = [None] * len(segments)
+
+        if token and segments and not github_client.should_back_off("graphql"):
+            try:
+                results = await asyncio.wait_for(
+                    _fetch_graphql_activity(client, resolved_username, token, segments),
+                    FETCH_TIMEOUT_SECONDS,
+                )
+            except Exception as exc:
+                errors.append(f"graphql: {_describe_error(exc)}")
+                results = [exc for _ in segments]
+
+        # Segments GraphQL could not deliver fall back to the public contributions page
+        pending = [index for index, result in enumerate(results) if result is None or isinstance(result, BaseException)]
+        if pending:
             if token:
-                try:
-                    years = [
-                        await _fetch_graphql_year(client, resolved_username, token, year_range)
-                        for year_range in year_ranges
-                    ]
-                    try:
-                        recent_repositories = await _fetch_recent_repositories_graphql(
-                            client,
-                            resolved_username,
-                            token,
-                            year_ranges,
-                        )
-                    except Exception:
-                        recent_repositories = []
-                    source = "graphql"
-                except Exception:
-                    years = [
-                        await _fetch_public_year(client, resolved_username, year_range)
-                        for year_range in year_ranges
-                    ]
+                source = "public_profile"
+            fallback_results = await _gather_with_timeouts(
+                *(_fetch_public_segment(client, resolved_username, segments[index]) for index in pending)
+            )
+            for index, fallback_result in zip(pending, fallback_results):
+                results[index] = fallback_result
+
+        years = []
+        for year_range in year_ranges:
+            year = year_range["year"]
+            year_results = [
+                (segment, result) for segment, result in zip(segments, results) if segment["year"] == year
+            ]
+            for segment, result in year_results:
+                if isinstance(result, BaseException):
+                    errors.append(f"{segment['start']}..{segment['end']}: {_describe_error(result)}")
+
+            if year_range["end"] < today:
+                grid = _assemble_past_year(resolved_username, year_range, today, wanted_source, year_results, repository_maps)
             else:
-                years = [
-                    await _fetch_public_year(client, resolved_username, year_range)
-                    for year_range in year_ranges
-                ]
-        except Exception as exc:
-            payload = {
-                "username": resolved_username,
-                "profile_url": f"https://github.com/{resolved_username}",
-                "available": False,
-                "message": f"GitHub activity is temporarily unavailable: {str(exc)}",
-                "source": source,
-                "recent_repositories": recent_repositories,
-                "years": [],
-                "updated_at": datetime.now(timezone.utc).isoformat(),
-            }
-            _set_cached_activity(resolved_username, payload)
-            return payload
+                grid = _assemble_current_year(
+                    resolved_username, year_range, today, yesterday, wanted_source, year_results, repository_maps
+                )
+            if grid:
+                years.append(grid)
+
+        await asyncio.to_thread(contribution_history.save)
+
+        if not years:
+            raise ValueError("; ".join(errors) or "no contribution data returned")
+    except Exception as exc:
+        # Keep serving the last good payload rather than replacing it with the failure
+        stale = _get_cached_activity(resolved_username, allow_stale=True, count=False)
+        if stale and stale.get("available"):
+            return {**stale, "stale": True, "rate_limit": github_client.rate_limit_snapshot()}
+
+        payload = {
+            "username": resolved_username,
+            "profile_url": f"https://github.com/{resolved_username}",
+            "available": False,
+            "message": f"GitHub activity is temporarily unavailable: {str(exc)}",
+            "source": source,
+            "recent_repositories": _top_repositories(_merge_repositories(*repository_maps)),
+            "years": [],
+            "rate_limit": github_client.rate_limit_snapshot(),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        _set_cached_activity(resolved_username, payload)
+        return payload
 
+    recent_repositories = _top_repositories(_merge_repositories(*repository_maps))
     payload = {
         "username": resolved_username,
         "profile_url": f"https://github.com/{resolved_username}",
@@ -462,6 +709,10 @@ async def get_github_activity(username: Optional[str] = None) -> Dict[str, Any]:
         "source": source,
         "recent_repositories": recent_repositories,
         "years": years,
+        "stats": compute_contribution_stats(years),
+        "partial": bool(errors),
+        "errors": errors,
+        "rate_limit": github_client.rate_limit_snapshot(),
         "updated_at": datetime.now(timezone.utc).isoformat(),
     }
     _set_cached_activity(resolved_username, payload)
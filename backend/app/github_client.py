@@ -0,0 +1,168 @@
+"""
+GitHub HTTP layer with conditional requests and rate-limit tracking.
+
+GET responses are remembered with their ETag / Last-Modified validators
+and revalidated with If-None-Match / If-Modified-Since; a 304 replays the
+stored body and does not count against the quota. Callers whose query
+changes over time (a date range ending today) pass a stable cache_key, so
+the new response replaces the superseded one instead of adding an entry
+per day. Every response updates
+the X-RateLimit-* budget per resource, and callers can check
+`should_back_off` before spending more of it.
+
+GraphQL is always a POST, which GitHub never answers conditionally, so
+only the budget tracking applies to it.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+import httpx
+
+# Stop spending a resource's budget once fewer requests than this remain
+GITHUB_RATE_LIMIT_RESERVE = int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "100"))
+# Back-off used when GitHub throttles without saying for how long
+DEFAULT_BACKOFF_SECONDS = 60
+MAX_STORED_VALIDATORS = 64
+
+
+class GitHubResponse:
+    """Body of a GitHub response, replayed from the validator store on a 304"""
+
+    def __init__(self, status_code: int, text: str, not_modified: bool = False):
+        self.status_code = status_code
+        self.text = text
+        self.not_modified = not_modified
+
+
+class GitHubClient:
+    def __init__(self, reserve: int = GITHUB_RATE_LIMIT_RESERVE):
+        """
+        Initialize the client layer
+
+        Args:
+            reserve: Remaining requests below which a resource counts as exhausted
+        """
+        self.reserve = reserve
+        self.rate_limits: Dict[str, Dict[str, Any]] = {}
+        self.backoff_until: Dict[str, float] = {}
+        self.not_modified_count = 0
+        self._validators: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def _record_rate_limit(self, response: httpx.Response, default_resource: str) -> str:
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource", default_resource)
+        if "X-RateLimit-Remaining" in headers:
+            reset = int(headers.get("X-RateLimit-Reset", "0"))
+            self.rate_limits[resource] = {
+                "limit": int(headers.get("X-RateLimit-Limit", "0")),
+                "remaining": int(headers["X-RateLimit-Remaining"]),
+                "used": int(headers.get("X-RateLimit-Used", "0")),
+                "reset_at": datetime.fromtimestamp(reset, timezone.utc).isoformat() if reset else None,
+                "_reset": reset,
+            }
+
+        # Primary (remaining == 0) and secondary (Retry-After) limits both answer 403 or 429
+        if response.status_code in (403, 429):
+            retry_after = headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                self.backoff_until[resource] = time.time() + int(retry_after)
+            elif headers.get("X-RateLimit-Remaining") == "0":
+                self.backoff_until[resource] = float(self.rate_limits[resource]["_reset"] or time.time() + DEFAULT_BACKOFF_SECONDS)
+            else:
+                self.backoff_until[resource] = time.time() + DEFAULT_BACKOFF_SECONDS
+        return resource
+
+    def should_back_off(self, resource: str) -> bool:
+        """True while GitHub asked us to wait or the budget is down to the reserve"""
+        now = time.time()
+        if self.backoff_until.get(resource, 0) > now:
+            return True
+
+        budget = self.rate_limits.get(resource)
+        if not budget or budget["_reset"] <= now:
+            return False
+        return budget["remaining"] < self.reserve
+
+    def rate_limit_snapshot(self) -> Dict[str, Any]:
+        """Budget per resource for payload metadata"""
+        now = time.time()
+        snapshot: Dict[str, Any] = {}
+        for resource, budget in self.rate_limits.items():
+            snapshot[resource] = {key: value for key, value in budget.items() if not key.startswith("_")}
+            snapshot[resource]["backing_off"] = self.should_back_off(resource)
+            if self.backoff_until.get(resource, 0) > now:
+                snapshot[resource]["retry_at"] = datetime.fromtimestamp(
+                    self.backoff_until[resource], timezone.utc).isoformat()
+        return snapshot
+
+    async def get(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        resource: str = "core",
+        cache_key: Optional[str] = None,
+    ) -> GitHubResponse:
+        """
+        Conditional GET; raises httpx.HTTPStatusError for error statuses.
+        cache_key names the validator slot (the full URL by default); the
+        stored validators are only sent for the exact URL they came from.
+        """
+        full_url = str(httpx.URL(url, params=params))
+        key = cache_key or full_url
+        request_headers = dict(headers or {})
+        stored = self._validators.get(key)
+        if stored and stored["url"] != full_url:
+            stored = None
+        if stored:
+            if stored.get("etag"):
+                request_headers["If-None-Match"] = stored["etag"]
+            if stored.get("last_modified"):
+                request_headers["If-Modified-Since"] = stored["last_modified"]
+
+        response = await client.get(url, params=params, headers=request_headers)
+        self._record_rate_limit(response, resource)
+
+        if response.status_code == 304 and stored:
+            self.not_modified_count += 1
+            self._validators.move_to_end(key)
+            return GitHubResponse(200, stored["text"], not_modified=True)
+
+        response.raise_for_status()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._validators[key] = {"url": full_url, "etag": etag, "last_modified": last_modified, "text": response.text}
+            self._validators.move_to_end(key)
+            while len(self._validators) > MAX_STORED_VALIDATORS:
+                self._validators.popitem(last=False)
+        return GitHubResponse(response.status_code, response.text)
+
+    async def graphql(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        token: str,
+        query: str,
+        variables: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """POST a GraphQL document and return the decoded payload"""
+        response = await client.post(
+            url,
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json",
+            },
+            json={"query": query, "variables": variables},
+        )
+        self._record_rate_limit(response, "graphql")
+        response.raise_for_status()
+        return response.json()
+
+
+github_client = GitHubClient()
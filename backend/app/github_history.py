@@ -0,0 +1,157 @@
+"""
+On-disk store of GitHub contribution days.
+
+Once a calendar year is over its contributions never change, so a
+finalized year is fetched once and then served from this store. The
+current year is kept as the days that are already complete (everything
+before today) plus the date they run through, so each refresh only has to
+fetch the days after that date.
+
+The app loads the store in its startup warmup and saves it from a worker
+thread; a lock keeps a save from serializing a record while it is updated.
+"""
+
+import os
+import json
+import logging
+import threading
+from datetime import date
+from typing import Any, Dict, Optional
+
+from .contribution_days import ContributionDays
+
+GITHUB_HISTORY_PATH = os.getenv(
+    "GITHUB_HISTORY_PATH",
+    os.path.join(os.path.dirname(__file__), "../data/github_contributions.json"),
+)
+HISTORY_FORMAT_VERSION = 2
+
+logger = logging.getLogger(__name__)
+
+
+class ContributionHistoryStore:
+    def __init__(self, path: str = GITHUB_HISTORY_PATH):
+        """
+        Initialize the store
+
+        Args:
+            path: JSON file the contribution history is persisted to
+        """
+        self.path = path
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.loaded = False
+        self.dirty = False
+        # Reentrant: the mutators hold it while _user() may load the file
+        self._lock = threading.RLock()
+
+    def load(self) -> None:
+        """Read the persisted history; a missing or unreadable file starts empty"""
+        with self._lock:
+            if self.loaded:
+                return
+            self.loaded = True
+            if not os.path.exists(self.path):
+                return
+
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+                if data.get("version") == HISTORY_FORMAT_VERSION:
+                    self.users = data.get("users", {})
+                    for user in self.users.values():
+                        records = list(user["finalized"].values()) + ([user["current"]] if user.get("current") else [])
+                        for record in records:
+                            record["days"] = ContributionDays.from_dict(record["days"])
+                    logger.info("Loaded GitHub contribution history for %d user(s) from %s", len(self.users), self.path)
+            except Exception as e:
+                logger.warning("Failed to load GitHub contribution history: %s", e)
+                self.users = {}
+
+    def save(self) -> None:
+        """Write the history to disk if anything changed since the last save"""
+        with self._lock:
+            if not self.dirty:
+                return
+
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, "w") as f:
+                    json.dump(
+                        {"version": HISTORY_FORMAT_VERSION, "users": self.users},
+                        f,
+                        default=lambda value: value.to_dict() if isinstance(value, ContributionDays) else str(value),
+                    )
+                os.replace(temp_path, self.path)
+                self.dirty = False
+            except Exception as e:
+                logger.warning("Failed to save GitHub contribution history: %s", e)
+
+    def _user(self, username: str) -> Dict[str, Any]:
+        if not self.loaded:
+            self.load()
+        return self.users.setdefault(username.lower(), {"finalized": {}, "current": None})
+
+    def get_finalized(self, username: str, year: int, source: str) -> Optional[Dict[str, Any]]:
+        """A finished year fetched from the given source, if stored"""
+        record = self._user(username)["finalized"].get(str(year))
+        if record and record.get("source") == source:
+            return record
+        return None
+
+    def put_finalized(
+        self,
+        username: str,
+        year: int,
+        source: str,
+        days: ContributionDays,
+        total: Optional[int],
+        repositories: Dict[str, Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        record = {
+            "source": source,
+            "days": days,
+            "total": total,
+            "repositories": repositories,
+        }
+        with self._lock:
+            self._user(username)["finalized"][str(year)] = record
+            self.dirty = True
+        return record
+
+    def get_current(self, username: str, year: int, source: str) -> Optional[Dict[str, Any]]:
+        """The completed days of the current year, if stored for this year and source"""
+        record = self._user(username).get("current")
+        if record and record.get("year") == year and record.get("source") == source:
+            return record
+        return None
+
+    def extend_current(
+        self,
+        username: str,
+        year: int,
+        source: str,
+        through: date,
+        days: ContributionDays,
+        repositories: Dict[str, Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Append completed days to the current year.
+
+        Starts a fresh record when the stored one belongs to another year or
+        source. `repositories` must already be merged with the stored ones.
+        """
+        record = self.get_current(username, year, source)
+        with self._lock:
+            if record is None:
+                record = {"year": year, "source": source, "through": None, "days": ContributionDays(date(year, 1, 1)), "repositories": {}}
+                self._user(username)["current"] = record
+
+            record["days"].update(days)
+            record["through"] = through.isoformat()
+            record["repositories"] = repositories
+            self.dirty = True
+        return record
+
+
+contribution_history = ContributionHistoryStore()
@@ -0,0 +1,204 @@
+"""
+Background refresh of the GitHub activity payload.
+
+A task started in the app lifespan refreshes the cached payload ahead of
+its expiry (with jitter, so several instances do not hit GitHub at the
+same moment). Failures back off exponentially, and after repeated
+failures a circuit breaker stops calling GitHub for a cool-down period.
+Requests are answered from the cache - fresh or last known good - and
+only wait on GitHub when nothing has ever been cached. Concurrent misses
+(and a refresh due at the same time) share one in-flight fetch.
+"""
+
+import os
+import time
+import random
+import asyncio
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .github_activity import (
+    CACHE_TTL_SECONDS,
+    activity_cache,
+    get_github_activity,
+    resolve_username,
+)
+from .http_clients import http_clients
+
+GITHUB_BACKGROUND_REFRESH = os.getenv("GITHUB_BACKGROUND_REFRESH", "true").lower() in ("1", "true", "yes")
+# Refresh once this share of the TTL has passed, so the cache never expires in between
+REFRESH_AHEAD_RATIO = 0.8
+JITTER_RATIO = 0.1
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 15 * 60
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN_SECONDS = 10 * 60
+
+
+class CircuitBreaker:
+    """closed -> open after consecutive failures -> half_open after the cool-down -> closed on success"""
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD, cooldown_seconds: float = BREAKER_COOLDOWN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown_seconds:
+            return "half_open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        # A failed half-open trial re-opens the breaker for another cool-down
+        if self.failures >= self.failure_threshold or self.opened_at is not None:
+            self.opened_at = time.monotonic()
+
+
+class GitHubActivityRefresher:
+    def __init__(self, username: Optional[str] = None, ttl_seconds: float = CACHE_TTL_SECONDS):
+        """
+        Initialize the refresher
+
+        Args:
+            username: GitHub user to keep fresh (defaults to GITHUB_USERNAME)
+            ttl_seconds: Lifetime of a cached payload
+        """
+        self.username = resolve_username(username)
+        self.ttl_seconds = ttl_seconds
+        self.breaker = CircuitBreaker()
+        self.consecutive_failures = 0
+        self.last_success_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.next_refresh_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._fetch_task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def _jitter(self, delay: float) -> float:
+        return max(1.0, delay + random.uniform(-JITTER_RATIO, JITTER_RATIO) * delay)
+
+    def _initial_delay(self) -> float:
+        remaining = activity_cache.time_to_expiry(self.username.lower())
+        if remaining is None or remaining <= self.ttl_seconds * (1 - REFRESH_AHEAD_RATIO):
+            # Nothing cached, or it expires soon: refresh shortly after startup
+            return random.uniform(1.0, 10.0)
+        return self._jitter(remaining - self.ttl_seconds * (1 - REFRESH_AHEAD_RATIO))
+
+    def _failure_delay(self) -> float:
+        backoff = min(BACKOFF_BASE_SECONDS * 2 ** (self.consecutive_failures - 1), BACKOFF_MAX_SECONDS)
+        return self._jitter(backoff)
+
+    async def fetch(self, client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+        """Fetch the payload from GitHub, joining the fetch already in flight if there is one"""
+        if self._fetch_task is None or self._fetch_task.done():
+            self._fetch_task = asyncio.create_task(get_github_activity(self.username, client=client, force=True))
+        # Shielded, so a request that goes away does not cancel the fetch for everyone else
+        return await asyncio.shield(self._fetch_task)
+
+    async def refresh_once(self, client: Optional[httpx.AsyncClient] = None) -> bool:
+        """Refresh the cached payload now; True when GitHub answered with fresh data"""
+        if not self.breaker.allow_request():
+            return False
+
+        try:
+            payload = await self.fetch(client)
+            # A stale or unavailable payload means GitHub could not be reached
+            succeeded = bool(payload.get("available")) and not payload.get("stale")
+            self.last_error = None if succeeded else payload.get("message", "served stale data")
+        except Exception as e:
+            succeeded = False
+            self.last_error = str(e)
+
+        if succeeded:
+            self.consecutive_failures = 0
+            self.last_success_at = time.time()
+            self.breaker.record_success()
+        else:
+            self.consecutive_failures += 1
+            self.breaker.record_failure()
+            print(f"GitHub activity refresh failed ({self.consecutive_failures} in a row): {self.last_error}")
+        return succeeded
+
+    async def _run(self) -> None:
+        delay = self._initial_delay()
+        while True:
+            self.next_refresh_at = time.time() + delay
+            await asyncio.sleep(delay)
+
+            if not self.breaker.allow_request():
+                delay = self._jitter(self.breaker.cooldown_seconds)
+                continue
+
+            succeeded = await self.refresh_once(http_clients.get("github"))
+            delay = self._jitter(self.ttl_seconds * REFRESH_AHEAD_RATIO) if succeeded else self._failure_delay()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+            print(f"GitHub activity refresher started for {self.username}")
+
+    async def stop(self) -> None:
+        tasks = [task for task in (self._task, self._fetch_task) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._fetch_task = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "breaker": self.breaker.state,
+            "consecutive_failures": self.consecutive_failures,
+            "last_success_at": self.last_success_at,
+            "last_error": self.last_error,
+            "next_refresh_at": self.next_refresh_at,
+        }
+
+
+github_refresher = GitHubActivityRefresher()
+
+
+async def serve_github_activity(client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+    """
+    Answer a request from the cache while the refresher keeps it warm; a
+    stale payload is marked as such. GitHub is only called inline when
+    nothing has been cached yet (or background refresh is disabled).
+    """
+    if github_refresher.running:
+        payload, is_fresh = activity_cache.lookup(github_refresher.username.lower(), allow_stale=True)
+        if payload is not None:
+            return payload if is_fresh else {**payload, "stale": True}
+        if not github_refresher.breaker.allow_request():
+            return {
+                "username": github_refresher.username,
+                "profile_url": f"https://github.com/{github_refresher.username}",
+                "available": False,
+                "message": "GitHub activity is temporarily unavailable",
+                "source": "public_profile",
+                "recent_repositories": [],
+                "years": [],
+            }
+        # The miss is counted above; concurrent misses wait on the same fetch
+        return await github_refresher.fetch(client)
+
+    cached = activity_cache.get(github_refresher.username.lower())
+    if cached is not None:
+        return cached
+    return await github_refresher.fetch(client)
@@ -0,0 +1,80 @@
+"""
+Server-side rendering of the contribution heatmap.
+
+The week grid of a cached activity payload is rendered to SVG once per
+refresh and kept as bytes with an ETag, so `/api/github/activity.svg`
+answers repeat requests with the stored bytes or a 304.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .contribution_days import LEVEL_COLORS
+
+CELL_SIZE = 10
+CELL_GAP = 3
+LEFT_MARGIN = 28
+TOP_MARGIN = 18
+WEEKDAY_LABELS = {1: "Mon", 3: "Wed", 5: "Fri"}
+MAX_RENDERED = 16
+
+# (username, year, updated_at) -> (svg bytes, etag)
+_rendered: "OrderedDict[Tuple[str, int, str], Tuple[bytes, str]]" = OrderedDict()
+
+
+def render_contribution_svg(grid: Dict[str, Any]) -> bytes:
+    step = CELL_SIZE + CELL_GAP
+    width = LEFT_MARGIN + len(grid["weeks"]) * step
+    height = TOP_MARGIN + 7 * step
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" role="img" '
+        f'aria-label="{grid["total_contributions"]} contributions in {grid["year"]}">',
+        "<style>text{font:9px -apple-system,BlinkMacSystemFont,sans-serif;fill:#767676}"
+        + "".join(f".l{level}{{fill:{color}}}" for level, color in enumerate(LEVEL_COLORS))
+        + "</style>",
+    ]
+
+    for label in grid["month_labels"]:
+        parts.append(f'<text x="{LEFT_MARGIN + label["week_index"] * step}" y="{TOP_MARGIN - 6}">{label["label"]}</text>')
+    for weekday, label in WEEKDAY_LABELS.items():
+        parts.append(f'<text x="0" y="{TOP_MARGIN + weekday * step + CELL_SIZE - 1}">{label}</text>')
+
+    for week_index, week in enumerate(grid["weeks"]):
+        x = LEFT_MARGIN + week_index * step
+        for day in week["days"]:
+            if day["is_placeholder"]:
+                continue
+            y = TOP_MARGIN + day["weekday"] * step
+            level = min(day["level"], 4)
+            color = day.get("color")
+            # Default palette colors go through a class; custom ones (e.g. seasonal themes) inline
+            paint = f'class="l{level}"' if not color or color == LEVEL_COLORS[level] else f'fill="{color}"'
+            parts.append(f'<rect x="{x}" y="{y}" width="{CELL_SIZE}" height="{CELL_SIZE}" rx="2" {paint}/>')
+
+    parts.append("</svg>")
+    return "".join(parts).encode("utf-8")
+
+
+def get_contribution_svg(payload: Dict[str, Any], year: Optional[int] = None) -> Optional[Tuple[bytes, str]]:
+    """
+    SVG bytes and ETag for one year of an activity payload (the latest year
+    by default), rendered only once per payload refresh
+    """
+    years = payload.get("years") or []
+    grid = next((entry for entry in years if entry["year"] == year), None) if year else (years[-1] if years else None)
+    if grid is None:
+        return None
+
+    key = (payload.get("username", ""), grid["year"], payload.get("updated_at", ""))
+    rendered = _rendered.get(key)
+    if rendered is None:
+        svg = render_contribution_svg(grid)
+        rendered = (svg, f'"{hashlib.sha1(svg).hexdigest()[:20]}"')
+        _rendered[key] = rendered
+        while len(_rendered) > MAX_RENDERED:
+            _rendered.popitem(last=False)
+    _rendered.move_to_end(key)
+    return rendered
@@ -1,14 +1,18 @@
 import os
 import json
+import time
+import logging
 from datetime import datetime
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from typing import List, Dict, Any
 from dotenv import load_dotenv
 
+from .metrics import metrics, status_class
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Google Sheet ID (from the URL)
 SHEET_ID = "1blqFnWjYgB1idiYqqEZR5qfueO0k6vPZv4eP8Yn3xTg"
 SHEET_NAME = "blog_posts"
@@ -22,7 +26,7 @@ async def get_blog_posts_from_sheet() -> List[Dict[str, Any]]:
     Fetch blog posts from Google Sheets
     """
     try:
-        print("Fetching blog posts from sheet...")
+        logger.debug("Fetching blog posts from sheet")
         
         # Check if cached data exists and is recent (less than 1 hour old)
         if os.path.exists(BLOG_CACHE_PATH):
@@ -30,13 +34,15 @@ async def get_blog_posts_from_sheet() -> List[Dict[str, Any]]:
                 cache_data = json.load(f)
                 last_updated = datetime.fromisoformat(cache_data.get('last_updated', '2000-01-01'))
                 if (datetime.now() - last_updated).total_seconds() < 3600:  # 1 hour in seconds
-                    print(f"Using cached blog data, last updated: {last_updated}")
+                    logger.debug("Using cached blog data, last updated: %s", last_updated)
+                    metrics.cache_lookups.inc("blog", "hit")
                     return cache_data.get('posts', [])
+        metrics.cache_lookups.inc("blog", "miss")
         
         # If no recent cache, fetch from Google Sheets
         service = await setup_sheets_service()
         if not service:
-            print("Failed to set up Google Sheets service")
+            logger.warning("Failed to set up Google Sheets service")
             # Fall back to cache if it exists, otherwise return empty list
             if os.path.exists(BLOG_CACHE_PATH):
                 with open(BLOG_CACHE_PATH, 'r') as f:
@@ -46,21 +52,22 @@ async def get_blog_posts_from_sheet() -> List[Dict[str, Any]]:
         
         # Get sheet data
         sheet_data = fetch_sheet_data(service, SHEET_ID, SHEET_NAME)
-        print(f"Raw sheet data: {sheet_data if sheet_data else 'No data'}")
+        # Full dumps are DEBUG only; the arguments are not formatted otherwise
+        logger.debug("Raw sheet data: %s", sheet_data or "No data")
         
         if not sheet_data:
-            print("No sheet data found, checking cache")
+            logger.warning("No sheet data found, checking cache")
             # Fall back to cache if it exists
             if os.path.exists(BLOG_CACHE_PATH):
                 with open(BLOG_CACHE_PATH, 'r') as f:
                     cache_data = json.load(f)
                     return cache_data.get('posts', [])
-            print("No cache found either, returning empty list")
+            logger.warning("No cache found either, returning empty list")
             return []
         
         # Process sheet data into blog posts
         blog_posts = process_sheet_data(sheet_data)
-        print(f"Processed blog posts: {blog_posts}")
+        logger.debug("Processed blog posts: %s", blog_posts)
         
         # Cache the data
         cache_data = {
@@ -73,7 +80,7 @@ async def get_blog_posts_from_sheet() -> List[Dict[str, Any]]:
         return blog_posts
     
     except Exception as e:
-        print(f"Error getting blog posts: {e}")
+        logger.error("Error getting blog posts: %s", e)
         # Try to return cached data if available
         if os.path.exists(BLOG_CACHE_PATH):
             with open(BLOG_CACHE_PATH, 'r') as f:
@@ -82,9 +89,44 @@ async def get_blog_posts_from_sheet() -> List[Dict[str, Any]]:
         # If all else fails, return an empty list
         return []
 
+_request_builder = None
+
+def sheets_request_builder():
+    """
+    googleapiclient HttpRequest subclass that records every Sheets call in
+    the upstream latency histogram, labelled by API method (values.get,
+    batchUpdate, ...). Created on first use, like the client itself.
+    """
+    global _request_builder
+    if _request_builder is None:
+        from googleapiclient.errors import HttpError
+        from googleapiclient.http import HttpRequest
+
+        class TimedHttpRequest(HttpRequest):
+            def execute(self, *args, **kwargs):
+                operation = (self.methodId or "unknown").replace("sheets.spreadsheets.", "")
+                start = time.perf_counter()
+                status = "error"
+                try:
+                    result = super().execute(*args, **kwargs)
+                    status = "2xx"
+                    return result
+                except HttpError as e:
+                    status = status_class(int(e.resp.status))
+                    raise
+                finally:
+                    metrics.upstream_latency.observe(time.perf_counter() - start, "sheets", operation, status)
+
+        _request_builder = TimedHttpRequest
+    return _request_builder
+
 async def setup_sheets_service():
     """Set up the Google Sheets API service asynchronously"""
     try:
+        # The Google API client is slow to import and only needed once Sheets are used
+        from google.oauth2 import service_account
+        from googleapiclient.discovery import build
+
         scopes = ['https://www.googleapis.com/auth/spreadsheets']
         credentials_secret = os.getenv('GOOGLE_SHEETS_CREDENTIALS')
         credentials_path = os.getenv('GOOGLE_CREDENTIALS_PATH')
@@ -99,11 +141,11 @@ async def setup_sheets_service():
                         credentials_info,
                         scopes=scopes
                     )
-                    service = build('sheets', 'v4', credentials=credentials)
-                    print("Successfully created Sheets service from secret env JSON")
+                    service = build('sheets', 'v4', credentials=credentials, requestBuilder=sheets_request_builder())
+                    logger.debug("Created Sheets service from secret env JSON")
                     return service
             except Exception as secret_error:
-                print(f"Error loading Google Sheets credentials from env JSON: {secret_error}")
+                logger.error("Error loading Google Sheets credentials from env JSON: %s", secret_error)
 
         candidate_paths = []
         if credentials_path:
@@ -124,43 +166,41 @@ async def setup_sheets_service():
             if not candidate_path:
                 continue
             if os.path.exists(candidate_path):
-                print(f"Using service account credentials from file: {candidate_path}")
+                logger.debug("Using service account credentials from file: %s", candidate_path)
                 try:
                     credentials = service_account.Credentials.from_service_account_file(
                         candidate_path,
                         scopes=scopes
                     )
-                    service = build('sheets', 'v4', credentials=credentials)
-                    print("Successfully created Sheets service with service account file")
+                    service = build('sheets', 'v4', credentials=credentials, requestBuilder=sheets_request_builder())
+                    logger.debug("Created Sheets service with service account file")
                     return service
                 except Exception as cred_error:
-                    print(f"Error loading service account credentials file: {cred_error}")
+                    logger.error("Error loading service account credentials file: %s", cred_error)
 
-        print("Service account credentials file not found in configured locations")
+        logger.warning("Service account credentials file not found in configured locations")
 
         # If no service account, try to use API key
         api_key = os.getenv('GOOGLE_API_KEY')
         if api_key:
-            print("Using API key from environment variables")
+            logger.debug("Using API key from environment variables")
             try:
-                service = build('sheets', 'v4', developerKey=api_key)
-                print("Successfully created Sheets service with API key")
+                service = build('sheets', 'v4', developerKey=api_key, requestBuilder=sheets_request_builder())
+                logger.debug("Created Sheets service with API key")
                 return service
             except Exception as api_error:
-                print(f"Error creating service with API key: {api_error}")
+                logger.error("Error creating service with API key: %s", api_error)
         else:
-            print("No Google credentials or API key found")
+            logger.warning("No Google credentials or API key found")
             return None
     except Exception as e:
-        print(f"Error setting up Google Sheets service: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error setting up Google Sheets service: %s", e)
         return None
 
 def fetch_sheet_data(service, sheet_id, sheet_name):
     """Fetch data from the Google Sheet"""
     try:
-        print(f"Attempting to fetch data from sheet: {sheet_name} in spreadsheet: {sheet_id}")
+        logger.debug("Fetching data from sheet %s in spreadsheet %s", sheet_name, sheet_id)
         # Get the sheet range
         sheet_range = f"{sheet_name}!A:Z"  # Adjust range as needed
         
@@ -171,16 +211,14 @@ def fetch_sheet_data(service, sheet_id, sheet_name):
         ).execute()
         
         values = result.get('values', [])
-        print(f"Fetched {len(values)} rows from {sheet_name} (including header row)")
+        logger.info("Fetched %d rows from %s (including header row)", len(values), sheet_name)
         
         if len(values) <= 1:
-            print(f"Warning: Sheet {sheet_name} has only header row or is empty")
+            logger.warning("Sheet %s has only header row or is empty", sheet_name)
         
         return values
     except Exception as e:
-        print(f"Error fetching sheet data from {sheet_name}: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error fetching sheet data from %s: %s", sheet_name, e)
         return None
 
 def process_sheet_data(sheet_data):
@@ -188,7 +226,7 @@ def process_sheet_data(sheet_data):
     try:
         # Check if sheet data is empty or has less than 2 rows (header + at least one post)
         if not sheet_data or len(sheet_data) < 2:
-            print(f"Sheet is empty or contains only headers (rows: {len(sheet_data) if sheet_data else 0}), returning fallback data")
+            logger.warning("Sheet is empty or contains only headers (rows: %d), returning fallback data", len(sheet_data) if sheet_data else 0)
             # Return fallback data
             return [
                 {
@@ -222,7 +260,9 @@ def process_sheet_data(sheet_data):
         
         # The first row should be headers
         headers = sheet_data[0]
-        print(f"Found headers: {headers}")
+        logger.debug("Found headers: %s", headers)
+        # Checked once per sheet rather than once per row
+        debug = logger.isEnabledFor(logging.DEBUG)
         
         # Define a mapping from expected header names to standard field names
         # This helps handle variations in header capitalization and formatting
@@ -246,8 +286,9 @@ def process_sheet_data(sheet_data):
         # Create a list of blog posts
         blog_posts = []
         
-        for i, row in enumerate(sheet_data[1:]):  # Skip the header row
-            print(f"Processing row {i+1}: {row}")
+        for row_number, row in enumerate(sheet_data[1:], start=1):  # Skip the header row
+            if debug:
+                logger.debug("Processing row %d: %s", row_number, row)
             # Ensure the row has enough entries to match headers
             padded_row = row + [''] * (len(headers) - len(row))
             
@@ -258,7 +299,8 @@ def process_sheet_data(sheet_data):
                 field_name = header_mapping.get(header, header.lower().replace(' ', '_'))
                 post[field_name] = padded_row[i]
             
-            print(f"Processed post data: {post}")
+            if debug:
+                logger.debug("Processed post data: %s", post)
             
             # Ensure required fields have values
             if 'title' in post and post['title']:
@@ -276,9 +318,10 @@ def process_sheet_data(sheet_data):
                     post['url'] = ""
                 
                 blog_posts.append(post)
-                print(f"Added post: {post['title']}")
+                if debug:
+                    logger.debug("Added post: %s", post['title'])
             else:
-                print(f"Skipping row due to missing title")
+                logger.debug("Skipping row %d due to missing title", row_number)
         
         # Sort by publication date (newest first)
         try:
@@ -287,16 +330,14 @@ def process_sheet_data(sheet_data):
                 reverse=True
             )
         except Exception as sort_error:
-            print(f"Error sorting blog posts: {sort_error}")
+            logger.warning("Error sorting blog posts: %s", sort_error)
             # If date parsing fails, don't sort
             pass
         
-        print(f"Returning {len(blog_posts)} processed blog posts")
+        logger.info("Processed %d blog posts", len(blog_posts))
         return blog_posts
     except Exception as e:
-        print(f"Error processing sheet data: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error processing sheet data: %s", e)
         return []
 
 async def ensure_blog_sheet_exists():
@@ -305,7 +346,7 @@ async def ensure_blog_sheet_exists():
         # Set up the Google Sheets service
         service = await setup_sheets_service()
         if not service:
-            print("Failed to set up Google Sheets service")
+            logger.warning("Failed to set up Google Sheets service")
             return False
             
         # Check if the sheet exists
@@ -372,7 +413,7 @@ async def ensure_blog_sheet_exists():
                     }
                 ).execute()
                 
-                print(f"Created new sheet '{SHEET_NAME}' for blog posts with sample data")
+                logger.info("Created new sheet '%s' for blog posts with sample data", SHEET_NAME)
                 return True
             
             # Check if the headers exist
@@ -393,16 +434,16 @@ async def ensure_blog_sheet_exists():
                         "values": [headers]
                     }
                 ).execute()
-                print(f"Added headers to existing sheet '{SHEET_NAME}'")
+                logger.info("Added headers to existing sheet '%s'", SHEET_NAME)
             
             return True
             
         except Exception as e:
-            print(f"Error checking/creating blog sheet: {e}")
+            logger.error("Error checking/creating blog sheet: %s", e)
             return False
             
     except Exception as e:
-        print(f"Failed to ensure blog sheet exists: {e}")
+        logger.error("Failed to ensure blog sheet exists: %s", e)
         return False
 
 async def get_detailed_blog_posts_from_sheet() -> List[Dict[str, Any]]:
@@ -415,26 +456,26 @@ async def get_detailed_blog_posts_from_sheet() -> List[Dict[str, Any]]:
         # Set up the Google Sheets service
         service = await setup_sheets_service()
         if not service:
-            print("Failed to set up Google Sheets service for detailed blog posts")
+            logger.warning("Failed to set up Google Sheets service for detailed blog posts")
             return []
             
         # First ensure the manual_blog_posts sheet exists
         sheet_exists = await ensure_manual_blog_sheet_exists()
         if not sheet_exists:
-            print("Could not find or create manual_blog_posts sheet")
+            logger.warning("Could not find or create manual_blog_posts sheet")
             return []
             
         # Fetch data from the sheet
         detailed_sheet_data = fetch_sheet_data(service, SHEET_ID, "manual_blog_posts")
         if not detailed_sheet_data or len(detailed_sheet_data) < 2:  # Need at least headers + one post
-            print("Manual blog posts sheet is empty or contains only headers")
+            logger.warning("Manual blog posts sheet is empty or contains only headers")
             return []
             
         # Process the detailed blog data
         return process_detailed_blog_data(detailed_sheet_data)
         
     except Exception as e:
-        print(f"Error getting detailed blog posts: {e}")
+        logger.error("Error getting detailed blog posts: %s", e)
         return []
 
 def process_detailed_blog_data(sheet_data):
@@ -511,12 +552,12 @@ def process_detailed_blog_data(sheet_data):
                 reverse=True
             )
         except Exception as e:
-            print(f"Error sorting blog posts by date: {e}")
+            logger.warning("Error sorting blog posts by date: %s", e)
             
         return blog_posts
         
     except Exception as e:
-        print(f"Error processing detailed blog data: {e}")
+        logger.error("Error processing detailed blog data: %s", e)
         return [] 
 
 async def ensure_manual_blog_sheet_exists():
@@ -525,7 +566,7 @@ async def ensure_manual_blog_sheet_exists():
         # Set up the Google Sheets service
         service = await setup_sheets_service()
         if not service:
-            print("Failed to set up Google Sheets service")
+            logger.warning("Failed to set up Google Sheets service")
             return False
             
         # Check if the sheet exists
@@ -600,7 +641,7 @@ async def ensure_manual_blog_sheet_exists():
                     }
                 ).execute()
                 
-                print("Created new sheet 'manual_blog_posts' with sample data")
+                logger.info("Created new sheet 'manual_blog_posts' with sample data")
                 return True
             
             # Check if the headers exist
@@ -630,14 +671,14 @@ async def ensure_manual_blog_sheet_exists():
                         "values": [headers]
                     }
                 ).execute()
-                print("Added headers to existing 'manual_blog_posts' sheet")
+                logger.info("Added headers to existing 'manual_blog_posts' sheet")
             
             return True
             
         except Exception as e:
-            print(f"Error checking/creating manual blog sheet: {e}")
+            logger.error("Error checking/creating manual blog sheet: %s", e)
             return False
             
     except Exception as e:
-        print(f"Failed to ensure manual blog sheet exists: {e}")
+        logger.error("Failed to ensure manual blog sheet exists: %s", e)
         return False 
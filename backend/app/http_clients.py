@@ -0,0 +1,101 @@
+"""
+Application-scoped httpx clients for outbound HTTP.
+
+One pooled AsyncClient per upstream, created in the FastAPI lifespan and
+closed on shutdown, so keep-alive connections and HTTP/2 sessions are
+reused across requests instead of paying DNS, TCP and TLS setup each call.
+"""
+
+import os
+import importlib.util
+from typing import Any, Callable, Dict
+
+import httpx
+
+from .metrics import metrics
+
+# HTTP/2 needs the optional h2 package (installed by httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+UPSTREAMS: Dict[str, Dict[str, Any]] = {
+    "github": {
+        "timeout": httpx.Timeout(20.0, connect=5.0),
+        "limits": httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=60.0),
+        "headers": {
+            "User-Agent": f"{os.getenv('GITHUB_USERNAME', 'BishalBudhathoki')}-portfolio",
+            "X-GitHub-Api-Version": "2022-11-28",
+        },
+        "follow_redirects": True,
+    },
+    "ipapi": {
+        # Geo lookups sit on the analytics tracking path, so fail fast
+        "timeout": httpx.Timeout(3.0, connect=2.0),
+        "limits": httpx.Limits(max_connections=5, max_keepalive_connections=2, keepalive_expiry=30.0),
+        "headers": {},
+        "follow_redirects": False,
+    },
+    "telegram": {
+        # Used by the notification outbox; failed sends are retried from the outbox
+        "timeout": httpx.Timeout(10.0, connect=5.0),
+        "limits": httpx.Limits(max_connections=2, max_keepalive_connections=1, keepalive_expiry=120.0),
+        "headers": {},
+        "follow_redirects": False,
+    },
+}
+
+
+class HttpClientRegistry:
+    def __init__(self, upstreams: Dict[str, Dict[str, Any]] = UPSTREAMS):
+        """
+        Initialize the registry
+
+        Args:
+            upstreams: Client settings (timeout, limits, headers) per upstream name
+        """
+        self.upstreams = upstreams
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def _create(self, name: str) -> httpx.AsyncClient:
+        settings = self.upstreams[name]
+        # The pooled transport is wrapped so every call lands in the
+        # upstream latency histogram under this upstream's name
+        transport = httpx.AsyncHTTPTransport(limits=settings["limits"], http2=HTTP2_AVAILABLE)
+        return httpx.AsyncClient(
+            timeout=settings["timeout"],
+            headers=settings["headers"],
+            follow_redirects=settings["follow_redirects"],
+            transport=metrics.instrument(name, transport),
+        )
+
+    async def start(self) -> None:
+        """Create a client for every configured upstream"""
+        for name in self.upstreams:
+            if name not in self._clients:
+                self._clients[name] = self._create(name)
+        print(f"HTTP clients ready: {', '.join(self._clients)} (HTTP/2 {'on' if HTTP2_AVAILABLE else 'off'})")
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """
+        Client for an upstream. Outside the app lifespan (scripts, one-off
+        calls) the client is created on first use.
+        """
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create(name)
+            self._clients[name] = client
+        return client
+
+    def dependency(self, name: str) -> Callable[[], httpx.AsyncClient]:
+        """FastAPI dependency that injects the client for an upstream"""
+        def provide() -> httpx.AsyncClient:
+            return self.get(name)
+        return provide
+
+    async def aclose(self) -> None:
+        """Close every client and its pooled connections"""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+http_clients = HttpClientRegistry()
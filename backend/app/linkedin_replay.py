@@ -0,0 +1,192 @@
+"""
+Offline replay support for the LinkedIn scraper.
+
+Provides a minimal stand-in for the Selenium WebDriver that answers
+element lookups from a saved profile HTML snapshot, so the extract_*
+methods of LinkedInScraper can run without a browser or a network.
+"""
+
+import os
+from typing import List, Optional
+
+import lxml.html
+from lxml.cssselect import CSSSelector
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+# Directory holding the saved profile snapshots
+FIXTURES_DIR = os.getenv(
+    "LINKEDIN_FIXTURES_DIR",
+    os.path.join(os.path.dirname(__file__), "../fixtures/linkedin"))
+
+# URL reported by the replay driver when the snapshot does not declare one
+DEFAULT_REPLAY_URL = "https://www.linkedin.com/in/replay-profile/"
+
+_HIDDEN_CLASSES = {"visually-hidden"}
+_selector_cache = {}
+
+
+def list_fixtures(fixtures_dir: str = FIXTURES_DIR) -> List[str]:
+    """Return the paths of all HTML snapshots in the fixtures directory"""
+    if not os.path.isdir(fixtures_dir):
+        return []
+    return sorted(
+        os.path.join(fixtures_dir, name)
+        for name in os.listdir(fixtures_dir)
+        if name.endswith((".html", ".htm"))
+    )
+
+
+def resolve_fixture(fixture: str, fixtures_dir: str = FIXTURES_DIR) -> str:
+    """Resolve a fixture name (with or without extension) or path to a file path"""
+    candidates = [fixture, os.path.join(fixtures_dir, fixture),
+                  os.path.join(fixtures_dir, f"{fixture}.html")]
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    raise FileNotFoundError(f"LinkedIn fixture not found: {fixture}")
+
+
+def _css(selector: str) -> CSSSelector:
+    compiled = _selector_cache.get(selector)
+    if compiled is None:
+        compiled = CSSSelector(selector)
+        _selector_cache[selector] = compiled
+    return compiled
+
+
+def _is_hidden(node) -> bool:
+    classes = (node.get("class") or "").split()
+    return any(name in _HIDDEN_CLASSES for name in classes) or node.get("hidden") is not None
+
+
+def _visible_text(node) -> str:
+    """Approximate Selenium's rendered .text by skipping visually hidden nodes"""
+    parts: List[str] = []
+
+    def walk(current):
+        if _is_hidden(current):
+            return
+        if current.text:
+            parts.append(current.text)
+        for child in current:
+            if isinstance(child.tag, str):
+                walk(child)
+            if child.tail:
+                parts.append(child.tail)
+
+    walk(node)
+    return " ".join("".join(parts).split())
+
+
+def _find_all(root, by: str, value: str) -> list:
+    if by == By.XPATH:
+        return [node for node in root.xpath(value) if isinstance(getattr(node, "tag", None), str)]
+    if by == By.ID:
+        selector = f'[id="{value}"]'
+    elif by == By.CLASS_NAME:
+        selector = f".{value}"
+    elif by == By.TAG_NAME:
+        selector = value
+    elif by == By.NAME:
+        selector = f'[name="{value}"]'
+    else:
+        selector = value
+    return _css(selector)(root)
+
+
+class ReplayElement:
+    """WebElement look-alike backed by an lxml node"""
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def text(self) -> str:
+        return _visible_text(self._node)
+
+    @property
+    def tag_name(self) -> str:
+        return self._node.tag
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self._node.get(name)
+
+    def is_displayed(self) -> bool:
+        return not _is_hidden(self._node)
+
+    def is_enabled(self) -> bool:
+        return self._node.get("disabled") is None
+
+    def click(self) -> None:
+        """Clicks are no-ops: snapshots are saved with sections already expanded"""
+
+    def clear(self) -> None:
+        pass
+
+    def send_keys(self, *values) -> None:
+        pass
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> "ReplayElement":
+        return _first(self._node, by, value)
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List["ReplayElement"]:
+        return [ReplayElement(node) for node in _find_all(self._node, by, value)]
+
+
+def _first(root, by: str, value: str) -> ReplayElement:
+    matches = _find_all(root, by, value)
+    if not matches:
+        raise NoSuchElementException(f"Replay: no element for {by}={value!r}")
+    return ReplayElement(matches[0])
+
+
+class ReplayDriver:
+    """
+    Read-only WebDriver stand-in that serves a saved LinkedIn profile snapshot.
+
+    Only the subset of the WebDriver API used by LinkedInScraper's extraction
+    phase is implemented. Navigation, scrolling and screenshots are no-ops.
+    """
+
+    def __init__(self, html: str, url: Optional[str] = None):
+        self._document = lxml.html.document_fromstring(html)
+        canonical = self._document.xpath("//link[@rel='canonical']/@href")
+        self.current_url = url or (canonical[0] if canonical else DEFAULT_REPLAY_URL)
+        titles = self._document.xpath("//title/text()")
+        self.title = titles[0].strip() if titles else ""
+
+    @classmethod
+    def from_file(cls, path: str, url: Optional[str] = None) -> "ReplayDriver":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(f.read(), url=url)
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> ReplayElement:
+        return _first(self._document, by, value)
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List[ReplayElement]:
+        return [ReplayElement(node) for node in _find_all(self._document, by, value)]
+
+    def execute_script(self, script: str, *args):
+        # Scroll position and height queries are answered with 0
+        if script.strip().startswith("return"):
+            return 0
+        return None
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: dict):
+        return {}
+
+    def get(self, url: str) -> None:
+        pass
+
+    def save_screenshot(self, filename: str) -> bool:
+        return False
+
+    def implicitly_wait(self, time_to_wait: float) -> None:
+        pass
+
+    def set_page_load_timeout(self, time_to_wait: float) -> None:
+        pass
+
+    def quit(self) -> None:
+        pass
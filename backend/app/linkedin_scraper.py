@@ -3,9 +3,12 @@ import os
 import json
 import time
 import random
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime
 import traceback
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -17,7 +20,13 @@ from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.action_chains import ActionChains
 from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import load_dotenv
-from .notification_helper import NotificationHelper
+from .notification_helper import get_notifier
+from .linkedin_replay import ReplayDriver, resolve_fixture
+from .linkedin_session import LinkedInSessionStore
+from .scrape_waits import WaitPolicy
+from .resource_blocking import ResourceBlockingProfile, NetworkUsage
+from .scrape_metrics import ScrapeMetrics
+from .metrics import metrics as app_metrics
 
 # Load environment variables
 load_dotenv()
@@ -82,7 +91,10 @@ class LinkedInScraper:
             self,
             headless: bool = False,
             debug: bool = False,
-            stealth_mode: bool = True):
+            stealth_mode: bool = True,
+            replay_fixture: Optional[str] = None,
+            resource_profile: Optional[ResourceBlockingProfile] = None,
+            cancel_event: Optional[threading.Event] = None):
         """
         Initialize the LinkedIn scraper with enhanced stealth options
 
@@ -90,22 +102,43 @@ class LinkedInScraper:
             headless: Run browser in headless mode
             debug: Enable debug logging
             stealth_mode: Apply additional anti-detection measures
+            replay_fixture: Name or path of a saved profile HTML snapshot.
+                When set, no browser is started and the extract_* methods
+                read from the snapshot instead (offline replay mode).
+            resource_profile: Requests to block in Chrome. Defaults to the
+                profile configured by LINKEDIN_BLOCK_RESOURCES.
+            cancel_event: Set from another thread to stop the scrape at the
+                next phase or section boundary.
         """
         self.debug = debug
         self.driver = None
         self.stealth_mode = stealth_mode
+        self.replay = replay_fixture is not None
+        self.resource_profile = resource_profile or ResourceBlockingProfile.from_env()
+        self.network_usage = NetworkUsage()
+        self.metrics = ScrapeMetrics()
         self.wait_time_short = random.uniform(2, 4)
         self.wait_time_medium = random.uniform(4, 7)
         self.wait_time_long = random.uniform(7, 12)
-        self.notifier = NotificationHelper()
+        self.notifier = get_notifier()
+        self.session_store = LinkedInSessionStore()
+        self.cancel_event = cancel_event or threading.Event()
 
         try:
-            # Set up the Chrome WebDriver with specified options
-            self.setup_driver(headless=headless)
+            if self.replay:
+                # Serve element lookups from the saved snapshot
+                self.driver = ReplayDriver.from_file(resolve_fixture(replay_fixture))
+            else:
+                # Set up the Chrome WebDriver with specified options
+                with self.metrics.span("driver_setup"):
+                    self.setup_driver(headless=headless)
 
             if not self.driver:
                 raise Exception("Failed to initialize WebDriver")
 
+            self.waits = WaitPolicy(self.driver, replay=self.replay)
+            self.metrics.attach_driver(self.driver)
+
             # Log successful initialization
             self.log("LinkedIn scraper initialized successfully")
 
@@ -168,6 +201,13 @@ class LinkedInScraper:
             chrome_options.add_argument(
                 '--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36')
 
+            # Skip downloading resources we never read
+            for argument in self.resource_profile.chrome_arguments():
+                chrome_options.add_argument(argument)
+
+            # Record network events so per-scrape transfer sizes can be reported
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
             # Exclude automation info from navigator
             chrome_options.add_experimental_option(
                 "excludeSwitches", ["enable-automation"])
@@ -224,6 +264,12 @@ class LinkedInScraper:
             self.driver.execute_script(
                 "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
 
+            # Block images, media, fonts and analytics before the first navigation
+            try:
+                self.resource_profile.apply(self.driver)
+            except Exception as e:
+                logger.warning(f"Could not apply resource blocking profile: {e}")
+
             logger.info("WebDriver setup complete")
 
         except Exception as e:
@@ -232,14 +278,20 @@ class LinkedInScraper:
 
     def random_sleep(self, min_seconds: float = 1.0, max_seconds: float = 3.0):
         """Sleep for a random amount of time to mimic human behavior"""
+        if self.replay:
+            return
         time.sleep(random.uniform(min_seconds, max_seconds))
 
+    def wait(self, timeout: float) -> WebDriverWait:
+        """Create a WebDriverWait bounded by the remaining extraction budget"""
+        return self.waits.wait(timeout)
+
     def scroll_to_element(self, element):
         """Scroll element into view with a natural scrolling behavior"""
         try:
             self.driver.execute_script(
                 "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
-            self.random_sleep(0.5, 1.5)
+            self.waits.settle()
         except Exception as e:
             self.log(f"Error scrolling to element: {e}")
 
@@ -256,8 +308,8 @@ class LinkedInScraper:
             scroll_amount = random.randint(300, 800)
             self.driver.execute_script(f"window.scrollBy(0, {scroll_amount});")
 
-            # Random pause between scrolls
-            self.random_sleep(0.7, 2.0)
+            # Wait for lazily loaded content triggered by the scroll
+            self.waits.settle()
 
             # Every other scroll, check if we need to click "Show more" buttons
             if i % 2 == 0:
@@ -266,7 +318,7 @@ class LinkedInScraper:
         # Final scroll to bottom to ensure everything is loaded
         self.driver.execute_script(
             "window.scrollTo(0, document.body.scrollHeight);")
-        self.random_sleep()
+        self.waits.settle()
 
     def expand_sections(self):
         """Expand all collapsible sections in the profile"""
@@ -296,11 +348,11 @@ class LinkedInScraper:
                                 # Scroll button into view with offset
                                 self.driver.execute_script(
                                     "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", button)
-                                self.random_sleep(0.5, 1.0)
+                                self.waits.settle()
 
                                 # Click with human-like behavior
                                 self.click_element_with_random_delay(button)
-                                self.random_sleep(1, 2)
+                                self.waits.settle()
                         except Exception as e:
                             self.log(
                                 f"Error clicking individual show more button: {str(e)}", level="DEBUG")
@@ -314,9 +366,46 @@ class LinkedInScraper:
         except Exception as e:
             self.log(f"Error expanding sections: {str(e)}", level="WARNING")
 
+    def restore_session(self) -> bool:
+        """Try to reuse a saved LinkedIn session instead of logging in"""
+        if self.replay or not self.session_store.restore(self.driver):
+            return False
+
+        try:
+            self.driver.get("https://www.linkedin.com/feed/")
+
+            # LinkedIn redirects expired sessions to the login or auth wall
+            current_url = self.driver.current_url
+            if any(marker in current_url for marker in ("/login", "/authwall", "/checkpoint", "/uas/")):
+                self.log("Saved LinkedIn session has expired", level="WARNING")
+                self.session_store.clear()
+                # Don't let the fresh login start with the stale session loaded
+                self.driver.delete_all_cookies()
+                return False
+
+            if self.is_logged_in():
+                self.log("Restored saved LinkedIn session - skipping login")
+                return True
+
+            self.log("Saved LinkedIn session was not accepted", level="WARNING")
+            self.session_store.clear()
+            self.driver.delete_all_cookies()
+            return False
+        except Exception as e:
+            self.log(f"Error validating saved session: {e}", level="WARNING")
+            try:
+                self.driver.delete_all_cookies()
+            except Exception:
+                pass
+            return False
+
     def login_to_linkedin(self) -> bool:
         """Log in to LinkedIn with enhanced anti-detection measures"""
         try:
+            # Reuse the persisted session when it is still valid
+            if self.restore_session():
+                return True
+
             self.log("Attempting to log in to LinkedIn...")
 
             # Navigate to login page with random timing
@@ -326,6 +415,7 @@ class LinkedInScraper:
             # Check if we're already logged in
             if "feed" in self.driver.current_url:
                 self.log("Already logged in to LinkedIn")
+                self.session_store.save(self.driver)
                 return True
 
             # Get credentials from environment
@@ -398,6 +488,7 @@ class LinkedInScraper:
                     )
                 )
                 self.log("Successfully logged in to LinkedIn")
+                self.session_store.save(self.driver)
                 return True
             except TimeoutException:
                 self.log(
@@ -415,6 +506,7 @@ class LinkedInScraper:
                     )
                     self.log(
                         "Successfully logged in to LinkedIn after fallback timeout")
+                    self.session_store.save(self.driver)
                     return True
                 except TimeoutException:
                     self.log(
@@ -496,6 +588,8 @@ class LinkedInScraper:
                 self.save_screenshot("profile_load_timeout.png")
                 return False
 
+            self.network_usage.record_page_load(self.driver)
+
             # Perform human-like scrolling to load dynamic content
             self.human_like_scroll()
 
@@ -533,49 +627,47 @@ class LinkedInScraper:
                 "last_updated": datetime.now().isoformat()
             }
 
-            # Extract each section with detailed error handling
-            try:
-                profile_data["basic_info"] = self.extract_basic_info()
-            except Exception as e:
-                self.log(
-                    f"Error extracting basic info: {str(e)}", level="WARNING")
-                self.save_screenshot("basic_info_error.png")
-
-            try:
-                profile_data["about"] = self.extract_about_section()
-            except Exception as e:
-                self.log(
-                    f"Error extracting about section: {str(e)}", level="WARNING")
-
-            try:
-                profile_data["experience"] = self.extract_experience()
-            except Exception as e:
-                self.log(
-                    f"Error extracting experience: {str(e)}", level="WARNING")
-                self.save_screenshot("experience_error.png")
-
-            try:
-                profile_data["education"] = self.extract_education()
-            except Exception as e:
-                self.log(
-                    f"Error extracting education: {str(e)}", level="WARNING")
-
-            try:
-                profile_data["skills"] = self.extract_skills()
-            except Exception as e:
-                self.log(f"Error extracting skills: {str(e)}", level="WARNING")
+            # Sections share one time budget; the page has settled by now, so
+            # missing optional elements should fail fast instead of waiting
+            # out the implicit wait on every lookup
+            self.waits.start_budget()
+            self.driver.implicitly_wait(0)
+
+            sections = [
+                ("basic_info", self.extract_basic_info, "basic_info_error.png"),
+                ("about", self.extract_about_section, None),
+                ("experience", self.extract_experience, "experience_error.png"),
+                ("education", self.extract_education, None),
+                ("skills", self.extract_skills, None),
+                ("projects", self.extract_projects, None),
+                ("certifications", self.extract_certifications, None),
+            ]
 
+            skipped_sections = []
             try:
-                profile_data["projects"] = self.extract_projects()
-            except Exception as e:
-                self.log(
-                    f"Error extracting projects: {str(e)}", level="WARNING")
+                # Extract each section with detailed error handling
+                for section, extract, screenshot in sections:
+                    if self.waits.budget_exhausted or self.cancel_event.is_set():
+                        skipped_sections.append(section)
+                        continue
 
-            try:
-                profile_data["certifications"] = self.extract_certifications()
-            except Exception as e:
+                    try:
+                        with self.metrics.span(f"extract_{section}"):
+                            profile_data[section] = extract()
+                    except Exception as e:
+                        self.log(
+                            f"Error extracting {section.replace('_', ' ')}: {str(e)}", level="WARNING")
+                        if screenshot:
+                            self.save_screenshot(screenshot)
+            finally:
+                self.driver.implicitly_wait(10)
+
+            if skipped_sections or self.waits.budget_exhausted:
+                profile_data["_partial"] = True
+                profile_data["_skipped_sections"] = skipped_sections
                 self.log(
-                    f"Error extracting certifications: {str(e)}", level="WARNING")
+                    f"Extraction budget exhausted - returning partial data (skipped: {', '.join(skipped_sections) or 'none'})",
+                    level="WARNING")
 
             # Validate extracted data
             if not self.validate_profile_data(profile_data):
@@ -646,7 +738,7 @@ class LinkedInScraper:
 
         try:
             # Wait for the top card section
-            WebDriverWait(self.driver, 10).until(
+            self.wait(10).until(
                 EC.presence_of_element_located((By.CLASS_NAME, "pv-top-card"))
             )
 
@@ -753,8 +845,7 @@ class LinkedInScraper:
             about_text = ""
             for selector in about_selectors:
                 try:
-                    about_element = WebDriverWait(
-                        self.driver, 5).until(
+                    about_element = self.wait(5).until(
                         EC.presence_of_element_located(
                             (By.CSS_SELECTOR, selector)))
 
@@ -764,7 +855,7 @@ class LinkedInScraper:
                             By.CSS_SELECTOR, "button.inline-show-more-text__button")
                         if show_more.is_displayed():
                             self.click_element_with_random_delay(show_more)
-                            self.random_sleep(1, 2)
+                            self.waits.settle()
                     except BaseException:
                         pass
 
@@ -789,7 +880,7 @@ class LinkedInScraper:
 
         try:
             # Wait for experience section
-            experience_section = WebDriverWait(self.driver, 10).until(
+            experience_section = self.wait(10).until(
                 EC.presence_of_element_located((By.ID, "experience"))
             )
 
@@ -797,7 +888,7 @@ class LinkedInScraper:
             self.driver.execute_script(
                 "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});",
                 experience_section)
-            self.random_sleep(1, 2)
+            self.waits.settle()
 
             # Try to expand all experience entries
             try:
@@ -806,7 +897,7 @@ class LinkedInScraper:
                 for button in show_more_buttons:
                     if button.is_displayed():
                         self.click_element_with_random_delay(button)
-                        self.random_sleep(1, 2)
+                        self.waits.settle()
             except BaseException:
                 pass
 
@@ -892,7 +983,7 @@ class LinkedInScraper:
 
         try:
             # Wait for education section
-            education_section = WebDriverWait(self.driver, 10).until(
+            education_section = self.wait(10).until(
                 EC.presence_of_element_located((By.ID, "education"))
             )
 
@@ -900,7 +991,7 @@ class LinkedInScraper:
             self.driver.execute_script(
                 "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});",
                 education_section)
-            self.random_sleep(1, 2)
+            self.waits.settle()
 
             # Try to expand all education entries
             try:
@@ -909,7 +1000,7 @@ class LinkedInScraper:
                 for button in show_more_buttons:
                     if button.is_displayed():
                         self.click_element_with_random_delay(button)
-                        self.random_sleep(1, 2)
+                        self.waits.settle()
             except BaseException:
                 pass
 
@@ -992,7 +1083,7 @@ class LinkedInScraper:
 
         try:
             # Wait for skills section
-            skills_section = WebDriverWait(self.driver, 10).until(
+            skills_section = self.wait(10).until(
                 EC.presence_of_element_located((By.ID, "skills"))
             )
 
@@ -1000,7 +1091,7 @@ class LinkedInScraper:
             self.driver.execute_script(
                 "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});",
                 skills_section)
-            self.random_sleep(1, 2)
+            self.waits.settle()
 
             # Try to expand skills section
             try:
@@ -1011,7 +1102,7 @@ class LinkedInScraper:
                 for button in show_more_buttons:
                     if button.is_displayed():
                         self.click_element_with_random_delay(button)
-                        self.random_sleep(1, 2)
+                        self.waits.settle()
             except BaseException:
                 pass
 
@@ -1123,8 +1214,7 @@ class LinkedInScraper:
         try:
             # Wait for certifications section
             try:
-                certifications_section = WebDriverWait(
-                    self.driver, 10).until(
+                certifications_section = self.wait(10).until(
                     EC.presence_of_element_located(
                         (By.CSS_SELECTOR, "#certifications, section.certifications-section")))
 
@@ -1132,7 +1222,7 @@ class LinkedInScraper:
                 self.driver.execute_script(
                     "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});",
                     certifications_section)
-                self.random_sleep(1, 2)
+                self.waits.settle()
             except TimeoutException:
                 self.log("Certifications section not found", level="INFO")
                 return certifications_list
@@ -1145,7 +1235,7 @@ class LinkedInScraper:
                 for button in show_more_buttons:
                     if button.is_displayed():
                         self.click_element_with_random_delay(button)
-                        self.random_sleep(1, 2)
+                        self.waits.settle()
             except BaseException:
                 pass
 
@@ -1244,6 +1334,20 @@ class LinkedInScraper:
     def scrape(
             self, profile_url: str = LINKEDIN_PROFILE_URL) -> Dict[str, Any]:
         """Main scraping function that coordinates the entire process"""
+        self.metrics.profile_url = profile_url
+        profile_data = self._run_scrape(profile_url)
+
+        # Attach per-phase timings and keep them in the rolling history
+        profile_data["_scrape_metrics"] = self.metrics.finish()
+        slowest = max(self.metrics.spans, key=lambda span: span["wall_ms"], default=None)
+        if slowest:
+            self.log(
+                f"Scrape took {profile_data['_scrape_metrics']['total_wall_ms'] / 1000:.1f}s; "
+                f"slowest phase: {slowest['name']} ({slowest['wall_ms'] / 1000:.1f}s)")
+        return profile_data
+
+    def _run_scrape(self, profile_url: str) -> Dict[str, Any]:
+        """Run login, navigation and extraction, always closing the browser"""
         try:
             # Initialize notification helper and add debug log
             print("\n=== Starting LinkedIn Profile Scrape ===")
@@ -1254,7 +1358,11 @@ class LinkedInScraper:
             print("✅ Start notification sent")
 
             # Login to LinkedIn
-            if not self.login_to_linkedin():
+            with self.metrics.span("login"):
+                logged_in = self.login_to_linkedin()
+            if self.cancel_event.is_set():
+                return self.get_fallback_profile_data("Scrape cancelled")
+            if not logged_in:
                 error_msg = "Failed to login to LinkedIn"
                 self.log(error_msg, level="ERROR")
                 print("Sending error notification...")
@@ -1263,7 +1371,11 @@ class LinkedInScraper:
                 return self.get_fallback_profile_data(error_msg)
 
             # Navigate to the profile
-            if not self.navigate_to_profile(profile_url):
+            with self.metrics.span("navigation"):
+                navigated = self.navigate_to_profile(profile_url)
+            if self.cancel_event.is_set():
+                return self.get_fallback_profile_data("Scrape cancelled")
+            if not navigated:
                 error_msg = "Failed to navigate to profile"
                 self.log(error_msg, level="ERROR")
                 print("Sending error notification...")
@@ -1275,6 +1387,13 @@ class LinkedInScraper:
             try:
                 profile_data = self.extract_profile_data()
 
+                # Report bandwidth and page-load timings for this scrape
+                self.network_usage.collect(self.driver)
+                profile_data["_network_stats"] = self.network_usage.to_dict()
+                self.log(
+                    f"Network: {self.network_usage.bytes_transferred / 1024:.0f} KiB transferred, "
+                    f"{self.network_usage.blocked_requests} requests blocked")
+
                 # Check if this is fallback data
                 is_fallback = "_scrape_info" in profile_data and "FALLBACK DATA" in profile_data[
                     "_scrape_info"]
@@ -1464,6 +1583,10 @@ class LinkedInScraper:
 
     def click_element_with_random_delay(self, element):
         """Click an element with a random delay to simulate human behavior"""
+        if self.replay:
+            element.click()
+            return
+
         try:
             # Move mouse to the element with random offset
             actions = ActionChains(self.driver)
@@ -1528,8 +1651,8 @@ class LinkedInScraper:
                 # Random pause between small scrolls
                 self.random_sleep(0.05, 0.2)
 
-            # Random pause between major scrolls
-            self.random_sleep(0.7, 2.0)
+            # Wait for lazily loaded content triggered by the scroll
+            self.waits.settle()
 
             # Every other scroll, check if we need to click "Show more" buttons
             if i % 2 == 0:
@@ -1539,7 +1662,7 @@ class LinkedInScraper:
         final_position = random.uniform(
             0.7, 1.0) * self.driver.execute_script("return document.body.scrollHeight")
         self.driver.execute_script(f"window.scrollTo(0, {final_position});")
-        self.random_sleep(1.0, 2.0)
+        self.waits.settle()
 
     def navigate_to_section(self, section_name: str) -> bool:
         """Navigate directly to a specific section of the profile"""
@@ -1682,11 +1805,28 @@ class LinkedInScraper:
         return categorized
 
 
+# Selenium blocks, so scrapes run here instead of on the event loop; one at a time
+SCRAPE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="linkedin-scrape")
+app_metrics.register_executor("linkedin_scrape", SCRAPE_EXECUTOR)
+
+
 async def scrape_linkedin_profile() -> Dict[str, Any]:
     """
-    Async wrapper for the LinkedIn scraper to be used with FastAPI
+    Async wrapper for the LinkedIn scraper to be used with FastAPI. The
+    scrape runs on the scrape worker; cancelling the caller also stops the
+    scrape at its next phase boundary.
     """
-    notifier = NotificationHelper()
+    cancel_event = threading.Event()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            SCRAPE_EXECUTOR, _scrape_linkedin_profile_blocking, cancel_event)
+    except asyncio.CancelledError:
+        cancel_event.set()
+        raise
+
+
+def _scrape_linkedin_profile_blocking(cancel_event: threading.Event) -> Dict[str, Any]:
+    notifier = get_notifier()
 
     try:
         # Check if credentials are available
@@ -1700,7 +1840,7 @@ async def scrape_linkedin_profile() -> Dict[str, Any]:
 
         print("Initializing LinkedIn scraper in headless mode...")
         # Initialize and run the scraper with headless mode and debug enabled
-        scraper = LinkedInScraper(headless=True, debug=True)
+        scraper = LinkedInScraper(headless=True, debug=True, cancel_event=cancel_event)
         print("Starting profile scrape...")
         profile_data = scraper.scrape(LINKEDIN_PROFILE_URL)
 
@@ -0,0 +1,187 @@
+"""
+Persisted LinkedIn browser session.
+
+Saves the cookies and localStorage of a logged-in WebDriver session to
+disk, encrypted with a key derived from LINKEDIN_SESSION_KEY (or the
+LinkedIn password when no dedicated key is set), and restores them into
+new drivers so a scrape can skip the interactive login flow.
+"""
+
+import os
+import json
+import time
+import base64
+import logging
+from typing import Any, Dict, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+from .config import LINKEDIN_COOKIE_PATH
+
+logger = logging.getLogger("linkedin_scraper")
+
+LINKEDIN_HOME_URL = "https://www.linkedin.com/"
+# LinkedIn's authentication cookie; without it a saved session is useless
+AUTH_COOKIE_NAME = "li_at"
+SESSION_FORMAT_VERSION = 1
+KDF_ITERATIONS = 200_000
+SESSION_MAX_AGE_SECONDS = int(os.getenv("LINKEDIN_SESSION_MAX_AGE_DAYS", "14")) * 86400
+
+
+def _derive_key(secret: str, salt: bytes) -> bytes:
+    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=KDF_ITERATIONS)
+    return base64.urlsafe_b64encode(kdf.derive(secret.encode("utf-8")))
+
+
+class LinkedInSessionStore:
+    def __init__(self, path: str = LINKEDIN_COOKIE_PATH, secret: Optional[str] = None):
+        """
+        Initialize the session store
+
+        Args:
+            path: File the encrypted session is written to
+            secret: Passphrase for the encryption key. Defaults to
+                LINKEDIN_SESSION_KEY, then LINKEDIN_PASSWORD.
+        """
+        self.path = path
+        self.secret = secret or os.getenv("LINKEDIN_SESSION_KEY") or os.getenv("LINKEDIN_PASSWORD")
+
+    @property
+    def is_enabled(self) -> bool:
+        return bool(self.secret)
+
+    def save(self, driver) -> bool:
+        """Capture cookies and localStorage from a logged-in driver and persist them"""
+        if not self.is_enabled:
+            logger.warning("No LINKEDIN_SESSION_KEY or LINKEDIN_PASSWORD set - not persisting session")
+            return False
+
+        try:
+            cookies = driver.get_cookies()
+            if not any(cookie.get("name") == AUTH_COOKIE_NAME for cookie in cookies):
+                logger.warning("Session has no auth cookie - not persisting session")
+                return False
+
+            local_storage = driver.execute_script(
+                "var items = {};"
+                "for (var i = 0; i < window.localStorage.length; i++) {"
+                "  var key = window.localStorage.key(i);"
+                "  items[key] = window.localStorage.getItem(key);"
+                "}"
+                "return items;") or {}
+
+            session = {
+                "saved_at": time.time(),
+                "cookies": cookies,
+                "local_storage": local_storage,
+            }
+
+            salt = os.urandom(16)
+            token = Fernet(_derive_key(self.secret, salt)).encrypt(
+                json.dumps(session).encode("utf-8"))
+            envelope = {
+                "version": SESSION_FORMAT_VERSION,
+                "salt": base64.b64encode(salt).decode("ascii"),
+                "token": token.decode("ascii"),
+            }
+
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(envelope, f)
+            os.replace(temp_path, self.path)
+
+            logger.info(f"Saved LinkedIn session ({len(cookies)} cookies) to {self.path}")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to save LinkedIn session: {e}")
+            return False
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Decrypt the saved session, or return None if missing, unreadable or expired"""
+        if not self.is_enabled or not os.path.exists(self.path):
+            return None
+
+        try:
+            with open(self.path, "r") as f:
+                envelope = json.load(f)
+
+            if envelope.get("version") != SESSION_FORMAT_VERSION:
+                return None
+
+            salt = base64.b64decode(envelope["salt"])
+            session = json.loads(
+                Fernet(_derive_key(self.secret, salt)).decrypt(envelope["token"].encode("ascii")))
+        except InvalidToken:
+            logger.warning("Saved LinkedIn session could not be decrypted (wrong key or corrupted file)")
+            return None
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Saved LinkedIn session is malformed: {e}")
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to read saved LinkedIn session: {e}")
+            return None
+
+        now = time.time()
+        if now - session.get("saved_at", 0) > SESSION_MAX_AGE_SECONDS:
+            logger.info("Saved LinkedIn session is older than the maximum age")
+            return None
+
+        auth_cookie = next(
+            (cookie for cookie in session.get("cookies", []) if cookie.get("name") == AUTH_COOKIE_NAME),
+            None)
+        if not auth_cookie or (auth_cookie.get("expiry") and auth_cookie["expiry"] <= now):
+            logger.info("Saved LinkedIn session has no valid auth cookie")
+            return None
+
+        return session
+
+    def restore(self, driver) -> bool:
+        """Load the saved cookies and localStorage into a fresh driver"""
+        session = self.load()
+        if not session:
+            return False
+
+        try:
+            # Cookies and localStorage can only be set for the current origin
+            driver.get(LINKEDIN_HOME_URL)
+
+            now = time.time()
+            restored = 0
+            for cookie in session.get("cookies", []):
+                if cookie.get("expiry") and cookie["expiry"] <= now:
+                    continue
+                cookie = {key: value for key, value in cookie.items()
+                          if key in ("name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite")}
+                if cookie.get("sameSite") not in (None, "Strict", "Lax", "None"):
+                    cookie.pop("sameSite")
+                if "expiry" in cookie:
+                    cookie["expiry"] = int(cookie["expiry"])
+                try:
+                    driver.add_cookie(cookie)
+                    restored += 1
+                except Exception as e:
+                    logger.debug(f"Skipping cookie {cookie.get('name')}: {e}")
+
+            driver.execute_script(
+                "var items = arguments[0];"
+                "for (var key in items) { window.localStorage.setItem(key, items[key]); }",
+                session.get("local_storage", {}))
+
+            logger.info(f"Restored {restored} cookies from saved LinkedIn session")
+            return restored > 0
+        except Exception as e:
+            logger.warning(f"Failed to restore LinkedIn session: {e}")
+            return False
+
+    def clear(self) -> None:
+        """Delete the saved session, e.g. after LinkedIn rejected it"""
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+                logger.info("Cleared saved LinkedIn session")
+        except Exception as e:
+            logger.warning(f"Failed to clear saved LinkedIn session: {e}")
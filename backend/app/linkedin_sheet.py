@@ -1,7 +1,10 @@
 import os
+import logging
 from typing import Dict, Any, List, Optional
 from .google_sheet import setup_sheets_service
 
+logger = logging.getLogger(__name__)
+
 # Google Sheet ID (from the URL)
 SHEET_ID = os.getenv("SHEET_ID", "1blqFnWjYgB1idiYqqEZR5qfueO0k6vPZv4eP8Yn3xTg")
 
@@ -126,7 +129,7 @@ async def save_linkedin_data_to_sheet(profile_data: Dict[str, Any]) -> Dict[str,
         }
     
     except Exception as e:
-        print(f"Error saving LinkedIn data to sheet: {e}")
+        logger.error("Error saving LinkedIn data to sheet: %s", e)
         return {
             "success": False,
             "message": f"Error saving LinkedIn data: {str(e)}"
@@ -402,10 +405,10 @@ def get_sheet_data(service, sheet_name: str, range_str: str = "A1:Z1000") -> Lis
         ).execute()
         
         values = result.get('values', [])
-        print(f"Fetched {len(values)} rows from {sheet_name}")
+        logger.debug("Fetched %d rows from %s", len(values), sheet_name)
         return values
     except Exception as e:
-        print(f"Error fetching data from {sheet_name}: {e}")
+        logger.error("Error fetching data from %s: %s", sheet_name, e)
         return []
 
 async def get_linkedin_data_from_sheet() -> Optional[Dict[str, Any]]:
@@ -416,26 +419,25 @@ async def get_linkedin_data_from_sheet() -> Optional[Dict[str, Any]]:
         # Set up the Google Sheets service
         service = await setup_sheets_service()
         if not service:
-            print("Failed to set up Google Sheets service for LinkedIn data")
+            logger.warning("Failed to set up Google Sheets service for LinkedIn data")
             return None
         
         # First ensure the LinkedIn sheets exist
         sheet_exists = await ensure_linkedin_sheet_exists()
         if not sheet_exists["success"]:
-            print("Could not find or create LinkedIn sheet")
+            logger.warning("Could not find or create LinkedIn sheet")
             return None
         
         # Get CV URL from dedicated sheet
         cv_url = await get_cv_url_from_sheet()
-        print(f"CV URL from get_cv_url_from_sheet: {cv_url}")
+        logger.debug("CV URL from get_cv_url_from_sheet: %s", cv_url)
             
-        # Get data from each sheet with detailed debugging for BasicInfo
-        print("\n===== DETAILED DEBUG FOR BASIC INFO SHEET =====")
+        # Get data from each sheet; the BasicInfo rows are dumped at DEBUG level only
         basic_info_data = get_sheet_data(service, SHEET_BASIC_INFO, "A1:B10")
-        print(f"Basic info raw data rows:")
-        # Print each row with row number for debugging
-        for i, row in enumerate(basic_info_data):
-            print(f"Row {i}: {row}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            for i, row in enumerate(basic_info_data):
+                logger.debug("BasicInfo row %d: %s", i, row)
         
         # Continue with other data fetching
         experience_data = get_sheet_data(service, SHEET_EXPERIENCE, "A1:Z50")
@@ -450,14 +452,12 @@ async def get_linkedin_data_from_sheet() -> Optional[Dict[str, Any]]:
         # Set CV URL if found
         if cv_url:
             profile_data['cv_url'] = cv_url
-            print(f"Set CV URL in profile data: {cv_url}")
+            logger.debug("Set CV URL in profile data: %s", cv_url)
         
         # Process basic info - in the format Field/Value (key-value pairs)
         if basic_info_data and len(basic_info_data) > 0:  # Ensure we have at least 1 row
             basic_info = {}
             
-            print(f"===== DEBUG: Raw basic_info_data: {basic_info_data} =====")
-            
             # Based on the screenshot, we have a sheet with Field names in column A and values in column B
             # The first row has headers like "Field", "Value", "Location", etc.
             # Data starts from row 2
@@ -472,7 +472,8 @@ async def get_linkedin_data_from_sheet() -> Optional[Dict[str, Any]]:
                     field_name = row[0].strip().lower()  # Field name in column A
                     field_value = row[1].strip()         # Field value in column B
                     
-                    print(f"===== DEBUG: Found field: {field_name} = {field_value} =====")
+                    if debug:
+                        logger.debug("BasicInfo field: %s = %s", field_name, field_value)
                     
                     # Map fields to our expected structure
                     if field_name == "name":
@@ -486,24 +487,23 @@ async def get_linkedin_data_from_sheet() -> Optional[Dict[str, Any]]:
                     elif field_name == "about":
                         basic_info["about"] = field_value
             
-            print(f"===== DEBUG: Extracted basic_info: {basic_info} =====")
+            logger.debug("Extracted basic_info: %s", basic_info)
             
             # No need to override values with hardcoded defaults if they exist
             # Only add fallbacks for truly missing fields
             if "name" not in basic_info or not basic_info["name"]:
                 basic_info["name"] = "Bishal Budhathoki"
-                print(f"===== DEBUG: Using fallback name =====")
+                logger.debug("Using fallback name")
                 
             if "headline" not in basic_info or not basic_info["headline"]:
                 basic_info["headline"] = "Software Developer" 
-                print(f"===== DEBUG: Using fallback headline =====")
+                logger.debug("Using fallback headline")
                 
             if "location" not in basic_info or not basic_info["location"]:
                 basic_info["location"] = "Remote"
-                print(f"===== DEBUG: Using fallback location =====")
+                logger.debug("Using fallback location")
             
             profile_data['basic_info'] = basic_info
-            print(f"===== DEBUG: Final profile_data basic_info: {basic_info} =====")
         
         # Process experience data - has column headers
         if experience_data and len(experience_data) > 0:
@@ -536,7 +536,7 @@ async def get_linkedin_data_from_sheet() -> Optional[Dict[str, Any]]:
                         experience_list.append(exp)
             
             profile_data['experience'] = experience_list
-            print(f"Processed {len(experience_list)} experiences")
+            logger.debug("Processed %d experiences", len(experience_list))
         
         # Process education data - has column headers
         if education_data and len(education_data) > 0:
@@ -567,7 +567,7 @@ async def get_linkedin_data_from_sheet() -> Optional[Dict[str, Any]]:
                         education_list.append(edu)
             
             profile_data['education'] = education_list
-            print(f"Processed {len(education_list)} education entries")
+            logger.debug("Processed %d education entries", len(education_list))
         
         # Process skills - supports Skill, Category, Endorsements, Icon, Category Order, Skill Order
         if skills_data and len(skills_data) > 0:
@@ -622,7 +622,7 @@ async def get_linkedin_data_from_sheet() -> Optional[Dict[str, Any]]:
                         skills_list.append(skill)
             
             profile_data['skills'] = skills_list
-            print(f"Processed {len(skills_list)} skills")
+            logger.debug("Processed %d skills", len(skills_list))
         
         # Process projects - has column headers Name, Date Range, Description, URL
         if projects_data and len(projects_data) > 0:
@@ -661,7 +661,7 @@ async def get_linkedin_data_from_sheet() -> Optional[Dict[str, Any]]:
                         projects_list.append(project)
                     
             profile_data['projects'] = projects_list
-            print(f"Processed {len(projects_list)} projects")
+            logger.debug("Processed %d projects", len(projects_list))
         
         # Process certifications
         if certifications_data and len(certifications_data) > 0:
@@ -700,14 +700,12 @@ async def get_linkedin_data_from_sheet() -> Optional[Dict[str, Any]]:
                         certifications_list.append(cert)
             
             profile_data['certifications'] = certifications_list
-            print(f"Processed {len(certifications_list)} certifications")
+            logger.debug("Processed %d certifications", len(certifications_list))
         
         return profile_data
     
     except Exception as e:
-        print(f"Error getting LinkedIn data from sheet: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error getting LinkedIn data from sheet: %s", e)
         return None
 
 async def ensure_linkedin_sheet_exists():
@@ -716,7 +714,7 @@ async def ensure_linkedin_sheet_exists():
         # Set up the Google Sheets service
         service = await setup_sheets_service()
         if not service:
-            print("Failed to set up Google Sheets service")
+            logger.warning("Failed to set up Google Sheets service")
             return {"success": False, "message": "Failed to set up Google Sheets service"}
         
         # Get spreadsheet info to check existing sheets
@@ -760,7 +758,7 @@ async def ensure_linkedin_sheet_exists():
                         body={'requests': requests}
                     ).execute()
                     
-                    print(f"Created new sheet: {sheet_name}")
+                    logger.info("Created new sheet: %s", sheet_name)
                     
                     # Add headers if specified
                     if headers:
@@ -772,7 +770,7 @@ async def ensure_linkedin_sheet_exists():
                                 "values": [headers]
                             }
                         ).execute()
-                        print(f"Added headers to {sheet_name}: {headers}")
+                        logger.info("Added headers to %s: %s", sheet_name, headers)
                     
                     # Special case for cv_url sheet
                     if sheet_name == "cv_url":
@@ -784,7 +782,7 @@ async def ensure_linkedin_sheet_exists():
                                 "values": [["CV_URL", "https://drive.google.com/file/d/1fq0AfXPbBz6Nw4UlCpuKL-0VM9YcW6Ol/view?usp=drive_link"]]
                             }
                         ).execute()
-                        print(f"Added CV URL placeholder to {sheet_name}")
+                        logger.info("Added CV URL placeholder to %s", sheet_name)
                     
                     # Special case for BasicInfo sheet - add some initial data
                     if sheet_name == "BasicInfo":
@@ -801,7 +799,7 @@ async def ensure_linkedin_sheet_exists():
                                 ]
                             }
                         ).execute()
-                        print(f"Added initial profile data to {sheet_name}")
+                        logger.info("Added initial profile data to %s", sheet_name)
         
                 # Special case - if BasicInfo sheet exists but has no data, add data
                 elif sheet_name == "BasicInfo":
@@ -811,7 +809,7 @@ async def ensure_linkedin_sheet_exists():
                     ).execute()
                     
                     values = result.get('values', [])
-                    print(f"BasicInfo sheet data: {values}")
+                    logger.debug("BasicInfo sheet data: %s", values)
                     
                     if not values or len(values) < 3:  # No data or not enough data (just header row)
                         service.spreadsheets().values().update(
@@ -827,7 +825,7 @@ async def ensure_linkedin_sheet_exists():
                                 ]
                             }
                         ).execute()
-                        print(f"Added missing data to existing {sheet_name} sheet")
+                        logger.info("Added missing data to existing %s sheet", sheet_name)
             
             message = "All LinkedIn sheets verified"
             if created_sheets:
@@ -836,11 +834,11 @@ async def ensure_linkedin_sheet_exists():
             return {"success": True, "message": message}
                 
         except Exception as e:
-            print(f"Error checking sheets: {e}")
+            logger.error("Error checking sheets: %s", e)
             return {"success": False, "message": f"Error checking sheets: {str(e)}"}
             
     except Exception as e:
-        print(f"Failed to ensure LinkedIn sheets exist: {e}")
+        logger.error("Failed to ensure LinkedIn sheets exist: %s", e)
         return {"success": False, "message": f"Failed to ensure LinkedIn sheets exist: {str(e)}"}
 
 async def get_cv_url_from_sheet():
@@ -858,7 +856,7 @@ async def get_cv_url_from_sheet():
             ).execute()
         
             values = result.get('values', [])
-            print(f"CV URL column values: {values}")
+            logger.debug("CV URL column values: %s", values)
             
             # Find the CV URL value (row 2, column F - after the header)
             cv_url = None
@@ -870,7 +868,7 @@ async def get_cv_url_from_sheet():
                 if i > 0 and len(row) > 0 and row[0]:
                     # This should be the CV URL value
                     cv_url = row[0]
-                    print(f"Found CV URL in BasicInfo sheet, column F, row {i+1}: {cv_url}")
+                    logger.debug("Found CV URL in BasicInfo sheet, column F, row %d: %s", i + 1, cv_url)
                     return cv_url
             
             # If we couldn't find it, check the cv_url sheet as a fallback
@@ -882,23 +880,23 @@ async def get_cv_url_from_sheet():
             values = result.get('values', [])
             if values and len(values) > 0 and len(values[0]) >= 2:
                 cv_url = values[0][1]
-                print(f"Found CV URL in cv_url sheet: {cv_url}")
+                logger.debug("Found CV URL in cv_url sheet: %s", cv_url)
                 return cv_url
             
             # Hardcoded URL from the screenshot as a fallback
             fallback_url = "https://drive.google.com/file/d/1fq0AfXPbBz6Nw4UlCpuKL-0VM9YcW6Ol/view?usp=drive_link"
-            print(f"Using fallback CV URL: {fallback_url}")
+            logger.info("Using fallback CV URL: %s", fallback_url)
             return fallback_url
                 
         except Exception as e:
-            print(f"Error getting CV URL: {e}")
+            logger.error("Error getting CV URL: %s", e)
             
             # Hardcoded URL from the screenshot as a fallback
             fallback_url = "https://drive.google.com/file/d/1fq0AfXPbBz6Nw4UlCpuKL-0VM9YcW6Ol/view?usp=drive_link"
-            print(f"Using fallback CV URL: {fallback_url}")
+            logger.info("Using fallback CV URL: %s", fallback_url)
             return fallback_url
             
         return None
     except Exception as e:
-        print(f"Error getting CV URL: {e}")
+        logger.error("Error getting CV URL: %s", e)
         return None 
@@ -0,0 +1,111 @@
+"""
+Logging for the API.
+
+Request paths log through `logging` rather than print(). Messages use
+%-style arguments, so they are only formatted when their level is enabled.
+Row and payload dumps are DEBUG, which is off unless LOG_LEVEL=DEBUG.
+Enabled records are handed to a queue, and a listener thread does the
+formatting and the stdout write, so a request never waits on output.
+
+LOG_FORMAT=json writes one JSON object per line with a `severity` field,
+the structured form Cloud Logging understands. Extra fields passed with
+`logger.info(..., extra={...})` are included in the entry.
+"""
+
+import os
+import sys
+import json
+import queue
+import logging
+import logging.handlers
+from typing import Optional, TextIO
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+APP_LOGGER = "app"
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with Cloud Logging's `severity` field"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "severity": record.levelname,
+            "message": record.getMessage(),
+            "logger": record.name,
+            "time": self.formatTime(record),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class LogPipeline:
+    def __init__(self, level: str = LOG_LEVEL, log_format: str = LOG_FORMAT, stream: Optional[TextIO] = None):
+        """
+        Initialize the pipeline for the `app` logger tree. The level applies
+        right away; the queue and listener thread only exist between start()
+        and stop(). Until start(), warnings and errors fall back to stderr.
+
+        Args:
+            level: Minimum level logged (LOG_LEVEL, INFO by default)
+            log_format: "text" or "json" (LOG_FORMAT)
+            stream: Where the listener writes (stdout by default)
+        """
+        self.level = level
+        self.log_format = log_format
+        self.stream = stream
+        self.logger = logging.getLogger(APP_LOGGER)
+        self.logger.setLevel(level)
+        self.queue: Optional[queue.SimpleQueue] = None
+        self.queue_handler: Optional[logging.handlers.QueueHandler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+
+    def _formatter(self) -> logging.Formatter:
+        if self.log_format == "json":
+            return JsonFormatter()
+        return logging.Formatter(TEXT_FORMAT)
+
+    @property
+    def running(self) -> bool:
+        return self.listener is not None
+
+    def start(self) -> None:
+        """Attach the queue handler and start the listener thread (idempotent)"""
+        if self.running:
+            return
+        output = logging.StreamHandler(self.stream or sys.stdout)
+        output.setFormatter(self._formatter())
+
+        self.queue = queue.SimpleQueue()
+        self.queue_handler = logging.handlers.QueueHandler(self.queue)
+        self.listener = logging.handlers.QueueListener(self.queue, output)
+        self.listener.start()
+        self.logger.addHandler(self.queue_handler)
+        # The scraper configures the root logger for its own log file; app
+        # records are written once, by the listener
+        self.logger.propagate = False
+
+    def stop(self) -> None:
+        """Flush the queued records and stop the listener thread"""
+        if not self.running:
+            return
+        self.logger.removeHandler(self.queue_handler)
+        self.logger.propagate = True
+        self.listener.stop()
+        self.listener = None
+        self.queue_handler = None
+        self.queue = None
+
+
+# Process-wide pipeline; started and stopped by the app lifespan
+log_pipeline = LogPipeline()
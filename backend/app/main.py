@@ -1,31 +1,77 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
 import sys
 from dotenv import load_dotenv
 import json
+from typing import Optional
 from datetime import datetime
-from .linkedin_scraper import scrape_linkedin_profile
 from .google_sheet import get_blog_posts_from_sheet, ensure_blog_sheet_exists, get_detailed_blog_posts_from_sheet, ensure_manual_blog_sheet_exists, setup_sheets_service, SHEET_ID, SHEET_NAME
 from .contact_form import ContactFormSubmission, save_contact_submission, ensure_contact_sheet_exists
-from .github_activity import get_github_activity
+from .github_activity import get_activity_cache_stats, activity_cache
+from .github_history import contribution_history
+from .github_svg import get_contribution_svg
+from .github_refresher import github_refresher, serve_github_activity, GITHUB_BACKGROUND_REFRESH
+from .contribution_stats import stats_view
+from .http_clients import http_clients
 from .linkedin_sheet import save_linkedin_data_to_sheet, get_linkedin_data_from_sheet, ensure_linkedin_sheet_exists, get_cv_url_from_sheet
-from .notification_helper import NotificationHelper
+from .notification_helper import get_notifier
+from .scrape_metrics import result_span, get_history, summarize_phases
 from .database import engine, Base
 from .routes import analytics_routes
 from .routes import firebase_routes
+from .routes import telegram_routes
 from .firebase_config import firebase
+from .startup import StartupOrchestrator
+from .logging_config import log_pipeline
+from .metrics import metrics, MetricsMiddleware
 import asyncio
-import subprocess
+import logging
+import httpx
+from contextlib import asynccontextmanager
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+async def scrape_linkedin_profile():
+    """Run a LinkedIn scrape; the scraper and Selenium are only imported on first use"""
+    from .linkedin_scraper import scrape_linkedin_profile as run_scrape
+    return await run_scrape()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources, run startup tasks, and release them on shutdown"""
+    log_pipeline.start()
+    metrics.start()
+    await http_clients.start()
+    await startup_event()
+    if GITHUB_BACKGROUND_REFRESH:
+        github_refresher.start()
+    notifier.outbox.start()
+    notifier.jobs.start()
+    await asyncio.to_thread(notifier.start)
+    try:
+        yield
+    finally:
+        await asyncio.to_thread(notifier.stop)
+        await notifier.jobs.stop()
+        await notifier.outbox.stop()
+        await startup.stop()
+        await github_refresher.stop()
+        await activity_cache.flush()
+        await http_clients.aclose()
+        await metrics.stop()
+        log_pipeline.stop()
+
 app = FastAPI(
-    title="Portfolio API"
+    title="Portfolio API",
+    lifespan=lifespan
 )
 
 # Configure CORS with specific origins
@@ -43,12 +89,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so request latency includes the other middleware
+app.add_middleware(MetricsMiddleware)
+
 # Path to store scraped LinkedIn data
 LINKEDIN_DATA_PATH = os.path.join(os.path.dirname(__file__), "../data/linkedin_data.json")
 os.makedirs(os.path.dirname(LINKEDIN_DATA_PATH), exist_ok=True)
 
-# Initialize NotificationHelper as a global variable
-notifier = NotificationHelper()
+# Process-wide notifier; its poller is started and stopped by the lifespan
+notifier = get_notifier()
 
 # Include analytics routes
 app.include_router(analytics_routes.router, prefix="/api/analytics", tags=["Analytics"])
@@ -56,30 +105,30 @@ app.include_router(analytics_routes.router, prefix="/api/analytics", tags=["Anal
 # Include Firebase routes
 app.include_router(firebase_routes.router, prefix="/api/firebase", tags=["Firebase"])
 
+# Include Telegram webhook route (used when TELEGRAM_WEBHOOK_URL is set)
+app.include_router(telegram_routes.router, prefix="/api/telegram", tags=["Telegram"])
+
 # Create an async function to handle the scrape command
 async def handle_scrape_command():
-    """Handle the /scrape command from Telegram"""
-    try:
-        print("\n=== Starting LinkedIn Profile Scrape from Telegram Command ===")
-        notifier.send_notification("Starting LinkedIn profile scrape...", "INFO")
-        
-        # Reuse the trigger_linkedin_scrape endpoint instead of running a separate scrape
-        result = await trigger_linkedin_scrape(skip_fallback=False, save_to_sheet=True)
-        
-        # Send completion notification
-        success_msg = (
-            f"✅ Scraping completed successfully!\n"
-            f"Profile: {result['data'].get('basic_info', {}).get('name', 'Unknown')}\n"
-            f"Projects: {result['data_status']['project_count']}\n"
-            f"Experience: {result['data_status']['experience_count']}\n"
-            f"Skills: {result['data_status']['skills_count']}"
-        )
-        notifier.send_notification(success_msg, "SUCCESS")
-        return "Scraping completed successfully"
-    except Exception as e:
-        error_msg = f"Error during scraping: {str(e)}"
-        notifier.send_notification(error_msg, "ERROR")
-        return error_msg
+    """
+    Handle the /scrape command from Telegram. Runs as a command job on the
+    app loop; errors propagate so the job is reported as failed.
+    """
+    print("\n=== Starting LinkedIn Profile Scrape from Telegram Command ===")
+
+    # Reuse the trigger_linkedin_scrape endpoint instead of running a separate scrape
+    result = await trigger_linkedin_scrape(skip_fallback=False, save_to_sheet=True)
+
+    # Send completion notification
+    success_msg = (
+        f"✅ Scraping completed successfully!\n"
+        f"Profile: {result['data'].get('basic_info', {}).get('name', 'Unknown')}\n"
+        f"Projects: {result['data_status']['project_count']}\n"
+        f"Experience: {result['data_status']['experience_count']}\n"
+        f"Skills: {result['data_status']['skills_count']}"
+    )
+    notifier.send_notification(success_msg, "SUCCESS")
+    return "Scraping completed successfully"
 
 # Register the command handler
 notifier.register_command("scrape", handle_scrape_command)
@@ -88,6 +137,11 @@ notifier.register_command("scrape", handle_scrape_command)
 async def root():
     return {"message": "Portfolio API is running"}
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Request, upstream, cache, event loop and thread pool metrics in the Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/api/profile")
 async def get_profile():
     """Get LinkedIn profile data from Google Sheets or trigger a new scrape"""
@@ -104,7 +158,7 @@ async def get_profile():
             if not sheet_data:
                 sheet_data = {}
             sheet_data["cv_url"] = cv_url
-            print(f"Added CV URL to profile data: {cv_url}")
+            logger.debug("Added CV URL to profile data: %s", cv_url)
         
         if sheet_data:
             # Check if there's actual content in the sheet data
@@ -116,13 +170,13 @@ async def get_profile():
             
             if has_content:
                 data_source = "google_sheets"
-                print(f"Profile data loaded from Google Sheets with {len(sheet_data.get('projects', []))} projects")
-                print(f"Experience data: {sheet_data.get('experience', [])[:1]}")
-                print(f"Skills data: {len(sheet_data.get('skills', []))} skills")
-                print(f"CV URL: {sheet_data.get('cv_url')}")
+                logger.info("Profile data loaded from Google Sheets with %d projects, %d skills",
+                            len(sheet_data.get('projects', [])), len(sheet_data.get('skills', [])))
+                logger.debug("Experience data: %s", sheet_data.get('experience', [])[:1])
+                logger.debug("CV URL: %s", sheet_data.get('cv_url'))
                 return sheet_data
             else:
-                print("Google Sheets data exists but has no content")
+                logger.warning("Google Sheets data exists but has no content")
         
         # If no data in sheets, try to get from cache
         if os.path.exists(LINKEDIN_DATA_PATH):
@@ -140,12 +194,14 @@ async def get_profile():
                     
                     if has_content:
                         data_source = "local_cache"
-                        print(f"Profile data loaded from local cache with {len(cache_data.get('projects', []))} projects")
+                        metrics.cache_lookups.inc("profile", "hit")
+                        logger.info("Profile data loaded from local cache with %d projects", len(cache_data.get('projects', [])))
                         return cache_data
                     else:
-                        print("Local cache exists but has no content")
+                        logger.warning("Local cache exists but has no content")
         
         # If no recent data with content, trigger a new scrape
+        metrics.cache_lookups.inc("profile", "miss")
         profile_data = await scrape_linkedin_profile()
         
         # Check if scraped data has content
@@ -156,7 +212,7 @@ async def get_profile():
         )
         
         if not has_content:
-            print("Warning: LinkedIn scraping returned data with no content")
+            logger.warning("LinkedIn scraping returned data with no content")
         
         # Add timestamp and save to file
         profile_data['last_updated'] = datetime.now().isoformat()
@@ -164,28 +220,61 @@ async def get_profile():
             json.dump(profile_data, f)
         
         # Save to Google Sheets
-        sheet_result = await save_linkedin_data_to_sheet(profile_data)
+        with result_span(profile_data, "sheets_save"):
+            sheet_result = await save_linkedin_data_to_sheet(profile_data)
         if sheet_result.get("success", False):
-            print(f"Successfully saved scraped data to Google Sheets")
+            logger.info("Saved scraped data to Google Sheets")
         else:
-            print(f"Failed to save to Google Sheets: {sheet_result.get('message', 'Unknown error')}")
+            logger.error("Failed to save to Google Sheets: %s", sheet_result.get('message', 'Unknown error'))
         
         data_source = "linkedin_scrape"
-        print(f"Profile data scraped from LinkedIn with {len(profile_data.get('projects', []))} projects")
+        logger.info("Profile data scraped from LinkedIn with %d projects", len(profile_data.get('projects', [])))
         return profile_data
     except Exception as e:
-        print(f"Failed to get profile data: {str(e)}")
+        logger.exception("Failed to get profile data: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get profile data: {str(e)}")
 
 @app.get("/api/github/activity")
-async def get_github_activity_route():
-    """Get a rolling two-year GitHub activity snapshot"""
+async def get_github_activity_route(
+    view: str = Query("full", pattern="^(full|stats)$"),
+    client: httpx.AsyncClient = Depends(http_clients.dependency("github")),
+):
+    """Get a rolling two-year GitHub activity snapshot; view=stats omits the week grids"""
     try:
-        return await get_github_activity()
+        payload = await serve_github_activity(client)
+        return stats_view(payload) if view == "stats" else payload
     except Exception as e:
-        print(f"Failed to get GitHub activity: {str(e)}")
+        logger.error("Failed to get GitHub activity: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to get GitHub activity: {str(e)}")
 
+@app.get("/api/github/activity.svg")
+async def get_github_activity_svg(
+    request: Request,
+    year: Optional[int] = None,
+    client: httpx.AsyncClient = Depends(http_clients.dependency("github")),
+):
+    """Contribution heatmap for one year (the current year by default), pre-rendered as SVG"""
+    try:
+        payload = await serve_github_activity(client)
+    except Exception as e:
+        logger.error("Failed to get GitHub activity: %s", e)
+        raise HTTPException(status_code=500, detail=f"Failed to get GitHub activity: {str(e)}")
+
+    rendered = get_contribution_svg(payload, year)
+    if rendered is None:
+        raise HTTPException(status_code=404, detail=f"No GitHub activity available for {year or 'the current year'}")
+
+    svg, etag = rendered
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=300"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=svg, media_type="image/svg+xml", headers=headers)
+
+@app.get("/api/github/activity/cache")
+async def get_github_activity_cache_stats():
+    """Hit, miss and eviction counters of the GitHub activity cache, and the refresher's state"""
+    return {**get_activity_cache_stats(), "refresher": github_refresher.status()}
+
 @app.get("/api/blog")
 async def get_blog_posts():
     """Get blog posts from the Google Sheet"""
@@ -437,7 +526,8 @@ async def trigger_linkedin_scrape(skip_fallback: bool = False, save_to_sheet: bo
         if save_to_sheet and not is_fallback:
             try:
                 print("Saving data to Google Sheets...")
-                sheet_result = await save_linkedin_data_to_sheet(profile_data)
+                with result_span(profile_data, "sheets_save"):
+                    sheet_result = await save_linkedin_data_to_sheet(profile_data)
                 print(f"Google Sheets save result: {sheet_result}")
             except Exception as e:
                 sheet_result = {"success": False, "message": f"Error saving LinkedIn data to sheet: {str(e)}"}
@@ -468,7 +558,9 @@ async def trigger_linkedin_scrape(skip_fallback: bool = False, save_to_sheet: bo
                 "project_count": len(profile_data.get("projects", [])),
                 "experience_count": len(profile_data.get("experience", [])),
                 "skills_count": len(profile_data.get("skills", [])),
-                "sheet_data": sheet_data_status
+                "sheet_data": sheet_data_status,
+                "partial": profile_data.get("_partial", False),
+                "skipped_sections": profile_data.get("_skipped_sections", [])
             }
         }
     except Exception as e:
@@ -488,6 +580,14 @@ async def handle_get_linkedin_scrape():
         "correct_usage": "Make a POST request to /api/trigger-linkedin-scrape to trigger LinkedIn profile scraping."
     }
 
+@app.get("/api/scrape/metrics")
+async def get_scrape_metrics(limit: int = 20):
+    """Per-phase timings of recent LinkedIn scrapes, with the slowest phases first"""
+    return {
+        "phases": summarize_phases(),
+        "runs": get_history(limit)
+    }
+
 @app.post("/api/contact")
 async def submit_contact_form(submission: ContactFormSubmission):
     """Handle contact form submissions"""
@@ -517,134 +617,73 @@ async def submit_contact_form(submission: ContactFormSubmission):
             detail=f"Failed to submit contact form: {str(e)}"
         )
 
-# Add startup event to ensure sheets exist on app startup
-@app.on_event("startup")
+# Startup tasks run from the lifespan to ensure sheets exist on app startup
+def load_local_state():
+    """Data directory plus the on-disk GitHub history and activity cache"""
+    os.makedirs(os.path.dirname(LINKEDIN_DATA_PATH), exist_ok=True)
+    # Finalized GitHub contribution years are served from disk from now on,
+    # and the last activity payloads let a cold instance answer immediately
+    contribution_history.load()
+    activity_cache.load()
+
+def warm_up_imports():
+    """Load the Google API client off the request path"""
+    import googleapiclient.discovery  # noqa: F401
+
+# Critical steps gate startup (bounded by STARTUP_DEADLINE_SECONDS); sheet
+# provisioning runs in the background and is reported as readiness by /health.
+# The ensure_* helpers build their own Sheets service and block on
+# googleapiclient, so each gets a worker thread.
+startup = StartupOrchestrator()
+# One Firebase bootstrap: credentials parsed once, one cached connection probe
+startup.add("firebase", firebase.ensure_ready, critical=True)
+startup.add("local_state", load_local_state, critical=True)
+startup.add("warmup", warm_up_imports)
+startup.add("blog_sheet", ensure_blog_sheet_exists, blocking=True)
+startup.add("manual_blog_sheet", ensure_manual_blog_sheet_exists, blocking=True)
+startup.add("linkedin_sheets", ensure_linkedin_sheet_exists, blocking=True)
+startup.add("contact_sheet", ensure_contact_sheet_exists, blocking=True)
+
 async def startup_event():
-    """Run initialization tasks when the app starts"""
+    """Run the critical startup checks and start sheet provisioning in the background"""
     try:
         print("=========================================")
         print("Starting up Portfolio Backend API...")
         print("=========================================")
-        
-        # --- FIREBASE CONNECTION CHECK ---
-        def check_firebase_connection():
-            try:
-                from firebase_admin import credentials, firestore, initialize_app, _apps
-                import os
-                creds_path = os.getenv("FIREBASE_SERVICE_ACCOUNT", "credentials/firebase-credentials.json")
-                if not os.path.exists(creds_path):
-                    print(f"❌ Firebase credentials not found at {creds_path}")
-                    return False
-                if not _apps:
-                    cred = credentials.Certificate(creds_path)
-                    initialize_app(cred)
-                db = firestore.client()
-                # Try to access a collection
-                db.collection('test').limit(1).get()
-                print("✅ Firebase connection successful!")
-                return True
-            except Exception as e:
-                print(f"❌ Firebase connection failed: {e}")
-                return False
-
-        creds_path = os.getenv("FIREBASE_SERVICE_ACCOUNT", "credentials/firebase-credentials.json")
-        print("Checking Firebase connection...")
-        if not os.path.exists(creds_path):
-            print(f"Skipping Firebase setup: credentials file not found at {creds_path}")
-        elif not check_firebase_connection():
-            print("Attempting to set up Firebase database...")
-            result = subprocess.run([sys.executable, "setup_firebase.py"], capture_output=True, text=True)
-            print(result.stdout)
-            if result.returncode != 0:
-                print(f"❌ Firebase setup failed: {result.stderr}")
-            else:
-                print("Re-checking Firebase connection after setup...")
-                if not check_firebase_connection():
-                    print("❌ Firebase connection still failed after setup. Please check your credentials and Firestore setup.")
-                else:
-                    print("✅ Firebase connection established after setup.")
-        else:
-            print("Firebase connection is healthy.")
 
-        # Make data directory if it doesn't exist
-        os.makedirs(os.path.dirname(LINKEDIN_DATA_PATH), exist_ok=True)
-        print(f"Data directory ensured at: {os.path.dirname(LINKEDIN_DATA_PATH)}")
-        
-        # Setup Google Sheets access
-        print("Initializing Google Sheets access...")
-        try:
-            service = await setup_sheets_service()
-            if service:
-                print("✅ Google Sheets service initialized successfully")
-            else:
-                print("⚠️ Google Sheets service initialization returned None")
-        except Exception as sheets_error:
-            print(f"⚠️ Error initializing Google Sheets: {str(sheets_error)}")
-        
-        # Ensure required sheets exist
-        print("Checking required Google Sheets...")
-        try:
-            # Create blog sheets if they don't exist
-            blog_sheet_exists = await ensure_blog_sheet_exists()
-            blog_sheet_result = {
-                "success": blog_sheet_exists,
-                "message": "Blog sheet exists" if blog_sheet_exists else "Failed to create blog sheet"
-            }
-            if blog_sheet_result["success"]:
-                print(f"✅ Blog sheet ready: {blog_sheet_result['message']}")
-            else:
-                print(f"⚠️ Blog sheet issue: {blog_sheet_result['message']}")
-                
-            manual_blog_exists = await ensure_manual_blog_sheet_exists()
-            manual_blog_result = {
-                "success": manual_blog_exists,
-                "message": "Manual blog sheet exists" if manual_blog_exists else "Failed to create manual blog sheet"
-            }
-            if manual_blog_result["success"]:
-                print(f"✅ Manual blog sheet ready: {manual_blog_result['message']}")
-            else:
-                print(f"⚠️ Manual blog sheet issue: {manual_blog_result['message']}")
-            
-            # Create LinkedIn sheet if it doesn't exist
-            try:
-                linkedin_sheet_result = await ensure_linkedin_sheet_exists()
-                if linkedin_sheet_result.get("success", False):
-                    print(f"✅ LinkedIn sheet ready: {linkedin_sheet_result.get('message')}")
-                else:
-                    print(f"⚠️ LinkedIn sheet issue: {linkedin_sheet_result.get('message')}")
-            except Exception as linkedin_error:
-                print(f"⚠️ LinkedIn sheet error: {str(linkedin_error)}")
-            
-            # Create contact form sheet if it doesn't exist
-            contact_sheet_result = await ensure_contact_sheet_exists()
-            if contact_sheet_result.get("success", False):
-                print(f"✅ Contact form sheet ready: {contact_sheet_result.get('message')}")
-            else:
-                print(f"⚠️ Contact form sheet issue: {contact_sheet_result.get('message')}")
-                
-        except Exception as sheet_error:
-            print(f"⚠️ Error setting up required sheets: {str(sheet_error)}")
-        
-        # Start listening for Telegram messages
-        print("Starting Telegram bot listener...")
-        try:
-            loop = asyncio.get_event_loop()
-            loop.create_task(notifier.listen_for_messages())
-            print("✅ Telegram bot listener started successfully")
-        except Exception as telegram_error:
-            print(f"⚠️ Error starting Telegram bot: {str(telegram_error)}")
-            
+        await startup.run_critical()
+        startup.start_background()
+
         print("=========================================")
-        print("Portfolio Backend API startup complete")
+        print(f"Portfolio Backend API accepting traffic after {startup.status()['startup_seconds']}s "
+              "(Google Sheets provisioning continues in the background)")
         print("=========================================")
     except Exception as e:
         print(f"❌ CRITICAL ERROR during startup: {str(e)}")
 
 @app.get("/health", tags=["Health"])
-async def health_check():
+async def health_check(response: Response):
     """Health check endpoint"""
-    firebase_status = "available" if firebase["db"] else "unavailable"
-    return {"status": "ok", "timestamp": datetime.now().isoformat(), "firebase": firebase_status}
+    # Reuses the startup probe result; never initializes Firebase or hits the network.
+    # Only states and counts are public: step details, job arguments and
+    # delivery errors stay in the logs.
+    readiness = startup.summary()
+    # Only a failed critical step makes the instance unhealthy. Background
+    # provisioning (e.g. no Sheets credentials) is reported in the body but
+    # answers 200, since cached data is still served.
+    if readiness["failed_critical"]:
+        response.status_code = 503
+    firebase_status = firebase.status()
+    probe = firebase_status.get("probe")
+    return {
+        "status": "unavailable" if readiness["failed_critical"] else readiness["state"],
+        "readiness": readiness,
+        "timestamp": datetime.now().isoformat(),
+        "firebase": firebase_status["state"],
+        "firebase_probe": {"ok": probe["ok"], "latency_ms": probe.get("latency_ms")} if probe else None,
+        "notifications": notifier.outbox.summary(),
+        "command_jobs": notifier.jobs.summary(),
+    }
 
 @app.get("/diagnose-selenium", tags=["Diagnostics"])
 async def diagnose_selenium():
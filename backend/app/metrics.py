@@ -0,0 +1,341 @@
+"""
+In-process metrics in the Prometheus text format, served at /metrics.
+
+Counters and histograms are plain dicts keyed by label values and are
+updated without locks. Almost every update happens on the event loop
+thread; a racing worker thread can at worst lose an increment, which is
+an acceptable price for keeping an update to a dict lookup, a bisect and
+two additions. Values that other components already track (the GitHub
+activity cache counters, thread pool queues) are read through collector
+callbacks when /metrics is scraped, so they cost nothing in between.
+
+What is recorded:
+
+- http_requests_total / http_request_duration_seconds by method, route
+  template and status (MetricsMiddleware)
+- upstream_request_duration_seconds by upstream, operation and status
+  class for GitHub, ipapi and Telegram (InstrumentedTransport on the
+  pooled httpx clients) and Google Sheets (the Sheets request builder)
+- cache_lookups_total and cache_hit_ratio for the blog, profile and
+  GitHub activity caches
+- event_loop_lag_seconds, sampled by a timer task that measures how late
+  it wakes up, and thread_pool_queue_depth / thread_pool_threads
+"""
+
+import os
+import time
+import asyncio
+import logging
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG_INTERVAL_SECONDS = float(os.getenv("METRICS_LOOP_LAG_INTERVAL", "0.5"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LOOP_LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+Labels = Tuple[str, ...]
+Sample = Tuple[Labels, float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        """
+        Initialize a metric family
+
+        Args:
+            name: Metric name as exposed to Prometheus
+            documentation: HELP text
+            labelnames: Label names, in the order values are passed
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Add a callback that yields (label values, value) pairs when metrics are rendered"""
+        self._collectors.append(collector)
+
+    def samples(self) -> Iterable[Sample]:
+        for collector in self._collectors:
+            try:
+                yield from collector()
+            except Exception as e:
+                logger.warning("Metrics collector for %s failed: %s", self.name, e)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in self.samples():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[Sample]:
+        yield from list(self._values.items())
+        yield from super().samples()
+
+
+class Gauge(Metric):
+    """Gauge whose values come from collectors, read when metrics are rendered"""
+
+    kind = "gauge"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Labels, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series.setdefault(labels, [[0] * (len(self.buckets) + 1), 0.0])
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        bucket_labels = self.labelnames + ("le",)
+        for labels, (counts, total) in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), list(counts)):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_labels, labels + (_format_value(bound),))} "
+                             f"{cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+def status_class(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+
+def operation_name(request: httpx.Request) -> str:
+    """
+    Operation label for an outbound call: the "operation" request extension
+    if the caller set one, otherwise the last path segment (graphql,
+    contributions, sendMessage). Telegram puts the bot token earlier in the
+    path, so it never ends up in a label.
+    """
+    operation = request.extensions.get("operation")
+    if operation:
+        return operation
+    segments = [segment for segment in request.url.path.split("/") if segment]
+    return segments[-1] if segments else "root"
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    def __init__(self, registry: "MetricsRegistry", upstream: str, transport: httpx.AsyncBaseTransport):
+        """
+        Initialize the wrapper
+
+        Args:
+            registry: Where latencies are recorded
+            upstream: Upstream name used as label (github, ipapi, telegram)
+            transport: The pooled transport doing the actual work
+        """
+        self.registry = registry
+        self.upstream = upstream
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # Measured up to the response headers; connect errors and timeouts
+        # are recorded with status "error"
+        start = time.perf_counter()
+        status = "error"
+        try:
+            response = await self.transport.handle_async_request(request)
+            status = status_class(response.status_code)
+            return response
+        finally:
+            self.registry.upstream_latency.observe(
+                time.perf_counter() - start, self.upstream, operation_name(request), status)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class MetricsMiddleware:
+    def __init__(self, app, registry: Optional["MetricsRegistry"] = None):
+        """
+        Initialize the middleware (a plain ASGI middleware, cheaper than
+        BaseHTTPMiddleware since the response body is not re-streamed)
+
+        Args:
+            app: The wrapped ASGI app
+            registry: Where requests are recorded (the process-wide registry by default)
+        """
+        self.app = app
+        self.registry = registry or metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The route template keeps label values bounded (no raw paths)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            labels = (scope["method"], path, str(status_code))
+            self.registry.requests.inc(*labels)
+            self.registry.request_latency.observe(time.perf_counter() - start, *labels)
+
+
+class MetricsRegistry:
+    def __init__(self, loop_lag_interval: float = LOOP_LAG_INTERVAL_SECONDS):
+        """
+        Initialize the registry and its metric families
+
+        Args:
+            loop_lag_interval: How often the event loop lag is sampled, in seconds
+        """
+        self.loop_lag_interval = loop_lag_interval
+        self.metrics: List[Metric] = []
+        self._executors: Dict[str, Callable[[], Optional[ThreadPoolExecutor]]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lag_task: Optional[asyncio.Task] = None
+
+        self.requests = self.add(Counter(
+            "http_requests_total", "HTTP requests handled, by route template and status",
+            ("method", "route", "status")))
+        self.request_latency = self.add(Histogram(
+            "http_request_duration_seconds", "HTTP request latency, by route template and status",
+            ("method", "route", "status")))
+        self.upstream_latency = self.add(Histogram(
+            "upstream_request_duration_seconds", "Outbound call latency, by upstream, operation and status class",
+            ("upstream", "operation", "status")))
+        self.cache_lookups = self.add(Counter(
+            "cache_lookups_total", "Cache lookups, by cache and result (hit, stale, miss)",
+            ("cache", "result")))
+        self.cache_hit_ratio = self.add(Gauge(
+            "cache_hit_ratio", "Fresh hits over all lookups since start, by cache", ("cache",)))
+        self.cache_hit_ratio.add_collector(self._hit_ratios)
+        self.loop_lag = self.add(Histogram(
+            "event_loop_lag_seconds", "How late the event loop ran a timer scheduled for now",
+            buckets=LOOP_LAG_BUCKETS))
+        self.pool_queue_depth = self.add(Gauge(
+            "thread_pool_queue_depth", "Work items waiting for a thread, by pool", ("pool",)))
+        self.pool_queue_depth.add_collector(lambda: self._pool_samples(lambda pool: pool._work_queue.qsize()))
+        self.pool_threads = self.add(Gauge(
+            "thread_pool_threads", "Threads started, by pool", ("pool",)))
+        self.pool_threads.add_collector(lambda: self._pool_samples(lambda pool: len(pool._threads)))
+
+    def add(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def register_executor(self, name: str, executor: Any) -> None:
+        """Report queue depth and threads for a ThreadPoolExecutor (or a callable returning one)"""
+        self._executors[name] = executor if callable(executor) else (lambda: executor)
+
+    def _pool_samples(self, read: Callable[[ThreadPoolExecutor], int]) -> Iterable[Sample]:
+        # _work_queue and _threads are ThreadPoolExecutor internals; there is
+        # no public way to see how much work is waiting
+        for name, resolve in list(self._executors.items()):
+            pool = resolve()
+            if isinstance(pool, ThreadPoolExecutor):
+                yield (name,), read(pool)
+
+    def _hit_ratios(self) -> Iterable[Sample]:
+        totals: Dict[str, Dict[str, float]] = {}
+        for (cache, result), value in self.cache_lookups.samples():
+            results = totals.setdefault(cache, {})
+            results[result] = results.get(result, 0) + value
+        for cache, results in totals.items():
+            lookups = sum(results.values())
+            if lookups:
+                yield (cache,), results.get("hit", 0) / lookups
+
+    def _default_executor(self) -> Optional[ThreadPoolExecutor]:
+        # asyncio.to_thread uses the loop's default executor, created on first use
+        return getattr(self._loop, "_default_executor", None) if self._loop else None
+
+    async def _sample_loop_lag(self) -> None:
+        while True:
+            scheduled = time.perf_counter()
+            await asyncio.sleep(self.loop_lag_interval)
+            self.loop_lag.observe(max(0.0, time.perf_counter() - scheduled - self.loop_lag_interval))
+
+    def start(self) -> None:
+        """Start the loop lag sampler on the running loop (idempotent)"""
+        if self._lag_task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self.register_executor("default", self._default_executor)
+        self._lag_task = self._loop.create_task(self._sample_loop_lag())
+
+    async def stop(self) -> None:
+        if self._lag_task is None:
+            return
+        self._lag_task.cancel()
+        try:
+            await self._lag_task
+        except asyncio.CancelledError:
+            pass
+        self._lag_task = None
+
+    def instrument(self, upstream: str, transport: httpx.AsyncBaseTransport) -> InstrumentedTransport:
+        """Wrap an httpx transport so every call is recorded under the upstream's name"""
+        return InstrumentedTransport(self, upstream, transport)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry; the loop lag sampler is started by the app lifespan
+metrics = MetricsRegistry()
@@ -2,81 +2,190 @@ import os
 import requests
 from typing import Optional
 from dotenv import load_dotenv
-import asyncio
 from datetime import datetime
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+
+from .notification_outbox import NotificationOutbox, TELEGRAM_API_BASE
+from .command_jobs import CommandJob, CommandJobQueue
 
 load_dotenv()
 
+# With a public URL and a secret, Telegram pushes updates to /api/telegram/webhook
+# instead of the app long-polling getUpdates, so idle instances can scale to zero
+TELEGRAM_WEBHOOK_URL = os.getenv("TELEGRAM_WEBHOOK_URL")
+TELEGRAM_WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET")
+# Webhook update ids remembered for spotting redeliveries
+WEBHOOK_SEEN_UPDATES = 1000
+
 class NotificationHelper:
     def __init__(self):
-        """Initialize the notification helper with Telegram credentials"""
+        """
+        Initialize the notification helper with Telegram credentials.
+
+        Construction never starts threads or network calls; use get_notifier()
+        for the process-wide instance and start()/stop() (done by the app
+        lifespan) for its single message poller or webhook registration.
+        """
         self.telegram_bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
         self.telegram_chat_id = os.getenv("TELEGRAM_CHAT_ID")
         self.is_telegram_configured = bool(self.telegram_bot_token and self.telegram_chat_id)
         self.is_enabled = self.is_telegram_configured  # For backwards compatibility
+        self.webhook_url = TELEGRAM_WEBHOOK_URL
+        self.webhook_secret = TELEGRAM_WEBHOOK_SECRET
+        self.mode = "webhook" if self.webhook_url and self.webhook_secret else "polling"
         self.last_update_id = 0
+        # Webhook updates can arrive out of order, so redeliveries are
+        # recognised by id rather than by a high-water mark
+        self._seen_update_ids = set()
+        self._seen_update_order = deque()
         self.command_handlers = {}
-        self.loop = asyncio.new_event_loop()
-        self.executor = ThreadPoolExecutor(max_workers=1)
-        
-        # Start message polling in a separate thread if enabled
-        if self.is_telegram_configured:
+        self.command_limits = {}
+        self.running = False
+        self.polling_thread: Optional[threading.Thread] = None
+        # Commands run as jobs on the app loop, so polling continues meanwhile
+        self.jobs = CommandJobQueue(on_finish=self._report_job)
+        # One pooled HTTP session for the poller and for sends outside the app loop
+        self.session = requests.Session()
+        # Inside the app, notifications are queued and delivered by the outbox sender
+        self.outbox = NotificationOutbox(self.telegram_bot_token)
+        self._lock = threading.Lock()
+
+    def _api_url(self, method: str) -> str:
+        return f"{TELEGRAM_API_BASE}/bot{self.telegram_bot_token}/{method}"
+
+    def start(self):
+        """
+        Start the single message poller (no-op if it is already running),
+        or in webhook mode register the webhook with Telegram instead
+        """
+        with self._lock:
+            if self.running:
+                return
+
+            if not self.is_telegram_configured:
+                if self.telegram_bot_token:
+                    # If we have a token but no chat ID, try to get it
+                    chat_id = self.get_chat_id()
+                    if chat_id:
+                        print(f"\n=== FOUND YOUR CHAT ID: {chat_id} ===")
+                        print("Add this to your .env file as TELEGRAM_CHAT_ID\n")
+                return
+
+            if self.webhook_url and not self.webhook_secret:
+                print("TELEGRAM_WEBHOOK_URL is set without TELEGRAM_WEBHOOK_SECRET; falling back to polling")
+            if self.mode == "webhook":
+                self.set_webhook()
+                return
+            # getUpdates is refused while a webhook from an earlier deployment is set
+            self.delete_webhook()
+
             self.running = True
-            self.polling_thread = threading.Thread(target=self._poll_messages)
+            self.polling_thread = threading.Thread(target=self._poll_messages, name="telegram-poller")
             self.polling_thread.daemon = True
             self.polling_thread.start()
-        
-        if not self.is_telegram_configured and self.telegram_bot_token:
-            # If we have a token but no chat ID, try to get it
-            chat_id = self.get_chat_id()
-            if chat_id:
-                print(f"\n=== FOUND YOUR CHAT ID: {chat_id} ===")
-                print("Add this to your .env file as TELEGRAM_CHAT_ID\n")
-    
-    def register_command(self, command: str, handler):
-        """Register a handler function for a specific command"""
+            print("✅ Telegram bot listener started")
+
+    def register_command(self, command: str, handler, max_concurrent: int = 1):
+        """
+        Register a handler function for a specific command.
+        At most max_concurrent jobs of the command run at once.
+        """
         self.command_handlers[command.lower()] = handler
-    
-    def _run_async(self, coro):
-        """Run an async function from a sync context"""
-        asyncio.set_event_loop(self.loop)
-        return self.loop.run_until_complete(coro)
-    
+        self.command_limits[command.lower()] = max_concurrent
+
+    def handle_update(self, update: dict):
+        """Dispatch one Telegram update; commands are queued, never run inline"""
+        if 'message' not in update or 'text' not in update['message']:
+            return
+        message_text = update['message']['text'].strip().lower()
+        if not message_text.startswith('/'):
+            return
+
+        # Remove '/' (and a trailing @botname) and split off the arguments
+        command, *args = message_text[1:].split()
+        command = command.split('@')[0]
+
+        try:
+            if command == "status":
+                self.send_reply(self.jobs.status_text())
+            elif command == "cancel":
+                cancelled = self.jobs.cancel(args[0] if args else None)
+                if cancelled:
+                    self.send_reply("Cancelling " + ", ".join(f"#{job.id} /{job.command}" for job in cancelled), "WARNING")
+                else:
+                    self.send_reply("No matching command is running")
+            elif command in self.command_handlers:
+                job, message = self.jobs.submit(
+                    command, self.command_handlers[command], args, self.command_limits.get(command, 1))
+                self.send_reply(message, "INFO" if job else "WARNING")
+        except Exception as e:
+            error_msg = f"Error handling command {command}: {str(e)}"
+            print(error_msg)
+            self.send_reply(error_msg, "ERROR")
+
+    def handle_webhook_update(self, update: dict) -> bool:
+        """
+        Dispatch an update pushed to the webhook. Telegram redelivers
+        updates it did not get a 2xx for, so ones already seen are skipped.
+        Telegram may push over several connections at once, so a lower id
+        arriving after a higher one is still handled.
+        """
+        update_id = update.get('update_id')
+        if update_id is not None:
+            with self._lock:
+                if update_id in self._seen_update_ids:
+                    return False
+                self._seen_update_ids.add(update_id)
+                self._seen_update_order.append(update_id)
+                while len(self._seen_update_order) > WEBHOOK_SEEN_UPDATES:
+                    self._seen_update_ids.discard(self._seen_update_order.popleft())
+        self.handle_update(update)
+        return True
+
+    def set_webhook(self) -> bool:
+        """Register the webhook URL and secret token with Telegram"""
+        try:
+            response = self.session.post(self._api_url("setWebhook"), json={
+                "url": self.webhook_url,
+                "secret_token": self.webhook_secret,
+                "allowed_updates": ["message"],
+            }, timeout=10)
+            if response.json().get("ok", False):
+                print(f"✅ Telegram webhook registered: {self.webhook_url}")
+                return True
+            print(f"Failed to register Telegram webhook: {response.text}")
+        except Exception as e:
+            print(f"Error registering Telegram webhook: {e}")
+        return False
+
+    def delete_webhook(self) -> bool:
+        """Remove any registered webhook so getUpdates can be used"""
+        try:
+            response = self.session.post(self._api_url("deleteWebhook"), timeout=10)
+            return response.json().get("ok", False)
+        except Exception as e:
+            print(f"Error removing Telegram webhook: {e}")
+            return False
+
+    def _report_job(self, job: CommandJob):
+        if job.status == "done":
+            self.send_reply(f"Command completed: {job.describe()}")
+        elif job.status == "cancelled":
+            self.send_reply(f"Command cancelled: {job.describe()}", "WARNING")
+        else:
+            self.send_reply(f"Command failed: {job.describe()}\n{job.result}", "ERROR")
+
     def _poll_messages(self):
         """Poll for new messages in a loop"""
         while self.running:
             try:
                 updates = self._get_updates()
                 for update in updates:
-                    if 'message' in update and 'text' in update['message']:
-                        message_text = update['message']['text'].lower()
-                        chat_id = update['message']['chat']['id']
-                        
-                        # Handle commands
-                        if message_text.startswith('/'):
-                            command = message_text[1:].split()[0]  # Remove '/' and get first word
-                            if command in self.command_handlers:
-                                try:
-                                    self.send_notification(f"Received command: {command}")
-                                    handler = self.command_handlers[command]
-                                    
-                                    # Execute the handler in the executor if it's async
-                                    if asyncio.iscoroutinefunction(handler):
-                                        result = self._run_async(handler())
-                                    else:
-                                        result = handler()
-                                        
-                                    self.send_notification(f"Command completed: {command}")
-                                except Exception as e:
-                                    error_msg = f"Error executing command {command}: {str(e)}"
-                                    print(error_msg)
-                                    self.send_notification(error_msg, "ERROR")
-                        
-                        # Update last_update_id
-                        self.last_update_id = update['update_id'] + 1
+                    self.handle_update(update)
+                    # Update last_update_id
+                    self.last_update_id = update['update_id'] + 1
                 
                 time.sleep(1)  # Wait before next poll
             except Exception as e:
@@ -89,12 +198,12 @@ class NotificationHelper:
             return []
             
         try:
-            url = f"https://api.telegram.org/bot{self.telegram_bot_token}/getUpdates"
+            url = self._api_url("getUpdates")
             params = {
                 "offset": self.last_update_id,
                 "timeout": 30
             }
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params, timeout=params["timeout"] + 10)
             if response.status_code == 200:
                 return response.json().get("result", [])
         except Exception as e:
@@ -108,8 +217,8 @@ class NotificationHelper:
         """
         try:
             # Get updates from the bot
-            url = f"https://api.telegram.org/bot{self.telegram_bot_token}/getUpdates"
-            response = requests.get(url)
+            url = self._api_url("getUpdates")
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
             updates = response.json()
@@ -144,8 +253,15 @@ class NotificationHelper:
         message = "🔔 Test notification from LinkedIn Scraper\n\nIf you see this, your notifications are working!"
         return self.send_notification(message, "INFO")
     
-    def send_notification(self, message, message_type="INFO"):
-        """Send a notification to Telegram if configured"""
+    def send_reply(self, message, message_type="INFO"):
+        """Answer a bot command; replies are never deduplicated (a repeated /status gets an answer)"""
+        return self.send_notification(message, message_type, dedupe=False)
+
+    def send_notification(self, message, message_type="INFO", dedupe=True):
+        """
+        Send a notification to Telegram if configured. With dedupe, the same
+        event notification repeated within the outbox's window is sent once.
+        """
         if not self.is_telegram_configured:
             print(f"Telegram not configured, can't send notification: {message}")
             return {"success": False, "message": "Telegram not configured"}
@@ -169,15 +285,23 @@ class NotificationHelper:
         
         formatted_message = f"{env_prefix} | {emoji} {message_type}: {message}\n\n🕒 {timestamp}"
         
+        data = {
+            "chat_id": self.telegram_chat_id,
+            "text": formatted_message,
+            "parse_mode": "HTML"
+        }
+
+        if self.outbox.running:
+            # The timestamp is left out of the key so repeats of one event are sent once
+            dedupe_key = f"{message_type}:{message}" if dedupe else None
+            if not self.outbox.enqueue(data, dedupe_key=dedupe_key):
+                return {"success": True, "message": "Duplicate notification skipped"}
+            return {"success": True, "message": "Notification queued"}
+
+        # No sender running (scripts, standalone scraper): deliver directly
         try:
-            url = f"https://api.telegram.org/bot{self.telegram_bot_token}/sendMessage"
-            data = {
-                "chat_id": self.telegram_chat_id,
-                "text": formatted_message,
-                "parse_mode": "HTML"
-            }
-            
-            response = requests.post(url, json=data)
+            url = self._api_url("sendMessage")
+            response = self.session.post(url, json=data, timeout=10)
             response_json = response.json()
             
             if response_json.get("ok", False):
@@ -208,21 +332,37 @@ class NotificationHelper:
         message = f"LinkedIn scrape failed: {error}"
         return self.send_notification(message, "ERROR")
     
-    def stop(self):
-        """Stop the message polling thread"""
-        self.running = False
-        if hasattr(self, 'polling_thread'):
-            self.polling_thread.join()
+    def stop(self, timeout: float = 5.0):
+        """Stop the message poller; an in-flight long poll is abandoned after timeout"""
+        with self._lock:
+            self.running = False
+            thread, self.polling_thread = self.polling_thread, None
+        if thread is not None:
+            thread.join(timeout)
     
     async def listen_for_messages(self):
         """
-        Dummy async method for compatibility.
-        Actual message handling is done in _poll_messages thread.
+        Compatibility wrapper that starts the poller.
+        Actual message handling is done in the _poll_messages thread.
         """
         if not self.is_telegram_configured:
             print("Telegram not configured. Cannot listen for messages.")
             return False
-            
+
+        self.start()
         print("Telegram message handling is running in background thread.")
-        # We don't need to do anything here since _poll_messages is already running in a thread
-        return True 
\ No newline at end of file
+        return True
+
+
+_notifier: Optional[NotificationHelper] = None
+_notifier_lock = threading.Lock()
+
+
+def get_notifier() -> NotificationHelper:
+    """The process-wide notifier shared by the API, the scraper and scripts"""
+    global _notifier
+    if _notifier is None:
+        with _notifier_lock:
+            if _notifier is None:
+                _notifier = NotificationHelper()
+    return _notifier 
\ No newline at end of file
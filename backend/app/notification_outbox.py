@@ -0,0 +1,418 @@
+"""
+Persistent outbox for Telegram notifications.
+
+Callers (request handlers, the scraper's worker threads, the message
+poller) only append to the outbox and return; a task on the application
+loop delivers the messages in order over the pooled "telegram" client,
+retrying with exponential backoff. Pending messages are mirrored to a
+small JSON file, so they survive restarts and Telegram outages; while the
+sender runs, the file is written from a worker thread, and one write
+covers every change made before it starts.
+
+Identical messages within a short window are dropped at enqueue, a burst
+of messages is sent as one digest, and sends are paced by a token bucket
+below Telegram's per-chat limit, so bursts do not end in 429s.
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+import httpx
+
+from .http_clients import http_clients
+
+logger = logging.getLogger(__name__)
+
+# Point at scripts/fake_telegram_server.py to exercise notifications and commands locally
+TELEGRAM_API_BASE = os.getenv("TELEGRAM_API_BASE", "https://api.telegram.org").rstrip("/")
+OUTBOX_PATH = os.getenv(
+    "TELEGRAM_OUTBOX_PATH",
+    os.path.join(os.path.dirname(__file__), "../data/telegram_outbox.json"),
+)
+# The oldest messages are dropped beyond this, so a long outage cannot grow the file forever
+OUTBOX_MAX_PENDING = 500
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 5 * 60
+# Identical messages (same dedupe key) within this window are sent once
+DEDUPE_WINDOW_SECONDS = 60
+# Messages queued within this window of the first one go out as a single digest
+COALESCE_WINDOW_SECONDS = 2.0
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+DIGEST_SEPARATOR = "\n\n— — —\n\n"
+# Telegram allows about one message per second to a chat, with short bursts
+SEND_RATE_PER_SECOND = 1.0
+SEND_BURST = 3
+# A head message that keeps raising unexpected errors is dropped after this many tries
+MAX_UNEXPECTED_ERRORS = 3
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize the bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Most tokens held at once (the allowed burst)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> float:
+        """Take a token; returns 0 on success, else the seconds until one is available"""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    async def acquire(self) -> None:
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after Telegram answered 429"""
+        self._refill()
+        self.tokens = 0.0
+
+
+class NotificationOutbox:
+    def __init__(self, bot_token: Optional[str], path: Optional[str] = OUTBOX_PATH, max_pending: int = OUTBOX_MAX_PENDING):
+        """
+        Initialize the outbox
+
+        Args:
+            bot_token: Telegram bot token used for delivery (never persisted)
+            path: JSON file pending messages are persisted to; None keeps them in memory only
+            max_pending: Oldest messages are dropped beyond this many
+        """
+        self.bot_token = bot_token
+        self.path = path
+        self.max_pending = max_pending
+        self.sent = 0
+        self.digests = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.loaded = False
+        # Head message behind the latest unexpected sender errors, and how many in a row
+        self._error_head: Optional[Dict[str, Any]] = None
+        self._unexpected_errors = 0
+        self._pending: Deque[Dict[str, Any]] = deque()
+        # dedupe key -> time it was last queued
+        self._recent: Dict[str, float] = {}
+        self.bucket = TokenBucket(SEND_RATE_PER_SECOND, SEND_BURST)
+        self._lock = threading.Lock()
+        # Held across snapshot and write, so an older snapshot never lands last
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Future] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def load(self) -> None:
+        """Read persisted messages; a missing or unreadable file starts empty"""
+        with self._lock:
+            self.loaded = True
+            if not self.path or not os.path.exists(self.path):
+                return
+            try:
+                with open(self.path, "r") as f:
+                    self._pending.extend(json.load(f))
+                if self._pending:
+                    logger.info("Loaded %d pending Telegram notification(s) from %s", len(self._pending), self.path)
+            except Exception as e:
+                logger.warning("Failed to load Telegram outbox: %s", e)
+                self._pending.clear()
+
+    def flush(self) -> None:
+        """Write pending messages to the file if they changed since the last write"""
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                self._dirty = False
+                snapshot = list(self._pending)
+            if not self.path:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, "w") as f:
+                    json.dump(snapshot, f)
+                os.replace(temp_path, self.path)
+            except Exception as e:
+                logger.warning("Failed to save Telegram outbox: %s", e)
+
+    def _schedule_flush(self) -> None:
+        # Runs on the loop; a write already in flight picks up nothing new,
+        # so another one follows it when more changes came in meanwhile
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(asyncio.to_thread(self.flush))
+            self._flush_task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Future) -> None:
+        if self._dirty and self._loop is not None:
+            self._schedule_flush()
+
+    def _persist(self) -> None:
+        """Save off the loop while the sender runs, right away otherwise"""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._schedule_flush)
+        else:
+            self.flush()
+
+    def _is_duplicate(self, key: str, now: float) -> bool:
+        # Callers hold self._lock
+        if len(self._recent) > 256:
+            self._recent = {k: t for k, t in self._recent.items() if now - t < DEDUPE_WINDOW_SECONDS}
+        last = self._recent.get(key)
+        if last is not None and now - last < DEDUPE_WINDOW_SECONDS:
+            return True
+        self._recent[key] = now
+        return False
+
+    def enqueue(self, payload: Dict[str, Any], dedupe_key: Optional[str] = None) -> bool:
+        """
+        Queue a sendMessage payload; safe to call from any thread. Returns
+        False when an identical message (same dedupe_key) was queued
+        within the dedupe window.
+        """
+        if not self.loaded:
+            self.load()
+
+        with self._lock:
+            if dedupe_key is not None and self._is_duplicate(dedupe_key, time.time()):
+                self.deduplicated += 1
+                return False
+            self._pending.append({"payload": payload, "queued_at": time.time(), "attempts": 0})
+            while len(self._pending) > self.max_pending:
+                self._pending.popleft()
+                self.dropped += 1
+            self._dirty = True
+
+        self._persist()
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wake.set)
+        return True
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _peek(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._pending[0] if self._pending else None
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        """
+        The head message plus the ones after it that fit in one digest
+        (same chat and parse mode, within Telegram's length limit)
+        """
+        with self._lock:
+            if not self._pending:
+                return []
+            batch = [self._pending[0]]
+            head = batch[0]["payload"]
+            length = len(head.get("text", ""))
+            for message in list(self._pending)[1:]:
+                payload = message["payload"]
+                if (payload.get("chat_id"), payload.get("parse_mode")) != (head.get("chat_id"), head.get("parse_mode")):
+                    break
+                length += len(DIGEST_SEPARATOR) + len(payload.get("text", ""))
+                if length > TELEGRAM_MAX_MESSAGE_LENGTH:
+                    break
+                batch.append(message)
+            return batch
+
+    def _complete(self, batch: List[Dict[str, Any]], delivered: bool) -> None:
+        with self._lock:
+            for message in batch:
+                if self._pending and self._pending[0] is message:
+                    self._pending.popleft()
+            self._dirty = True
+        self._persist()
+        if delivered:
+            self.sent += len(batch)
+            if len(batch) > 1:
+                self.digests += 1
+        else:
+            self.dropped += len(batch)
+
+    @staticmethod
+    def _digest_payload(batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if len(batch) == 1:
+            return batch[0]["payload"]
+        return {
+            **batch[0]["payload"],
+            "text": DIGEST_SEPARATOR.join(message["payload"].get("text", "") for message in batch),
+        }
+
+    def _retry_delay(self, retry_after: Optional[float] = None) -> float:
+        if retry_after:
+            return float(retry_after)
+        # Called before consecutive_failures counts this failure: base, 2x, 4x, ...
+        return min(RETRY_BASE_SECONDS * 2 ** self.consecutive_failures, RETRY_MAX_SECONDS)
+
+    async def _deliver(self, client: httpx.AsyncClient, batch: List[Dict[str, Any]]) -> Optional[float]:
+        """
+        Send a batch as one message. Returns None once the batch is done
+        with (delivered, or rejected for good), else the delay before a retry.
+        """
+        url = f"{TELEGRAM_API_BASE}/bot{self.bot_token}/sendMessage"
+        for message in batch:
+            message["attempts"] += 1
+        await self.bucket.acquire()
+        try:
+            response = await client.post(url, json=self._digest_payload(batch))
+        except httpx.HTTPError as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            return self._retry_delay()
+
+        if response.status_code == 200:
+            self.last_error = None
+            self._complete(batch, delivered=True)
+            return None
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        self.last_error = f"HTTP {response.status_code}: {body.get('description', response.text[:200])}"
+
+        if response.status_code == 429:
+            self.bucket.drain()
+        if response.status_code == 429 or response.status_code >= 500:
+            return self._retry_delay((body.get("parameters") or {}).get("retry_after"))
+
+        # Any other 4xx (bad chat id, malformed text) will not succeed on retry
+        logger.warning("Dropping Telegram notification after %s", self.last_error)
+        self._complete(batch, delivered=False)
+        return None
+
+    async def _send_next(self) -> None:
+        message = self._peek()
+        if message is None:
+            self._wake.clear()
+            if self._peek() is None:
+                await self._wake.wait()
+            return
+
+        # Give a burst a moment to gather so it goes out as one digest
+        gather_for = message["queued_at"] + COALESCE_WINDOW_SECONDS - time.time()
+        if gather_for > 0 and message["attempts"] == 0:
+            await asyncio.sleep(gather_for)
+
+        retry_in = await self._deliver(http_clients.get("telegram"), self._take_batch())
+        if retry_in is None:
+            self.consecutive_failures = 0
+            return
+
+        self.consecutive_failures += 1
+        logger.warning("Telegram delivery failed (%d in a row), retrying in %.0fs: %s",
+                       self.consecutive_failures, retry_in, self.last_error)
+        await asyncio.sleep(retry_in)
+
+    def _drop_poisoned_head(self, head: Optional[Dict[str, Any]]) -> None:
+        """Drop the head message once it has raised MAX_UNEXPECTED_ERRORS times in a row"""
+        if head is None:
+            return
+        if head is not self._error_head:
+            self._error_head, self._unexpected_errors = head, 0
+        self._unexpected_errors += 1
+        if self._unexpected_errors >= MAX_UNEXPECTED_ERRORS and self._peek() is head:
+            logger.error("Dropping Telegram notification that failed %d times in a row: %r",
+                         self._unexpected_errors, head)
+            self._error_head, self._unexpected_errors = None, 0
+            self._complete([head], delivered=False)
+
+    async def _run(self) -> None:
+        while True:
+            head = self._peek()
+            try:
+                await self._send_next()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep the sender alive: with it gone, notifications fall back
+                # to blocking sends on the caller's thread
+                retry_in = self._retry_delay()
+                self.consecutive_failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.exception("Telegram outbox sender error, retrying in %.0fs", retry_in)
+                self._drop_poisoned_head(head)
+                await asyncio.sleep(retry_in)
+
+    def start(self) -> None:
+        """Start the sender on the running loop (no-op without a bot token)"""
+        if self.running or not self.bot_token:
+            return
+        if not self.loaded:
+            self.load()
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the sender; undelivered messages stay in the file for the next start"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._loop = None
+        self._wake = None
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        with self._lock:
+            self._dirty = True
+        await asyncio.to_thread(self.flush)
+
+    def summary(self) -> Dict[str, Any]:
+        """Queue state and counts; leaves out last_error, which can carry the request URL"""
+        return {
+            "running": self.running,
+            "pending": self.pending(),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "pending": self.pending(),
+            "sent": self.sent,
+            "digests": self.digests,
+            "deduplicated": self.deduplicated,
+            "dropped": self.dropped,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+        }
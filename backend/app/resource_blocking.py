@@ -0,0 +1,171 @@
+"""
+Chrome request blocking and network accounting for the LinkedIn scraper.
+
+The scraper only reads text and the profile image URL, so images, media,
+fonts and analytics beacons are blocked through CDP Network.setBlockedURLs.
+NetworkUsage reads Chrome's performance log to report the bytes actually
+transferred and the page-load timings of each scrape.
+"""
+
+import os
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger("linkedin_scraper")
+
+BLOCKED_URL_GROUPS = {
+    "images": [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+        # LinkedIn serves profile and banner images without file extensions
+        "*media.licdn.com/dms/image/*",
+    ],
+    "media": [
+        "*.mp4", "*.webm", "*.m3u8", "*.ts", "*.mp3", "*.ogg",
+        "*dms.licdn.com/playlist/*",
+    ],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "analytics": [
+        "*px.ads.linkedin.com/*",
+        "*linkedin.com/li/track*",
+        "*linkedin.com/realtime/*",
+        "*snap.licdn.com/*",
+        "*google-analytics.com/*",
+        "*googletagmanager.com/*",
+        "*doubleclick.net/*",
+        "*bat.bing.com/*",
+        "*connect.facebook.net/*",
+        "*platform.linkedin.com/litms/*",
+    ],
+}
+
+DEFAULT_BLOCKED_GROUPS = "images,media,fonts,analytics"
+
+PAGE_TIMING_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+if (!nav) { return null; }
+return {
+    url: nav.name,
+    response_end_ms: nav.responseEnd,
+    dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+    load_ms: nav.loadEventEnd,
+    resource_count: performance.getEntriesByType('resource').length
+};
+"""
+
+
+class ResourceBlockingProfile:
+    def __init__(self, groups: Iterable[str] = (), extra_patterns: Iterable[str] = ()):
+        """
+        Initialize a blocking profile
+
+        Args:
+            groups: Names from BLOCKED_URL_GROUPS to block
+            extra_patterns: Additional Network.setBlockedURLs wildcard patterns
+        """
+        unknown = [group for group in groups if group not in BLOCKED_URL_GROUPS]
+        if unknown:
+            raise ValueError(f"Unknown resource groups: {', '.join(unknown)}")
+
+        self.groups = list(groups)
+        self.extra_patterns = [pattern for pattern in extra_patterns if pattern]
+
+    @classmethod
+    def from_env(cls) -> "ResourceBlockingProfile":
+        """Build the profile from LINKEDIN_BLOCK_RESOURCES and LINKEDIN_BLOCKED_URL_PATTERNS"""
+        raw_groups = os.getenv("LINKEDIN_BLOCK_RESOURCES", DEFAULT_BLOCKED_GROUPS).strip().lower()
+        groups = [] if raw_groups in ("", "none", "false", "0") else [
+            group.strip() for group in raw_groups.split(",") if group.strip()]
+        # A typo in the env var must not take every scrape down; skip unknown names
+        unknown = [group for group in groups if group not in BLOCKED_URL_GROUPS]
+        if unknown:
+            logger.warning(f"Ignoring unknown LINKEDIN_BLOCK_RESOURCES groups: {', '.join(unknown)} "
+                           f"(known: {', '.join(BLOCKED_URL_GROUPS)})")
+            groups = [group for group in groups if group in BLOCKED_URL_GROUPS]
+        extra = [pattern.strip() for pattern in os.getenv("LINKEDIN_BLOCKED_URL_PATTERNS", "").split(",")]
+        return cls(groups, extra)
+
+    @property
+    def is_enabled(self) -> bool:
+        return bool(self.groups or self.extra_patterns)
+
+    def patterns(self) -> List[str]:
+        patterns: List[str] = []
+        for group in self.groups:
+            patterns.extend(BLOCKED_URL_GROUPS[group])
+        patterns.extend(self.extra_patterns)
+        return patterns
+
+    def chrome_arguments(self) -> List[str]:
+        """Command-line switches that complement the URL blocklist"""
+        if "images" in self.groups:
+            # Image elements keep their src attribute, which is all we read
+            return ["--blink-settings=imagesEnabled=false"]
+        return []
+
+    def apply(self, driver) -> None:
+        """Install the blocklist on a running driver"""
+        if not self.is_enabled:
+            return
+
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.patterns()})
+        logger.info(f"Blocking {len(self.patterns())} URL patterns ({', '.join(self.groups) or 'custom'})")
+
+
+class NetworkUsage:
+    """Per-scrape network totals collected from Chrome's performance log"""
+
+    def __init__(self):
+        self.bytes_transferred = 0
+        self.responses = 0
+        self.blocked_requests = 0
+        self.failed_requests = 0
+        self.page_loads: List[Dict[str, Any]] = []
+
+    def collect(self, driver) -> None:
+        """Drain the performance log and add its network events to the totals"""
+        try:
+            entries = driver.get_log("performance")
+        except Exception as e:
+            logger.debug(f"Performance log unavailable: {e}")
+            return
+
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError, TypeError):
+                continue
+
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.loadingFinished":
+                self.bytes_transferred += int(params.get("encodedDataLength", 0))
+            elif method == "Network.responseReceived":
+                self.responses += 1
+            elif method == "Network.loadingFailed":
+                if params.get("blockedReason"):
+                    self.blocked_requests += 1
+                else:
+                    self.failed_requests += 1
+
+    def record_page_load(self, driver) -> Optional[Dict[str, Any]]:
+        """Record navigation timings of the current document"""
+        try:
+            timing = driver.execute_script(PAGE_TIMING_SCRIPT)
+        except Exception as e:
+            logger.debug(f"Navigation timing unavailable: {e}")
+            return None
+
+        if timing:
+            self.page_loads.append(timing)
+        return timing
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "bytes_transferred": self.bytes_transferred,
+            "responses": self.responses,
+            "blocked_requests": self.blocked_requests,
+            "failed_requests": self.failed_requests,
+            "page_loads": self.page_loads,
+        }
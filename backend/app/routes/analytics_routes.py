@@ -7,6 +7,7 @@ from pydantic import BaseModel
 import ipaddress
 import httpx
 from ..database import get_db
+from ..http_clients import http_clients
 from ..models import AnalyticsEvent
 
 router = APIRouter()
@@ -18,15 +19,15 @@ class EventCreate(BaseModel):
     userAgent: Optional[str] = None
     timestamp: Optional[datetime] = None
 
-async def get_country_from_ip(ip: str) -> str:
+async def get_country_from_ip(ip: str, client: Optional[httpx.AsyncClient] = None) -> str:
     """Get country from IP using a free IP geolocation API"""
     try:
-        # Use a free IP geolocation API
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"https://ipapi.co/{ip}/json/")
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("country_name", "Unknown")
+        # Use a free IP geolocation API over the shared connection pool
+        client = client or http_clients.get("ipapi")
+        response = await client.get(f"https://ipapi.co/{ip}/json/", extensions={"operation": "geo_lookup"})
+        if response.status_code == 200:
+            data = response.json()
+            return data.get("country_name", "Unknown")
     except Exception:
         pass
     return "Unknown"
@@ -42,7 +43,12 @@ def truncate_ip(ip: str) -> str:
         return "0.0.0.0"
 
 @router.post("/track")
-async def track_event(event: EventCreate, request: Request, db: Session = Depends(get_db)):
+async def track_event(
+    event: EventCreate,
+    request: Request,
+    db: Session = Depends(get_db),
+    geo_client: httpx.AsyncClient = Depends(http_clients.dependency("ipapi")),
+):
     """Track an analytics event"""
     # Get client IP
     client_ip = request.client.host
@@ -58,7 +64,7 @@ async def track_event(event: EventCreate, request: Request, db: Session = Depend
     )
     
     # Get country asynchronously
-    country = await get_country_from_ip(client_ip)
+    country = await get_country_from_ip(client_ip, geo_client)
     db_event.country = country
     
     # Save to database
@@ -0,0 +1,34 @@
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request
+
+from ..notification_helper import get_notifier
+
+router = APIRouter()
+
+
+@router.post("/webhook")
+async def telegram_webhook(
+    request: Request,
+    x_telegram_bot_api_secret_token: Optional[str] = Header(None),
+):
+    """
+    Receive a Telegram update (webhook mode) and dispatch it into the same
+    command registry the poller uses. Commands are queued as jobs, so this
+    answers immediately.
+    """
+    notifier = get_notifier()
+    if not notifier.webhook_secret or not x_telegram_bot_api_secret_token or not hmac.compare_digest(
+            x_telegram_bot_api_secret_token, notifier.webhook_secret):
+        raise HTTPException(status_code=403, detail="Invalid webhook secret")
+
+    try:
+        update = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid update payload")
+    if not isinstance(update, dict):
+        raise HTTPException(status_code=400, detail="Invalid update payload")
+
+    notifier.handle_webhook_update(update)
+    return {"ok": True}
@@ -0,0 +1,176 @@
+"""
+Per-phase instrumentation for LinkedIn scrapes.
+
+ScrapeMetrics records a span for every phase of a scrape (driver setup,
+login, navigation, each extract_* section, the Sheets save) with its wall
+time, the number of WebDriver commands issued and Chrome's resident memory.
+Finished runs are kept in a rolling in-process history.
+"""
+
+import os
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+SCRAPE_METRICS_HISTORY_SIZE = 20
+
+_history: deque = deque(maxlen=SCRAPE_METRICS_HISTORY_SIZE)
+
+
+def _process_tree_rss(root_pid: int) -> Optional[int]:
+    """Sum the resident memory (bytes) of a process and all its descendants (Linux only)"""
+    if not os.path.isdir("/proc"):
+        return None
+
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # The command name may contain spaces, so split after its closing paren
+                fields = f.read().rsplit(")", 1)[1].split()
+            children.setdefault(int(fields[1]), []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+
+    total = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except (OSError, ValueError):
+            continue
+    return total
+
+
+class ScrapeMetrics:
+    def __init__(self, profile_url: Optional[str] = None):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.profile_url = profile_url
+        self.started_at = datetime.now().isoformat()
+        self.finished_at: Optional[str] = None
+        self.spans: List[Dict[str, Any]] = []
+        self.webdriver_commands = 0
+        self._driver_pid: Optional[int] = None
+
+    def attach_driver(self, driver) -> None:
+        """Count every WebDriver command sent through this driver"""
+        original_execute = getattr(driver, "execute", None)
+        if original_execute is None:
+            return
+
+        def counted_execute(driver_command, params=None):
+            self.webdriver_commands += 1
+            return original_execute(driver_command, params)
+
+        driver.execute = counted_execute
+
+        try:
+            self._driver_pid = driver.service.process.pid
+        except AttributeError:
+            self._driver_pid = None
+
+    def chrome_rss(self) -> Optional[int]:
+        """Resident memory of chromedriver and the Chrome processes it started"""
+        if not self._driver_pid:
+            return None
+        return _process_tree_rss(self._driver_pid)
+
+    @contextmanager
+    def span(self, name: str):
+        """Time a phase; the span is recorded even if the phase raises"""
+        commands_before = self.webdriver_commands
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            self.spans.append({
+                "name": name,
+                "wall_ms": round((time.perf_counter() - started) * 1000, 1),
+                "webdriver_commands": self.webdriver_commands - commands_before,
+                "chrome_rss_bytes": self.chrome_rss(),
+                "status": status,
+            })
+
+    def finish(self) -> Dict[str, Any]:
+        """Mark the run finished, add it to the rolling history and return its summary"""
+        if self.finished_at is None:
+            self.finished_at = datetime.now().isoformat()
+            _history.append(self)
+        return self.to_dict()
+
+    def to_dict(self) -> Dict[str, Any]:
+        rss_values = [span["chrome_rss_bytes"] for span in self.spans if span["chrome_rss_bytes"]]
+        return {
+            "run_id": self.run_id,
+            "profile_url": self.profile_url,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "total_wall_ms": round(sum(span["wall_ms"] for span in self.spans), 1),
+            "webdriver_commands": self.webdriver_commands,
+            "peak_chrome_rss_bytes": max(rss_values, default=None),
+            "spans": list(self.spans),
+        }
+
+
+def find_run(run_id: Optional[str]) -> Optional[ScrapeMetrics]:
+    """Look up a recorded run, e.g. to add the Sheets save span after the scrape"""
+    for metrics in reversed(_history):
+        if metrics.run_id == run_id:
+            return metrics
+    return None
+
+
+@contextmanager
+def result_span(profile_data: Dict[str, Any], name: str):
+    """
+    Record a phase that runs after the scrape returned (e.g. the Sheets save)
+    on the run that produced profile_data, and refresh its _scrape_metrics
+    """
+    metrics = find_run((profile_data.get("_scrape_metrics") or {}).get("run_id"))
+    if metrics is None:
+        yield
+        return
+
+    try:
+        with metrics.span(name):
+            yield
+    finally:
+        profile_data["_scrape_metrics"] = metrics.to_dict()
+
+
+def get_history(limit: int = SCRAPE_METRICS_HISTORY_SIZE) -> List[Dict[str, Any]]:
+    """Most recent runs first"""
+    return [metrics.to_dict() for metrics in list(_history)[::-1][:limit]]
+
+
+def summarize_phases() -> Dict[str, Dict[str, Any]]:
+    """Average and worst wall time per phase across the history, slowest first"""
+    phases: Dict[str, List[float]] = {}
+    for metrics in list(_history):
+        for span in metrics.spans:
+            phases.setdefault(span["name"], []).append(span["wall_ms"])
+
+    summary = {
+        name: {
+            "runs": len(values),
+            "avg_wall_ms": round(sum(values) / len(values), 1),
+            "max_wall_ms": max(values),
+        }
+        for name, values in phases.items()
+    }
+    return dict(sorted(summary.items(), key=lambda item: item[1]["avg_wall_ms"], reverse=True))
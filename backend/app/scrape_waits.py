@@ -0,0 +1,130 @@
+"""
+Wait policy for the LinkedIn extraction phase.
+
+Replaces fixed random sleeps with waits that end as soon as the page has
+settled (no DOM mutations for a short quiet period and no in-flight
+fetch/XHR requests), and bounds every wait by a deadline shared by all
+remaining sections of a scrape.
+"""
+
+import os
+import time
+from typing import Optional
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Total time the extraction phase may spend across all sections
+EXTRACTION_BUDGET_SECONDS = float(os.getenv("LINKEDIN_EXTRACTION_BUDGET_SECONDS", "90"))
+# How long the DOM must be free of mutations before it counts as settled
+QUIET_PERIOD_SECONDS = 0.4
+# Upper bound for a single settle() call
+MAX_SETTLE_SECONDS = 3.0
+POLL_FREQUENCY_SECONDS = 0.1
+
+# Installs a MutationObserver and fetch/XHR counters once per document, then
+# reports milliseconds since the last mutation and the number of open requests.
+SETTLE_PROBE_SCRIPT = """
+var w = window;
+if (!w.__scrapeWaits) {
+    var state = {lastMutation: performance.now(), inflight: 0};
+    new MutationObserver(function () { state.lastMutation = performance.now(); })
+        .observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+    var done = function () { state.inflight = Math.max(0, state.inflight - 1); };
+    if (w.fetch) {
+        var originalFetch = w.fetch;
+        w.fetch = function () {
+            state.inflight++;
+            return originalFetch.apply(this, arguments).finally(done);
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.inflight++;
+        this.addEventListener('loadend', done);
+        return originalSend.apply(this, arguments);
+    };
+    w.__scrapeWaits = state;
+}
+return {
+    quiet_ms: performance.now() - w.__scrapeWaits.lastMutation,
+    inflight: w.__scrapeWaits.inflight,
+    ready: document.readyState === 'complete'
+};
+"""
+
+
+class ScrapeDeadline:
+    """Time budget shared by the remaining sections of a scrape"""
+
+    def __init__(self, budget_seconds: Optional[float] = None):
+        self.budget_seconds = budget_seconds
+        self.expires_at = time.monotonic() + budget_seconds if budget_seconds is not None else None
+
+    def remaining(self) -> float:
+        if self.expires_at is None:
+            return float("inf")
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def cap(self, timeout: float) -> float:
+        """Shorten a timeout so it never runs past the deadline"""
+        return min(timeout, self.remaining())
+
+
+class WaitPolicy:
+    def __init__(self, driver, replay: bool = False):
+        """
+        Initialize the wait policy
+
+        Args:
+            driver: WebDriver (or replay driver) the waits run against
+            replay: Static snapshot mode - every wait completes immediately
+        """
+        self.driver = driver
+        self.replay = replay
+        self.deadline = ScrapeDeadline()
+
+    def start_budget(self, budget_seconds: float = EXTRACTION_BUDGET_SECONDS) -> ScrapeDeadline:
+        """Start the shared deadline for the sections that follow"""
+        self.deadline = ScrapeDeadline(budget_seconds)
+        return self.deadline
+
+    @property
+    def budget_exhausted(self) -> bool:
+        return self.deadline.expired
+
+    def wait(self, timeout: float) -> WebDriverWait:
+        """WebDriverWait capped by the deadline; replay lookups are tried once"""
+        if self.replay:
+            return WebDriverWait(self.driver, 0)
+        return WebDriverWait(
+            self.driver, self.deadline.cap(timeout), poll_frequency=POLL_FREQUENCY_SECONDS)
+
+    def settle(self, max_wait: float = MAX_SETTLE_SECONDS) -> bool:
+        """
+        Wait until the page stops changing after a scroll or click.
+
+        Returns True once the DOM has been quiet for QUIET_PERIOD_SECONDS with
+        no fetch/XHR in flight, False if max_wait or the deadline ran out first.
+        """
+        if self.replay:
+            return True
+
+        end = time.monotonic() + self.deadline.cap(max_wait)
+        while True:
+            try:
+                state = self.driver.execute_script(SETTLE_PROBE_SCRIPT) or {}
+            except Exception:
+                state = {}
+
+            if (state.get("ready", True)
+                    and state.get("inflight", 0) == 0
+                    and state.get("quiet_ms", 0) >= QUIET_PERIOD_SECONDS * 1000):
+                return True
+
+            if time.monotonic() >= end:
+                return False
+            time.sleep(POLL_FREQUENCY_SECONDS)
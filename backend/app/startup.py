@@ -0,0 +1,143 @@
+"""
+Startup orchestration.
+
+Startup steps come in two groups. Critical steps run concurrently before
+the app accepts traffic, bounded by a startup deadline: a step still
+running at the deadline keeps going in the background instead of holding
+up the instance. Background steps (Google Sheets provisioning) start once
+the critical group is done and only affect readiness, which `/health`
+reports, so a cold instance serves cached data straight away.
+"""
+
+import os
+import time
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+STARTUP_DEADLINE_SECONDS = float(os.getenv("STARTUP_DEADLINE_SECONDS", "10"))
+
+
+class StartupStep:
+    def __init__(self, name: str, func: Callable, critical: bool, blocking: bool):
+        self.name = name
+        self.func = func
+        self.critical = critical
+        self.blocking = blocking
+        self.status = "pending"
+        self.detail: Optional[str] = None
+        self.duration_ms: Optional[float] = None
+        self.past_deadline = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "group": "critical" if self.critical else "background",
+            "status": self.status,
+            "detail": self.detail,
+            "duration_ms": self.duration_ms,
+            "past_deadline": self.past_deadline,
+        }
+
+
+class StartupOrchestrator:
+    def __init__(self, deadline_seconds: float = STARTUP_DEADLINE_SECONDS):
+        """
+        Initialize the orchestrator
+
+        Args:
+            deadline_seconds: How long the critical group may hold up startup
+        """
+        self.deadline_seconds = deadline_seconds
+        self.steps: List[StartupStep] = []
+        self.started_at: Optional[float] = None
+        self.critical_done_at: Optional[float] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def add(self, name: str, func: Callable, critical: bool = False, blocking: bool = False) -> None:
+        """
+        Register a step. Coroutine functions run on the loop, plain functions
+        on a worker thread. blocking=True marks a coroutine function that
+        blocks anyway (e.g. googleapiclient calls); it gets its own thread
+        and event loop so steps still run side by side.
+        """
+        self.steps.append(StartupStep(name, func, critical, blocking))
+
+    async def _run_step(self, step: StartupStep) -> None:
+        step.status = "running"
+        start = time.perf_counter()
+        try:
+            if step.blocking:
+                result = await asyncio.to_thread(asyncio.run, step.func())
+            elif asyncio.iscoroutinefunction(step.func):
+                result = await step.func()
+            else:
+                result = await asyncio.to_thread(step.func)
+
+            # Steps report a bool, a {"success", "message"} dict, or nothing
+            if isinstance(result, dict):
+                ok, step.detail = result.get("success", True), result.get("message")
+            else:
+                ok = result is not False
+            step.status = "ok" if ok else "failed"
+        except Exception as e:
+            step.status = "failed"
+            step.detail = f"{type(e).__name__}: {e}"
+        finally:
+            step.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        mark = "✅" if step.status == "ok" else "⚠️"
+        print(f"{mark} Startup step {step.name}: {step.status} in {step.duration_ms / 1000:.1f}s"
+              + (f" ({step.detail})" if step.detail else ""))
+
+    async def run_critical(self) -> None:
+        """Run the critical steps concurrently, waiting at most deadline_seconds"""
+        self.started_at = time.time()
+        tasks = [asyncio.create_task(self._run_step(step)) for step in self.steps if step.critical]
+        self._tasks.extend(tasks)
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=self.deadline_seconds)
+            if pending:
+                late = [step for step in self.steps if step.critical and step.status == "running"]
+                for step in late:
+                    step.past_deadline = True
+                print(f"⚠️ Startup deadline of {self.deadline_seconds:g}s reached; still running: "
+                      + ", ".join(step.name for step in late))
+        self.critical_done_at = time.time()
+
+    def start_background(self) -> None:
+        """Start the background steps without waiting for them"""
+        self._tasks.extend(
+            asyncio.create_task(self._run_step(step)) for step in self.steps if not step.critical)
+
+    @property
+    def ready(self) -> bool:
+        return all(step.status == "ok" for step in self.steps)
+
+    def status(self) -> Dict[str, Any]:
+        if any(step.status in ("pending", "running") for step in self.steps):
+            state = "starting"
+        else:
+            state = "ready" if self.ready else "degraded"
+        return {
+            "state": state,
+            "ready": self.ready,
+            "startup_seconds": round(self.critical_done_at - self.started_at, 2)
+            if self.critical_done_at and self.started_at else None,
+            "steps": {step.name: step.to_dict() for step in self.steps},
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Readiness with step states only, for the public health check"""
+        status = self.status()
+        return {
+            **status,
+            "steps": {name: step["status"] for name, step in status["steps"].items()},
+            "failed_critical": [step.name for step in self.steps if step.critical and step.status == "failed"],
+            "failed_background": [step.name for step in self.steps if not step.critical and step.status == "failed"],
+        }
+
+    async def stop(self) -> None:
+        """Cancel steps that are still running (worker threads finish on their own)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
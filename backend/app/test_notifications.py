@@ -1,7 +1,7 @@
 import os
 import sys
 from dotenv import load_dotenv
-from .notification_helper import NotificationHelper
+from .notification_helper import get_notifier
 
 # Load environment variables
 load_dotenv()
@@ -38,7 +38,7 @@ def main():
         return
     
     # Create notification helper
-    notifier = NotificationHelper()
+    notifier = get_notifier()
     
     # Check if token and chat ID are configured
     token = os.getenv("TELEGRAM_BOT_TOKEN")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""
+GitHub Contribution Calendar Parsing Benchmark
+
+Compares the lxml XPath parser of the public contributions page with the
+previous BeautifulSoup parser (kept here as the baseline) on a synthetic
+page that mirrors GitHub's markup. For each parser it reports the parse
+time and, via tracemalloc, the number of allocated blocks and peak memory
+per year of days, plus the cost of building the week grid from the result.
+
+Usage:
+    python scripts/benchmark_github_calendar.py
+    python scripts/benchmark_github_calendar.py --years 3 --repeat 10
+"""
+
+import os
+import re
+import sys
+import random
+import argparse
+import statistics
+import timeit
+import tracemalloc
+from datetime import date, timedelta
+
+# Add the parent directory to the path to import from app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bs4 import BeautifulSoup
+
+from app.github_activity import _build_week_grid, _parse_contribution_count, _parse_public_calendar
+
+LEVEL_COLORS = {0: "#ebedf0", 1: "#9be9a8", 2: "#40c463", 3: "#30a14e", 4: "#216e39"}
+
+
+def build_page(year: int, seed: int = 7) -> str:
+    """A contributions page for one year: a weekday-by-week table with a tooltip per day"""
+    rng = random.Random(seed)
+    start = date(year, 1, 1)
+    end = date(year, 12, 31)
+    grid_start = start - timedelta(days=(start.weekday() + 1) % 7)
+    weeks = ((end - grid_start).days // 7) + 1
+
+    total = 0
+    rows = []
+    for weekday in range(7):
+        cells = []
+        for week in range(weeks):
+            day = grid_start + timedelta(days=week * 7 + weekday)
+            if not start <= day <= end:
+                cells.append('<td class="ContributionCalendar-day" data-view-component="true"></td>')
+                continue
+
+            count = rng.choice([0, 0, 0, 1, 2, 3, 5, 8, 13])
+            total += count
+            level = min(4, (count + 2) // 3)
+            cell_id = f"contribution-day-component-{weekday}-{week}"
+            label = f"{count} contributions on {day:%B} {day.day}." if count else f"No contributions on {day:%B} {day.day}."
+            cells.append(
+                f'<td tabindex="0" data-ix="{week}" aria-selected="false" style="width: 10px" '
+                f'data-date="{day.isoformat()}" id="{cell_id}" data-level="{level}" role="gridcell" '
+                f'data-view-component="true" class="ContributionCalendar-day"></td>'
+                f'<tool-tip id="tooltip-{weekday}-{week}" for="{cell_id}" popover="manual" '
+                f'data-direction="n" data-type="label" data-view-component="true" '
+                f'class="sr-only position-absolute">{label}</tool-tip>'
+            )
+        rows.append(f"<tr>{''.join(cells)}</tr>")
+
+    return (
+        "<html><body><div class=\"js-yearly-contributions\">"
+        f"<h2 id=\"js-contribution-activity-description\" class=\"f4 text-normal mb-2\">"
+        f"{total:,} contributions in {year}</h2>"
+        "<table class=\"ContributionCalendar-grid\"><tbody>"
+        f"{''.join(rows)}"
+        "</tbody></table></div></body></html>"
+    )
+
+
+def legacy_parse(page: str, segment):
+    """The previous BeautifulSoup parser: a dict per day and a regex per tooltip"""
+    soup = BeautifulSoup(page, "html.parser")
+    day_entries = []
+    for node in soup.select(".ContributionCalendar-day[data-date][data-level]"):
+        raw_date = node.get("data-date")
+        parsed_day = date.fromisoformat(raw_date)
+        if parsed_day < segment["start"] or parsed_day > segment["end"]:
+            continue
+        raw_level = str(node.get("data-level", "0")).strip()
+        level = int(raw_level) if raw_level.isdigit() else 0
+        tooltip = node.find_next_sibling("tool-tip")
+        text = " ".join((tooltip.get_text(" ", strip=True) if tooltip else "").split())
+        match = re.search(r"(\d[\d,]*)\s+contributions?", text, re.IGNORECASE)
+        count = int(match.group(1).replace(",", "")) if match else 0
+        day_entries.append({"date": raw_date, "count": count, "level": level, "color": LEVEL_COLORS.get(level)})
+
+    match = re.search(r"([\d,]+)\s+contributions?\s+in\s+\d{4}", soup.get_text(" ", strip=True), re.IGNORECASE)
+    return day_entries, int(match.group(1).replace(",", "")) if match else None
+
+
+def measure(function, number: int, repeat: int):
+    timings = [run / number * 1000 for run in timeit.repeat(function, number=number, repeat=repeat)]
+
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    result = function()
+    snapshot_after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Blocks still referenced by the result, i.e. what stays alive per year
+    retained = sum(stat.count_diff for stat in snapshot_after.compare_to(snapshot_before, "filename"))
+    del result
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "retained_blocks": retained,
+        "peak_kib": peak / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parsing of the public GitHub contributions page")
+    parser.add_argument("--years", type=int, default=2, help="Number of synthetic calendar years")
+    parser.add_argument("--number", type=int, default=5, help="Calls per timing run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per parser")
+    args = parser.parse_args()
+
+    header = f"{'year':<6} {'step':<22} {'median ms':>10} {'min ms':>9} {'blocks kept':>12} {'peak KiB':>9}"
+    print(header)
+    print("-" * len(header))
+
+    last_year = date.today().year - 1
+    for year in range(last_year - args.years + 1, last_year + 1):
+        page = build_page(year)
+        segment = {"year": year, "start": date(year, 1, 1), "end": date(year, 12, 31)}
+
+        legacy_entries, legacy_total = legacy_parse(page, segment)
+        days, total = _parse_public_calendar(page, segment)
+        # The table is laid out by weekday rows, so the previous parser returned days out of date order
+        legacy_counts = [entry["count"] for entry in sorted(legacy_entries, key=lambda entry: entry["date"])]
+        if legacy_counts != days.counts.tolist() or legacy_total != total:
+            print(f"{year}: parsers disagree")
+            sys.exit(1)
+        assert _parse_contribution_count("No contributions on May 1.") == 0
+
+        steps = [
+            ("parse bs4 (previous)", lambda: legacy_parse(page, segment)),
+            ("parse lxml", lambda: _parse_public_calendar(page, segment)),
+            ("week grid", lambda: _build_week_grid(year, segment["start"], segment["end"], days, total)),
+        ]
+        for name, function in steps:
+            result = measure(function, args.number, args.repeat)
+            print(
+                f"{year:<6} {name:<22} {result['median_ms']:>10.2f} {result['min_ms']:>9.2f} "
+                f"{result['retained_blocks']:>12} {result['peak_kib']:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+"""
+LinkedIn Extractor Benchmark
+
+Times each extract_* section of LinkedInScraper, and the full
+extract_profile_data pass, against saved profile HTML snapshots using the
+offline replay mode. No browser, login or network access is needed, so
+selector and parser changes can be compared on any machine.
+
+Usage:
+    python scripts/benchmark_linkedin_extractor.py
+    python scripts/benchmark_linkedin_extractor.py --save baseline.json
+    python scripts/benchmark_linkedin_extractor.py --compare baseline.json
+"""
+
+import os
+import re
+import sys
+import json
+import logging
+import argparse
+import tempfile
+import statistics
+import timeit
+
+# Add the parent directory to the path to import from app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.linkedin_replay import list_fixtures, FIXTURES_DIR
+from app.linkedin_scraper import LinkedInScraper
+
+SECTIONS = [
+    "extract_basic_info",
+    "extract_about_section",
+    "extract_experience",
+    "extract_education",
+    "extract_skills",
+    "extract_projects",
+    "extract_certifications",
+    "extract_profile_data",
+]
+
+# Repeated list items used to build the scaled variants of the full profile
+SCALED_ITEM_PATTERNS = [
+    r'<li class="pv-profile-section__card-item">.*?</li>',
+    r'<li class="pv-profile-section__list-item">.*?</li>',
+    r'<li class="pv-skill-category-entity">.*?</li>',
+    r'<div class="project-entry">.*?</div>\s*(?=<div class="project-entry">|</section>)',
+    r'<li class="pv-certification-entity">.*?</li>',
+]
+
+
+def build_scaled_variants(base_path: str, factors, output_dir: str):
+    """Write copies of a fixture with every repeated entry multiplied by each factor"""
+    with open(base_path, "r", encoding="utf-8") as f:
+        html = f.read()
+
+    paths = []
+    for factor in factors:
+        scaled = html
+        for pattern in SCALED_ITEM_PATTERNS:
+            scaled = re.sub(pattern, lambda match: match.group(0) * factor, scaled, flags=re.S)
+
+        name = os.path.splitext(os.path.basename(base_path))[0]
+        path = os.path.join(output_dir, f"{name}_x{factor}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(scaled)
+        paths.append(path)
+    return paths
+
+
+def time_section(scraper: LinkedInScraper, section: str, number: int, repeat: int):
+    """Return per-call timings in milliseconds for one extract_* method"""
+    method = getattr(scraper, section)
+    runs = timeit.repeat(method, number=number, repeat=repeat)
+    return [run / number * 1000 for run in runs]
+
+
+def run_benchmarks(fixtures, number: int, repeat: int):
+    results = {}
+    for path in fixtures:
+        scraper = LinkedInScraper(replay_fixture=path)
+        fixture_name = os.path.splitext(os.path.basename(path))[0]
+        results[fixture_name] = {}
+        for section in SECTIONS:
+            timings = time_section(scraper, section, number, repeat)
+            results[fixture_name][section] = {
+                "min_ms": min(timings),
+                "median_ms": statistics.median(timings),
+            }
+    return results
+
+
+def print_results(results, baseline=None):
+    header = f"{'fixture':<28} {'section':<26} {'min ms':>9} {'median ms':>10}"
+    if baseline:
+        header += f" {'vs baseline':>12}"
+    print(header)
+    print("-" * len(header))
+
+    for fixture_name, sections in results.items():
+        for section, timing in sections.items():
+            line = f"{fixture_name:<28} {section:<26} {timing['min_ms']:>9.3f} {timing['median_ms']:>10.3f}"
+            previous = (baseline or {}).get(fixture_name, {}).get(section)
+            if previous and previous["median_ms"]:
+                change = (timing["median_ms"] / previous["median_ms"] - 1) * 100
+                line += f" {change:>+11.1f}%"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LinkedIn extraction against HTML fixtures")
+    parser.add_argument("--fixtures-dir", default=FIXTURES_DIR, help="Directory of profile HTML snapshots")
+    parser.add_argument("--scale", default="5,20,50",
+                        help="Comma-separated entry multipliers for generated variants of profile_full")
+    parser.add_argument("--number", type=int, default=20, help="Calls per timing run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per section")
+    parser.add_argument("--save", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Compare against results previously written with --save")
+    args = parser.parse_args()
+
+    # Keep the scraper's per-section logging out of the timings
+    logging.getLogger("linkedin_scraper").setLevel(logging.CRITICAL)
+
+    fixtures = list_fixtures(args.fixtures_dir)
+    if not fixtures:
+        print(f"No HTML fixtures found in {args.fixtures_dir}")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as variants_dir:
+        base = os.path.join(args.fixtures_dir, "profile_full.html")
+        factors = [int(value) for value in args.scale.split(",") if value.strip()]
+        if factors and os.path.exists(base):
+            fixtures += build_scaled_variants(base, factors, variants_dir)
+
+        results = run_benchmarks(fixtures, args.number, args.repeat)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+"""
+Logging Cost Benchmark
+
+Measures what logging costs a blog request. The benchmark serves
+get_blog_posts_from_sheet from a synthetic sheet, with a stub Sheets
+service and a throwaway cache file, so every call is a full cache miss:
+fetch, raw dump, per-row processing and the processed-posts dump. It
+compares three setups:
+
+- sync-debug:   DEBUG records formatted and written on the request thread
+                (what the old print() calls cost with PYTHONUNBUFFERED=1)
+- queued-debug: DEBUG through the QueueHandler pipeline
+- queued-info:  INFO through the pipeline, the production default
+
+CPU time is measured for the whole process, listener thread included, so
+it shows the work that was avoided, not just the work that was moved off
+the request thread. Queueing by itself does not save CPU (the record is
+still formatted and copied on the request thread); it keeps a slow or
+blocked stdout off the request path. The saving comes from DEBUG dumps not
+being formatted at all at the default level.
+
+Usage:
+    python scripts/benchmark_logging.py
+    python scripts/benchmark_logging.py --rows 200 --requests 300
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import statistics
+
+# Add the parent directory to the path to import from app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import google_sheet
+from app.logging_config import LogPipeline, APP_LOGGER, TEXT_FORMAT
+
+HEADERS = ["Title", "Summary", "Publication_Date", "Thumbnail_URL", "URL", "Author", "Reading_Time"]
+
+
+def build_sheet(rows: int):
+    summary = "A walk through building and deploying a small service, step by step. " * 4
+    values = [HEADERS]
+    for i in range(rows):
+        values.append([
+            f"Post number {i}",
+            summary,
+            f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            f"https://i.imgur.com/thumb{i}.jpg",
+            f"https://medium.com/@author/post-{i}",
+            "Bishal Budhathoki",
+            f"{i % 15 + 3} min read",
+        ])
+    return values
+
+
+class StubSheetsService:
+    """Answers spreadsheets().values().get(...).execute() with fixed rows"""
+
+    def __init__(self, values):
+        self.response = {"values": values}
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, **kwargs):
+        return self
+
+    def execute(self):
+        return self.response
+
+
+async def serve_requests(count: int, cache_path: str):
+    """Run the blog request `count` times; per-request wall times in ms"""
+    timings = []
+    for _ in range(count):
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        start = time.perf_counter()
+        await google_sheet.get_blog_posts_from_sheet()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def run_mode(mode: str, count: int, cache_path: str, output):
+    logger = logging.getLogger(APP_LOGGER)
+    pipeline = None
+    sync_handler = None
+
+    if mode == "sync-debug":
+        logger.setLevel(logging.DEBUG)
+        sync_handler = logging.StreamHandler(output)
+        sync_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        logger.addHandler(sync_handler)
+        logger.propagate = False
+    else:
+        pipeline = LogPipeline(level="DEBUG" if mode == "queued-debug" else "INFO", log_format="text", stream=output)
+        pipeline.start()
+
+    written_before = output.tell()
+    cpu_start = time.process_time()
+    timings = asyncio.run(serve_requests(count, cache_path))
+    if pipeline:
+        # Drain the queue so the listener's formatting and writes are counted
+        pipeline.stop()
+    cpu_ms = (time.process_time() - cpu_start) * 1000
+
+    if sync_handler:
+        logger.removeHandler(sync_handler)
+        logger.propagate = True
+
+    return {
+        "cpu_ms_per_request": cpu_ms / count,
+        "median_ms": statistics.median(timings),
+        "p95_ms": sorted(timings)[int(len(timings) * 0.95) - 1],
+        "log_kb_per_request": (output.tell() - written_before) / count / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the per-request cost of logging on the blog path")
+    parser.add_argument("--rows", type=int, default=50, help="Blog posts in the synthetic sheet")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per setup")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed requests before each setup")
+    args = parser.parse_args()
+
+    stub = StubSheetsService(build_sheet(args.rows))
+
+    async def stub_service():
+        return stub
+
+    modes = ["sync-debug", "queued-debug", "queued-info"]
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        google_sheet.setup_sheets_service = stub_service
+        google_sheet.BLOG_CACHE_PATH = os.path.join(workdir, "blog_cache.json")
+
+        # Line buffered, like stdout with PYTHONUNBUFFERED=1 in the container
+        with open(os.path.join(workdir, "app.log"), "w", buffering=1) as output:
+            for mode in modes:
+                run_mode(mode, args.warmup, google_sheet.BLOG_CACHE_PATH, output)
+                results[mode] = run_mode(mode, args.requests, google_sheet.BLOG_CACHE_PATH, output)
+
+    print(f"Blog request, {args.rows} sheet rows, {args.requests} requests per setup\n")
+    header = f"{'setup':<14} {'CPU ms/req':>11} {'median ms':>10} {'p95 ms':>8} {'log KB/req':>11} {'CPU saved':>10}"
+    print(header)
+    print("-" * len(header))
+    baseline = results["sync-debug"]["cpu_ms_per_request"]
+    for mode, result in results.items():
+        saved = (1 - result["cpu_ms_per_request"] / baseline) * 100 if baseline else 0.0
+        print(f"{mode:<14} {result['cpu_ms_per_request']:>11.3f} {result['median_ms']:>10.3f} "
+              f"{result['p95_ms']:>8.3f} {result['log_kb_per_request']:>11.1f} {saved:>9.1f}%")
+
+
+if __name__ == "__main__":
+    main()
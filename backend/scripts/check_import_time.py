@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""
+Import-time check for the API module.
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters and
+fails (exit code 1) when the import takes longer than the budget, or when
+one of the heavy optional stacks (Selenium, webdriver_manager, Firebase,
+the Google API client, BeautifulSoup) is imported eagerly. Those must load
+on first use or in the startup warmup, so the check is meant to run in CI
+next to the build.
+
+Usage:
+    python scripts/check_import_time.py
+    python scripts/check_import_time.py --budget-ms 800 --runs 5 --top 20
+
+tests/test_import_time.py runs the eager-import part only; the budget is
+wall-clock time and is left to this script.
+"""
+
+import os
+import re
+import sys
+import argparse
+import subprocess
+from typing import Any, Dict, List, Tuple
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# About 1.4x the current best run (~660 ms); the eager stacks alone put it back over 1.1 s
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "900"))
+# Top-level packages that must not be imported by `import app.main`
+LAZY_PACKAGES = ["selenium", "webdriver_manager", "firebase_admin", "googleapiclient", "google.cloud", "bs4"]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module: str) -> Tuple[float, List[Tuple[str, int, float]]]:
+    """Total import time in ms and (module, depth, cumulative ms) for every import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            depth = (len(match.group(3)) - 1) // 2
+            imports.append((match.group(4), depth, int(match.group(2)) / 1000))
+
+    total = next((cumulative for name, depth, cumulative in imports if name == module and depth == 0), 0.0)
+    return total, imports
+
+
+def eager_imports(imports: List[Tuple[str, int, float]], packages: List[str] = LAZY_PACKAGES) -> List[str]:
+    """The lazy packages that show up in an import trace"""
+    imported = {name for name, _, _ in imports}
+    return sorted(
+        package for package in packages
+        if any(name == package or name.startswith(package + ".") for name in imported)
+    )
+
+
+def check(module: str = "app.main", budget_ms: float = DEFAULT_BUDGET_MS, runs: int = 3) -> Dict[str, Any]:
+    """Measure `runs` fresh imports; the fastest is compared with the budget"""
+    results = [measure(module) for _ in range(max(1, runs))]
+    best_total, imports = min(results, key=lambda run: run[0])
+
+    failures = []
+    if best_total > budget_ms:
+        failures.append(f"import took {best_total:.0f} ms, over the {budget_ms:.0f} ms budget")
+    eager = eager_imports(imports)
+    if eager:
+        failures.append(f"imported eagerly (should load on first use): {', '.join(eager)}")
+
+    return {
+        "best_ms": best_total,
+        "runs_ms": [total for total, _ in results],
+        "imports": imports,
+        "eager": eager,
+        "failures": failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check how long importing the API module takes")
+    parser.add_argument("--module", default="app.main", help="Module to import (default: app.main)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Fail when the best run is slower than this (default: IMPORT_TIME_BUDGET_MS or 900)")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to measure; the fastest counts")
+    parser.add_argument("--top", type=int, default=15, help="Slowest direct imports to list")
+    args = parser.parse_args()
+
+    result = check(args.module, args.budget_ms, args.runs)
+
+    # Slowest imports one or two levels below the module itself
+    slowest: Dict[str, float] = {}
+    for name, depth, cumulative in result["imports"]:
+        if 1 <= depth <= 2:
+            slowest[name] = max(slowest.get(name, 0.0), cumulative)
+
+    print(f"import {args.module}: best {result['best_ms']:.0f} ms over {len(result['runs_ms'])} run(s) "
+          f"(all: {', '.join(f'{total:.0f}' for total in result['runs_ms'])} ms), budget {args.budget_ms:.0f} ms")
+    print(f"\nSlowest imports under {args.module}:")
+    for name, cumulative in sorted(slowest.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {cumulative:8.1f} ms  {name}")
+
+    failures = result["failures"]
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""
+Local stand-in for the Telegram Bot API.
+
+Implements the methods the backend uses (sendMessage, getUpdates,
+setWebhook, deleteWebhook) plus a few helpers to drive it, so
+notifications and bot commands can be exercised without a real bot:
+
+- POST /inject {"text": "/scrape"} sends a message "from the user". It is
+  pushed to the registered webhook (with the secret token header), or
+  queued for getUpdates when no webhook is set.
+- GET /messages lists what the backend has sent.
+- --fail-every N answers every Nth sendMessage with a 429, to exercise
+  the outbox's retry and rate limiting.
+
+Usage:
+    python scripts/fake_telegram_server.py --port 8081
+
+    # in another shell
+    TELEGRAM_API_BASE=http://localhost:8081 TELEGRAM_BOT_TOKEN=test TELEGRAM_CHAT_ID=1 \\
+        TELEGRAM_WEBHOOK_URL=http://localhost:8000/api/telegram/webhook TELEGRAM_WEBHOOK_SECRET=local-secret \\
+        python run_app.py
+
+    curl -X POST localhost:8081/inject -H 'Content-Type: application/json' -d '{"text": "/status"}'
+    curl localhost:8081/messages
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import itertools
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+class FakeTelegram:
+    def __init__(self, chat_id: int = 1, fail_every: int = 0):
+        """
+        Initialize the fake bot
+
+        Args:
+            chat_id: Chat the injected messages come from
+            fail_every: Answer every Nth sendMessage with a 429 (0 never does)
+        """
+        self.chat_id = chat_id
+        self.fail_every = fail_every
+        self.sent: List[Dict[str, Any]] = []
+        self.updates: List[Dict[str, Any]] = []
+        self.webhook: Optional[Dict[str, Any]] = None
+        self.send_attempts = 0
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+        self._new_update = asyncio.Event()
+
+    def build_app(self) -> FastAPI:
+        app = FastAPI(title="Fake Telegram Bot API")
+
+        async def params(request: Request) -> Dict[str, Any]:
+            values = dict(request.query_params)
+            if request.method == "POST" and request.headers.get("content-type", "").startswith("application/json"):
+                values.update(await request.json())
+            return values
+
+        @app.api_route("/bot{token}/sendMessage", methods=["GET", "POST"])
+        async def send_message(token: str, request: Request):
+            body = await params(request)
+            self.send_attempts += 1
+            if self.fail_every and self.send_attempts % self.fail_every == 0:
+                return telegram_error(429, "Too Many Requests: retry after 1", retry_after=1)
+            message = {
+                "message_id": next(self._message_ids),
+                "date": int(time.time()),
+                "chat": {"id": body.get("chat_id")},
+                "text": body.get("text", ""),
+            }
+            self.sent.append(message)
+            print(f"--> sendMessage to {body.get('chat_id')}: {message['text'][:120]!r}")
+            return {"ok": True, "result": message}
+
+        @app.api_route("/bot{token}/getUpdates", methods=["GET", "POST"])
+        async def get_updates(token: str, request: Request):
+            body = await params(request)
+            offset = int(body.get("offset", 0) or 0)
+            timeout = min(float(body.get("timeout", 0) or 0), 30.0)
+            # Acknowledged updates (below the offset) are forgotten, as Telegram does
+            self.updates = [update for update in self.updates if update["update_id"] >= offset]
+            if not self.updates and timeout:
+                self._new_update.clear()
+                try:
+                    await asyncio.wait_for(self._new_update.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            return {"ok": True, "result": self.updates}
+
+        @app.api_route("/bot{token}/setWebhook", methods=["GET", "POST"])
+        async def set_webhook(token: str, request: Request):
+            self.webhook = await params(request)
+            print(f"--> webhook set to {self.webhook.get('url')}")
+            return {"ok": True, "result": True, "description": "Webhook was set"}
+
+        @app.api_route("/bot{token}/deleteWebhook", methods=["GET", "POST"])
+        async def delete_webhook(token: str):
+            self.webhook = None
+            return {"ok": True, "result": True, "description": "Webhook was deleted"}
+
+        @app.post("/inject")
+        async def inject(request: Request):
+            body = await request.json()
+            update = {
+                "update_id": next(self._update_ids),
+                "message": {
+                    "message_id": next(self._message_ids),
+                    "date": int(time.time()),
+                    "chat": {"id": body.get("chat_id", self.chat_id), "type": "private"},
+                    "text": body["text"],
+                },
+            }
+            if self.webhook:
+                headers = {}
+                if self.webhook.get("secret_token"):
+                    headers["X-Telegram-Bot-Api-Secret-Token"] = self.webhook["secret_token"]
+                async with httpx.AsyncClient(timeout=10.0) as client:
+                    response = await client.post(self.webhook["url"], json=update, headers=headers)
+                return {"delivered": "webhook", "status_code": response.status_code, "update": update}
+
+            self.updates.append(update)
+            self._new_update.set()
+            return {"delivered": "getUpdates", "update": update}
+
+        @app.get("/messages")
+        async def messages():
+            return {"count": len(self.sent), "send_attempts": self.send_attempts, "messages": self.sent}
+
+        return app
+
+
+def telegram_error(status_code: int, description: str, retry_after: Optional[int] = None) -> JSONResponse:
+    body: Dict[str, Any] = {"ok": False, "error_code": status_code, "description": description}
+    if retry_after is not None:
+        body["parameters"] = {"retry_after": retry_after}
+    return JSONResponse(body, status_code=status_code)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Telegram Bot API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--chat-id", type=int, default=1, help="Chat the injected messages come from")
+    parser.add_argument("--fail-every", type=int, default=0, help="Answer every Nth sendMessage with a 429")
+    args = parser.parse_args()
+
+    fake = FakeTelegram(chat_id=args.chat_id, fail_every=args.fail_every)
+    uvicorn.run(fake.build_app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
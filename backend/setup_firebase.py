@@ -112,6 +112,8 @@ def setup_collections(db):
         return False
     
     try:
+        from firebase_admin import firestore
+
         # Create messages collection with a sample document
         messages_ref = db.collection('messages')
         messages_ref.add({
@@ -151,6 +153,8 @@ def test_firebase_operations(db):
         return False
     
     try:
+        from firebase_admin import firestore
+
         # Try to add a test document
         test_ref = db.collection('test')
         doc_ref = test_ref.add({
@@ -178,17 +178,10 @@ fi
 # Check for Firebase credentials
 echo
 echo "=== Checking Firebase Configuration ==="
+# The app's Firebase bootstrap reads FIREBASE_CREDENTIALS_JSON (raw or base64)
+# in memory, so the credentials are not written to disk here
 if [ -n "$FIREBASE_CREDENTIALS_JSON" ]; then
     echo "Firebase credentials provided as environment variable"
-    # Decode to file if base64 encoded
-    if [[ "$FIREBASE_CREDENTIALS_JSON" == *"="* ]]; then
-        echo "Detected base64 encoded Firebase credentials, decoding..."
-        echo $FIREBASE_CREDENTIALS_JSON | base64 -d > /app/credentials/firebase-credentials.json
-    else
-        # Write directly to file
-        echo $FIREBASE_CREDENTIALS_JSON > /app/credentials/firebase-credentials.json
-    fi
-    echo "Firebase credentials saved to file"
 elif [ -f "/app/credentials/firebase-credentials.json" ]; then
     echo "Firebase credentials file found in credentials directory"
 else
@@ -210,52 +203,8 @@ echo "Chrome version: $CHROME_VERSION"
 echo "Testing Chrome WebDriver..."
 python -c "from selenium import webdriver; from selenium.webdriver.chrome.service import Service; from webdriver_manager.chrome import ChromeDriverManager; from selenium.webdriver.chrome.options import Options; options = Options(); options.add_argument(\"--headless=new\"); options.add_argument(\"--no-sandbox\"); options.add_argument(\"--disable-dev-shm-usage\"); print(\"WebDriver modules imported successfully\"); service = Service(); print(\"Service created successfully\"); driver = webdriver.Chrome(service=service, options=options); print(\"Chrome WebDriver initialized\"); driver.quit(); print(\"Chrome WebDriver test completed successfully\")" || echo "Warning: Chrome WebDriver test failed, but continuing startup"
 
-echo "Checking Firebase configuration..."
-if [ -n "$FIREBASE_CREDENTIALS_JSON" ]; then
-  echo "Firebase credentials provided as environment variable"
-elif [ -f "/app/credentials/firebase-credentials.json" ]; then
-  echo "Firebase credentials file found in credentials directory"
-  
-  # Attempt to connect to Firebase
-  echo "Testing Firebase connection..."
-  FIREBASE_TEST=$(python -c "
-import sys
-import firebase_admin
-from firebase_admin import credentials, firestore
-try:
-    cred = credentials.Certificate('/app/credentials/firebase-credentials.json')
-    app = firebase_admin.initialize_app(cred)
-    db = firestore.client()
-    # Try to access a collection to verify Firestore is set up
-    doc_count = len(list(db.collection('test').limit(1).get()))
-    print('OK')
-    sys.exit(0)
-except Exception as e:
-    print(str(e))
-    sys.exit(1)
-")
-  
-  if [[ $? -ne 0 ]]; then
-    echo "Warning: Firebase connection failed with error: $FIREBASE_TEST"
-    echo "Attempting to set up Firebase database..."
-    
-    # Run Firebase setup script if it exists
-    if [ -f "/app/setup_firebase.py" ]; then
-      python /app/setup_firebase.py
-      if [[ $? -ne 0 ]]; then
-        echo "Warning: Failed to set up Firebase database. Some functionality may be limited."
-      else
-        echo "Firebase database successfully set up!"
-      fi
-    else
-      echo "Warning: Firebase setup script not found. Some functionality may be limited."
-    fi
-  else
-    echo "Firebase connection successful!"
-  fi
-else
-  echo "Warning: Firebase credentials not found. Some functionality may be limited."
-fi
+# The Firebase connection check (and collection setup, if needed) runs once
+# inside the app at startup; its result is reported by /health
 
 # Run environment diagnostics
 if [ -f "/app/debug_environment.py" ]; then
@@ -0,0 +1,23 @@
+"""Cold-start guard: `import app.main` keeps the heavy stacks lazy
+
+The millisecond budget is wall-clock and depends on the machine, so it is
+enforced by scripts/check_import_time.py, not here.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scripts")))
+
+from check_import_time import eager_imports, measure  # noqa: E402
+
+
+def test_import_keeps_heavy_stacks_lazy():
+    _, imports = measure("app.main")
+    assert eager_imports(imports) == []
+
+
+def test_eager_import_check_flags_lazy_packages():
+    trace = [("app.main", 0, 500.0), ("selenium.webdriver", 2, 80.0), ("google.cloud.firestore", 3, 40.0),
+             ("googleapiclient_extra", 1, 1.0)]
+    assert eager_imports(trace) == ["google.cloud", "selenium"]
@@ -0,0 +1,70 @@
+"""The outbox sender survives errors it does not expect"""
+
+import asyncio
+
+from app import notification_outbox
+from app.notification_outbox import NotificationOutbox
+
+
+def _fast_retries(monkeypatch):
+    monkeypatch.setattr(notification_outbox, "RETRY_BASE_SECONDS", 0.01)
+    monkeypatch.setattr(notification_outbox, "COALESCE_WINDOW_SECONDS", 0)
+
+
+def test_sender_keeps_running_after_unexpected_deliver_error(monkeypatch):
+    _fast_retries(monkeypatch)
+    outbox = NotificationOutbox("test-token", path=None)
+    calls = []
+
+    async def deliver(client, batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        outbox._complete(batch, delivered=True)
+        return None
+
+    monkeypatch.setattr(outbox, "_deliver", deliver)
+
+    async def scenario():
+        outbox.start()
+        outbox.enqueue({"chat_id": 1, "text": "hello"})
+        for _ in range(100):
+            if outbox.sent:
+                break
+            await asyncio.sleep(0.01)
+        running = outbox.running
+        await outbox.stop()
+        return running
+
+    assert asyncio.run(scenario()) is True
+    assert outbox.sent == 1
+    assert len(calls) == 2
+    assert outbox.last_error == "RuntimeError: boom"
+
+
+def test_sender_drops_a_message_that_keeps_failing(monkeypatch):
+    _fast_retries(monkeypatch)
+    outbox = NotificationOutbox("test-token", path=None)
+
+    async def deliver(client, batch):
+        if batch[0]["payload"].get("text") is None:
+            raise KeyError("text")
+        outbox._complete(batch, delivered=True)
+        return None
+
+    monkeypatch.setattr(outbox, "_deliver", deliver)
+
+    async def scenario():
+        outbox.start()
+        outbox.enqueue({"chat_id": 1})
+        outbox.enqueue({"chat_id": 2, "text": "after"})
+        for _ in range(200):
+            if outbox.sent:
+                break
+            await asyncio.sleep(0.01)
+        await outbox.stop()
+
+    asyncio.run(scenario())
+    assert outbox.dropped == 1
+    assert outbox.sent == 1
+    assert outbox.pending() == 0